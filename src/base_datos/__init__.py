@@ -5,3 +5,6 @@ Módulo de acceso a base de datos.
 from .conexion import obtener_conexion, cerrar_conexion
 from .repositorio_personas import RepositorioPersonas
 from .repositorio_resultados import RepositorioResultados
+from .escritor_resultados import EscritorResultados
+from .cola_trabajo import ColaTrabajo
+from .repositorio_coincidencias import RepositorioCoincidencias
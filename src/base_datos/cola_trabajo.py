@@ -0,0 +1,503 @@
+"""
+Cola de trabajo compartida para repartir las búsquedas OFAC entre
+varios procesos o máquinas.
+
+Cada nodo reclama personas con SELECT ... FOR UPDATE SKIP LOCKED y las
+retiene con una reserva que vence; un hilo de latido la renueva mientras
+el nodo la siga procesando. Si un nodo cae, o abandona una persona sin
+poder marcarla, su reserva vence y otro nodo la vuelve a reclamar.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.config.constantes import (
+    TABLA_COLA,
+    TABLA_PERSONAS,
+    TABLA_MAESTRA,
+    TABLA_RESULTADOS,
+    CONSULTAR_SI,
+    COLA_PENDIENTE,
+    COLA_EN_CURSO,
+    COLA_HECHA,
+    COLA_FALLIDA
+)
+from .conexion import conexion_bd
+from .repositorio_personas import (
+    Persona,
+    CONDICION_INCOMPLETA,
+    FILTRO_SIN_RESULTADO,
+    ORDEN_PERSONAS_UNICAS
+)
+
+logger = logging.getLogger(__name__)
+
+# La persona ya tiene resultado: la búsqueda se hizo aunque no se marcara
+_TIENE_RESULTADO = (
+    f'EXISTS (SELECT 1 FROM {TABLA_RESULTADOS} r WHERE r."idPersona" = c."idPersona")'
+)
+
+# Encola las personas válidas sin resultado; ON CONFLICT la hace idempotente
+CONSULTA_ENCOLAR = f"""
+    INSERT INTO {TABLA_COLA} (id, "idPersona", "nombrePersona", direccion, pais)
+    SELECT DISTINCT ON (p.id) p.id, p."idPersona", p."nombrePersona", m.direccion, m.pais
+    FROM {TABLA_PERSONAS} p
+    LEFT JOIN {TABLA_MAESTRA} m ON p."idPersona" = m."idPersona"
+    WHERE p."aConsultar" = %s
+    AND NOT ({CONDICION_INCOMPLETA})
+    {FILTRO_SIN_RESULTADO}
+    ORDER BY {ORDEN_PERSONAS_UNICAS}
+    ON CONFLICT (id) DO NOTHING
+"""
+
+# Vuelve a poner como pendientes las que agotaron sus intentos
+CONSULTA_REINTENTAR_FALLIDAS = f"""
+    UPDATE {TABLA_COLA}
+    SET estado = %s, intentos = 0, "actualizadoEn" = now()
+    WHERE estado = %s
+"""
+
+# Cierra las reservas vencidas que ya tienen resultado o agotaron sus intentos
+CONSULTA_CERRAR_VENCIDAS = f"""
+    UPDATE {TABLA_COLA} c
+    SET estado = CASE WHEN {_TIENE_RESULTADO} THEN %s ELSE %s END,
+        nodo = NULL, "venceEn" = NULL, "actualizadoEn" = now()
+    WHERE c.estado = %s AND c."venceEn" < now()
+    AND ({_TIENE_RESULTADO} OR c.intentos >= %s)
+"""
+
+# Reserva personas pendientes o vencidas sin esperar a las que otro nodo tiene bloqueadas
+CONSULTA_RECLAMAR = f"""
+    UPDATE {TABLA_COLA} c
+    SET estado = %s,
+        nodo = %s,
+        intentos = c.intentos + 1,
+        "venceEn" = now() + make_interval(secs => %s),
+        "actualizadoEn" = now()
+    WHERE c.id IN (
+        SELECT id FROM {TABLA_COLA}
+        WHERE estado = %s OR (estado = %s AND "venceEn" < now())
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING c.id, c."idPersona", c."nombrePersona", c.direccion, c.pais
+"""
+
+# Marca hechas las personas del nodo cuyo resultado ya se guardó
+CONSULTA_COMPLETAR = f"""
+    UPDATE {TABLA_COLA}
+    SET estado = %s, nodo = NULL, "venceEn" = NULL, "actualizadoEn" = now()
+    WHERE "idPersona" = ANY(%s) AND nodo = %s AND estado = %s
+"""
+
+# Devuelve a la cola una persona del nodo, o la marca fallida sin intentos
+CONSULTA_FALLAR = f"""
+    UPDATE {TABLA_COLA}
+    SET estado = CASE WHEN intentos >= %s THEN %s ELSE %s END,
+        nodo = NULL, "venceEn" = NULL, "ultimoError" = %s, "actualizadoEn" = now()
+    WHERE "idPersona" = %s AND nodo = %s AND estado = %s
+"""
+
+# Extiende las reservas de las personas que el nodo sigue procesando
+CONSULTA_RENOVAR = f"""
+    UPDATE {TABLA_COLA}
+    SET "venceEn" = now() + make_interval(secs => %s)
+    WHERE nodo = %s AND estado = %s AND "idPersona" = ANY(%s)
+"""
+
+# Devuelve a la cola las reservas del nodo sin contarles el intento
+CONSULTA_LIBERAR = f"""
+    UPDATE {TABLA_COLA} c
+    SET estado = CASE WHEN {_TIENE_RESULTADO} THEN %s ELSE %s END,
+        intentos = GREATEST(c.intentos - 1, 0),
+        nodo = NULL, "venceEn" = NULL, "actualizadoEn" = now()
+    WHERE c.nodo = %s AND c.estado = %s
+"""
+
+# Personas pendientes o reservadas por algún nodo
+CONSULTA_CONTAR_SIN_TERMINAR = f"SELECT COUNT(*) FROM {TABLA_COLA} WHERE estado IN (%s, %s)"
+
+
+class ColaTrabajo:
+    """
+    Repositorio de la cola de búsquedas compartida entre nodos.
+    Como context manager arranca el latido que renueva las reservas del
+    nodo y, al salir, devuelve a la cola las que no llegó a terminar.
+    """
+
+    def __init__(
+        self,
+        nodo: str,
+        reserva_segundos: float = 300.0,
+        max_intentos: int = 3
+    ):
+        """
+        Inicializa la cola.
+
+        Args:
+            nodo: Nombre único del proceso que reclama trabajo
+            reserva_segundos: Tiempo que una persona reclamada queda reservada
+                sin latido antes de que otro nodo pueda reclamarla
+            max_intentos: Reclamos de una persona antes de marcarla fallida
+        """
+        self.nodo = nodo
+        self.reserva_segundos = reserva_segundos
+        self.max_intentos = max(1, max_intentos)
+
+        self._detener_latido = threading.Event()
+        self._hilo_latido: Optional[threading.Thread] = None
+
+        # idPersona reclamados por este nodo que aún no se completaron ni fallaron
+        self._en_curso: Set[int] = set()
+        self._bloqueo_en_curso = threading.Lock()
+
+    def __enter__(self) -> 'ColaTrabajo':
+        self._detener_latido.clear()
+        self._hilo_latido = threading.Thread(
+            target=self._bucle_latido,
+            name="latido-cola",
+            daemon=True
+        )
+        self._hilo_latido.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._detener_latido.set()
+        self._hilo_latido.join()
+        self._hilo_latido = None
+
+        try:
+            self.liberar()
+        except Exception as e:
+            # Si no se pudo liberar, las reservas vencen solas
+            logger.error(f"Error al liberar reservas del nodo {self.nodo}: {e}")
+        return False
+
+    def crear_tabla(self) -> None:
+        """Crea la tabla de la cola y su índice si no existen."""
+        query = f"""
+            CREATE TABLE IF NOT EXISTS {TABLA_COLA} (
+                id INTEGER PRIMARY KEY,
+                "idPersona" INTEGER NOT NULL,
+                "nombrePersona" TEXT NOT NULL,
+                direccion TEXT,
+                pais TEXT,
+                estado VARCHAR(20) NOT NULL DEFAULT '{COLA_PENDIENTE}',
+                intentos INTEGER NOT NULL DEFAULT 0,
+                nodo VARCHAR(100),
+                "venceEn" TIMESTAMPTZ,
+                "ultimoError" TEXT,
+                "actualizadoEn" TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS "ColaBusquedas_estado_idx"
+                ON {TABLA_COLA} (estado, id);
+        """
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query)
+                conexion.commit()
+                cursor.close()
+
+        except Exception as e:
+            logger.error(f"Error al crear la cola de trabajo: {e}")
+            raise
+
+    @contextmanager
+    def bloqueo_preparacion(self):
+        """
+        Serializa entre nodos la preparación de la ronda (limpieza,
+        clasificación y encolado) con un advisory lock de sesión.
+        """
+        with conexion_bd() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT pg_advisory_lock(hashtext(%s))", (TABLA_COLA,))
+            try:
+                yield
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (TABLA_COLA,))
+                cursor.close()
+                conexion.commit()
+
+    def terminada(self) -> bool:
+        """
+        Returns:
+            True si no queda trabajo pendiente ni en curso (o la cola está vacía)
+        """
+        return self.contar_sin_terminar() == 0
+
+    def contar_sin_terminar(self) -> int:
+        """
+        Returns:
+            Número de personas pendientes o reservadas por algún nodo
+        """
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(CONSULTA_CONTAR_SIN_TERMINAR, (COLA_PENDIENTE, COLA_EN_CURSO))
+                count = cursor.fetchone()[0]
+                cursor.close()
+
+            return count
+
+        except Exception as e:
+            logger.error(f"Error al contar la cola de trabajo: {e}")
+            raise
+
+    def vaciar(self) -> int:
+        """
+        Elimina todas las entradas de la cola para empezar una ronda nueva.
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(f"DELETE FROM {TABLA_COLA}")
+                eliminadas = cursor.rowcount
+                conexion.commit()
+                cursor.close()
+
+            return eliminadas
+
+        except Exception as e:
+            logger.error(f"Error al vaciar la cola de trabajo: {e}")
+            raise
+
+    def encolar_validas(self, reintentar_fallidas: bool = False) -> int:
+        """
+        Encola las personas válidas que aún no tienen resultado ni están
+        en la cola. Es idempotente: varios nodos pueden llamarla.
+
+        Args:
+            reintentar_fallidas: Si es True, vuelve a poner como pendientes
+                las que agotaron sus intentos en una ronda anterior
+
+        Returns:
+            Número de personas encoladas
+        """
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                if reintentar_fallidas:
+                    cursor.execute(CONSULTA_REINTENTAR_FALLIDAS, (COLA_PENDIENTE, COLA_FALLIDA))
+                cursor.execute(CONSULTA_ENCOLAR, (CONSULTAR_SI,))
+                encoladas = cursor.rowcount
+                conexion.commit()
+                cursor.close()
+
+            return encoladas
+
+        except Exception as e:
+            logger.error(f"Error al encolar personas: {e}")
+            raise
+
+    def reclamar(self, cantidad: int = 1) -> List[Persona]:
+        """
+        Reserva para este nodo hasta `cantidad` personas pendientes o con la
+        reserva vencida. Antes cierra las reservas vencidas que ya tienen
+        resultado y marca fallidas las que agotaron sus intentos.
+
+        Args:
+            cantidad: Personas a reclamar como máximo
+
+        Returns:
+            Personas reclamadas, en orden de la cola
+        """
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(CONSULTA_CERRAR_VENCIDAS, (
+                    COLA_HECHA, COLA_FALLIDA, COLA_EN_CURSO, self.max_intentos
+                ))
+                conexion.commit()
+
+                cursor.execute(CONSULTA_RECLAMAR, (
+                    COLA_EN_CURSO,
+                    self.nodo,
+                    self.reserva_segundos,
+                    COLA_PENDIENTE,
+                    COLA_EN_CURSO,
+                    max(1, cantidad)
+                ))
+                filas = sorted(cursor.fetchall())
+                conexion.commit()
+                cursor.close()
+
+            with self._bloqueo_en_curso:
+                self._en_curso.update(fila[1] for fila in filas)
+
+            return [
+                Persona(
+                    id=fila[0],
+                    id_persona=fila[1],
+                    nombre_persona=fila[2],
+                    a_consultar=CONSULTAR_SI,
+                    direccion=fila[3],
+                    pais=fila[4]
+                )
+                for fila in filas
+            ]
+
+        except Exception as e:
+            logger.error(f"Error al reclamar personas de la cola: {e}")
+            raise
+
+    def completar(self, ids_persona: Iterable[int]) -> int:
+        """
+        Marca como hechas las personas de este nodo cuyo resultado ya se guardó.
+        Aunque falle, el latido deja de renovarlas: al vencer su reserva se
+        marcan hechas porque ya tienen resultado.
+
+        Args:
+            ids_persona: idPersona de los resultados guardados
+
+        Returns:
+            Número de entradas marcadas
+        """
+        ids = list(ids_persona)
+        if not ids:
+            return 0
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(CONSULTA_COMPLETAR, (COLA_HECHA, ids, self.nodo, COLA_EN_CURSO))
+                marcadas = cursor.rowcount
+                conexion.commit()
+                cursor.close()
+
+            return marcadas
+
+        except Exception as e:
+            logger.error(f"Error al completar personas de la cola: {e}")
+            raise
+
+        finally:
+            self._terminar(ids)
+
+    def fallar(self, id_persona: int, error: str = "") -> None:
+        """
+        Devuelve a la cola una persona cuya búsqueda falló, o la marca
+        fallida si ya agotó sus intentos. Aunque falle, el latido deja de
+        renovarla y otro reclamo la reintenta al vencer su reserva.
+
+        Args:
+            id_persona: idPersona de la persona
+            error: Descripción del error, para diagnóstico
+        """
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(CONSULTA_FALLAR, (
+                    self.max_intentos, COLA_FALLIDA, COLA_PENDIENTE,
+                    error[:500], id_persona, self.nodo, COLA_EN_CURSO
+                ))
+                conexion.commit()
+                cursor.close()
+
+        except Exception as e:
+            logger.error(f"Error al marcar persona {id_persona} como fallida: {e}")
+            raise
+
+        finally:
+            self._terminar([id_persona])
+
+    def renovar(self) -> int:
+        """
+        Extiende las reservas de las personas que este nodo sigue procesando.
+
+        Returns:
+            Número de reservas renovadas
+        """
+        with self._bloqueo_en_curso:
+            ids = sorted(self._en_curso)
+        if not ids:
+            return 0
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(CONSULTA_RENOVAR, (self.reserva_segundos, self.nodo, COLA_EN_CURSO, ids))
+                renovadas = cursor.rowcount
+                conexion.commit()
+                cursor.close()
+
+            return renovadas
+
+        except Exception as e:
+            logger.error(f"Error al renovar reservas: {e}")
+            raise
+
+    def liberar(self) -> int:
+        """
+        Devuelve a la cola las reservas de este nodo que no llegó a terminar,
+        sin contarles el intento. Las que ya tienen resultado se marcan hechas.
+
+        Returns:
+            Número de reservas liberadas
+        """
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(CONSULTA_LIBERAR, (COLA_HECHA, COLA_PENDIENTE, self.nodo, COLA_EN_CURSO))
+                liberadas = cursor.rowcount
+                conexion.commit()
+                cursor.close()
+
+            with self._bloqueo_en_curso:
+                self._en_curso.clear()
+
+            return liberadas
+
+        except Exception as e:
+            logger.error(f"Error al liberar reservas: {e}")
+            raise
+
+    def contar_por_estado(self) -> Dict[str, int]:
+        """
+        Returns:
+            Diccionario {estado: entradas} de toda la cola
+        """
+        query = f"SELECT estado, COUNT(*) FROM {TABLA_COLA} GROUP BY estado"
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query)
+                conteos = dict(cursor.fetchall())
+                cursor.close()
+
+            return conteos
+
+        except Exception as e:
+            logger.error(f"Error al contar la cola de trabajo: {e}")
+            raise
+
+    def en_curso(self) -> List[int]:
+        """
+        Returns:
+            idPersona que el latido sigue renovando, ordenados
+        """
+        with self._bloqueo_en_curso:
+            return sorted(self._en_curso)
+
+    def _terminar(self, ids_persona: Iterable[int]) -> None:
+        """Deja de renovar la reserva de personas completadas o fallidas."""
+        with self._bloqueo_en_curso:
+            self._en_curso.difference_update(ids_persona)
+
+    def _bucle_latido(self) -> None:
+        """Renueva las reservas del nodo tres veces por periodo de reserva."""
+        intervalo = max(1.0, self.reserva_segundos / 3)
+
+        while not self._detener_latido.wait(intervalo):
+            try:
+                self.renovar()
+            except Exception:
+                # Se reintenta en el siguiente latido; el error ya quedó en el log
+                pass
@@ -1,23 +1,307 @@
 """
 Módulo de conexión a la base de datos PostgreSQL.
-Implementa un pool de conexiones para mejor rendimiento.
+Implementa un pool de conexiones seguro entre hilos que valida las
+conexiones al entregarlas y renueva las viejas o inactivas.
 """
 
-import psycopg2
-from psycopg2 import pool, Error
+import threading
+import time
+from collections import deque
 from typing import Optional
 import logging
 
+import psycopg2
+from psycopg2 import extensions, Error
+from psycopg2.pool import PoolError
+
 from src.config import Configuracion
+from .sentencias import ConexionPreparada
 
 logger = logging.getLogger(__name__)
 
-_pool_conexiones: Optional[pool.SimpleConnectionPool] = None
+
+class PoolConexiones:
+    """
+    Pool de conexiones seguro entre hilos. Si no hay conexiones libres y
+    se alcanzó el máximo, tomar() espera hasta tiempo_espera segundos a
+    que otro hilo devuelva una, en lugar de fallar en el acto.
+
+    Antes de entregar una conexión descarta las cerradas, las que superan
+    max_vida_segundos o max_inactividad_segundos, y hace un SELECT 1 si
+    lleva más de validar_tras_segundos sin usarse: una sesión TCP caída
+    no llega nunca a un repositorio.
+    """
+
+    def __init__(
+        self,
+        min_conexiones: int,
+        max_conexiones: int,
+        parametros: dict,
+        tiempo_espera: float = 30.0,
+        max_vida_segundos: float = 1800.0,
+        max_inactividad_segundos: float = 300.0,
+        validar_tras_segundos: float = 5.0
+    ):
+        """
+        Inicializa el pool sin abrir conexiones (ver calentar()).
+
+        Args:
+            min_conexiones: Conexiones que se abren al calentar y que
+                la purga de inactivas conserva
+            max_conexiones: Conexiones abiertas como máximo, libres o en uso
+            parametros: Argumentos de psycopg2.connect
+            tiempo_espera: Segundos que tomar() espera una conexión libre
+            max_vida_segundos: Edad máxima de una conexión (0 = sin límite)
+            max_inactividad_segundos: Tiempo máximo sin usarse (0 = sin límite)
+            validar_tras_segundos: Inactividad a partir de la cual se valida
+                con SELECT 1 antes de entregarla (0 = siempre)
+        """
+        self.min_conexiones = max(0, min_conexiones)
+        self.max_conexiones = max(1, max_conexiones, self.min_conexiones)
+        self.tiempo_espera = tiempo_espera
+        self.max_vida_segundos = max_vida_segundos
+        self.max_inactividad_segundos = max_inactividad_segundos
+        self.validar_tras_segundos = validar_tras_segundos
+
+        self._parametros = parametros
+        self._condicion = threading.Condition()
+        # Tuplas (conexión, creada, último uso); las más recientes al final
+        self._libres: deque = deque()
+        self._en_uso: dict = {}
+        self._abiertas = 0
+        self._cerrado = False
+
+        self.tomas = 0
+        self.esperas = 0
+        self.tiempo_espera_total = 0.0
+        self.max_en_uso = 0
+        self.descartadas = 0
+
+    def calentar(self) -> None:
+        """Abre min_conexiones para que las primeras consultas no esperen el handshake."""
+        ahora = time.monotonic()
+        with self._condicion:
+            faltantes = max(0, self.min_conexiones - self._abiertas)
+            self._abiertas += faltantes
+
+        nuevas = []
+        try:
+            for _ in range(faltantes):
+                nuevas.append(self._crear())
+        finally:
+            with self._condicion:
+                self._abiertas -= faltantes - len(nuevas)
+                for conexion in nuevas:
+                    self._libres.append((conexion, ahora, ahora))
+                self._condicion.notify_all()
+
+    def tomar(self):
+        """
+        Entrega una conexión sana, reutilizando una libre o abriendo una nueva.
+
+        Returns:
+            Conexión a la base de datos
+
+        Raises:
+            PoolError: Si el pool está cerrado o no hubo conexión en tiempo_espera
+        """
+        inicio = time.monotonic()
+        limite = inicio + self.tiempo_espera
+        espero = False
+
+        while True:
+            with self._condicion:
+                while True:
+                    if self._cerrado:
+                        raise PoolError("El pool de conexiones está cerrado")
+                    if self._libres:
+                        entrada = self._libres.pop()
+                        break
+                    if self._abiertas < self.max_conexiones:
+                        self._abiertas += 1
+                        entrada = None
+                        break
+
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise PoolError(
+                            f"Sin conexiones libres tras {self.tiempo_espera:g} s "
+                            f"({self.max_conexiones} en uso)"
+                        )
+                    espero = True
+                    self._condicion.wait(restante)
+
+            if entrada is None:
+                try:
+                    conexion = self._crear()
+                except Exception:
+                    with self._condicion:
+                        self._abiertas -= 1
+                        self._condicion.notify()
+                    raise
+                creada = time.monotonic()
+                break
+
+            conexion, creada, ultimo_uso = entrada
+            if self._sigue_sana(conexion, creada, ultimo_uso):
+                break
+            self._descartar(conexion)
+
+        with self._condicion:
+            self._en_uso[id(conexion)] = creada
+            self.tomas += 1
+            self.max_en_uso = max(self.max_en_uso, len(self._en_uso))
+            if espero:
+                self.esperas += 1
+                self.tiempo_espera_total += time.monotonic() - inicio
+
+        return conexion
+
+    def devolver(self, conexion) -> None:
+        """
+        Devuelve una conexión al pool. Si quedó con una transacción abierta
+        se deshace; si quedó rota o superó su edad máxima se cierra.
+
+        Args:
+            conexion: Conexión obtenida con tomar()
+        """
+        with self._condicion:
+            creada = self._en_uso.pop(id(conexion), None)
+
+        if creada is None:
+            logger.warning("Se devolvió al pool una conexión que no le pertenece")
+            return
+
+        if self._cerrado or conexion.closed or self._vencida(creada, time.monotonic()):
+            self._descartar(conexion)
+            return
+
+        try:
+            estado = conexion.info.transaction_status
+            if estado == extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._descartar(conexion)
+                return
+            if estado != extensions.TRANSACTION_STATUS_IDLE:
+                conexion.rollback()
+        except Error:
+            self._descartar(conexion)
+            return
+
+        with self._condicion:
+            self._libres.append((conexion, creada, time.monotonic()))
+            self._purgar_inactivas()
+            self._condicion.notify()
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones libres; las que están en uso se cierran al devolverse."""
+        with self._condicion:
+            self._cerrado = True
+            libres = list(self._libres)
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+
+        for conexion, _, _ in libres:
+            self._cerrar_silencioso(conexion)
+
+    def estadisticas(self) -> dict:
+        """
+        Returns:
+            Diccionario con el uso acumulado del pool
+        """
+        with self._condicion:
+            return {
+                'tomas': self.tomas,
+                'esperas': self.esperas,
+                'tiempo_espera_segundos': round(self.tiempo_espera_total, 3),
+                'max_en_uso': self.max_en_uso,
+                'en_uso': len(self._en_uso),
+                'libres': len(self._libres),
+                'descartadas': self.descartadas
+            }
+
+    def _crear(self):
+        """Abre una conexión nueva con los parámetros del pool."""
+        return psycopg2.connect(**self._parametros)
+
+    def _vencida(self, creada: float, ahora: float) -> bool:
+        """Indica si la conexión superó su edad máxima."""
+        return 0 < self.max_vida_segundos < ahora - creada
+
+    def _sigue_sana(self, conexion, creada: float, ultimo_uso: float) -> bool:
+        """
+        Comprueba una conexión libre antes de entregarla.
+
+        Returns:
+            True si se puede usar, False si hay que descartarla
+        """
+        if conexion.closed:
+            return False
+
+        ahora = time.monotonic()
+        if self._vencida(creada, ahora):
+            return False
+
+        inactividad = ahora - ultimo_uso
+        if 0 < self.max_inactividad_segundos < inactividad:
+            return False
+
+        if inactividad < self.validar_tras_segundos:
+            return True
+
+        try:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conexion.rollback()
+            return True
+        except Error as e:
+            logger.warning(f"Conexión descartada al validarla: {e}")
+            return False
+
+    def _descartar(self, conexion) -> None:
+        """Cierra una conexión y libera su lugar en el pool."""
+        self._cerrar_silencioso(conexion)
+        with self._condicion:
+            self._abiertas -= 1
+            self.descartadas += 1
+            self._condicion.notify()
+
+    def _purgar_inactivas(self) -> None:
+        """
+        Cierra las conexiones libres más antiguas que superan el tiempo de
+        inactividad, conservando min_conexiones. Se llama con el lock tomado.
+        """
+        if self.max_inactividad_segundos <= 0:
+            return
+
+        ahora = time.monotonic()
+        while (
+            self._libres
+            and self._abiertas > self.min_conexiones
+            and ahora - self._libres[0][2] > self.max_inactividad_segundos
+        ):
+            conexion, _, _ = self._libres.popleft()
+            self._cerrar_silencioso(conexion)
+            self._abiertas -= 1
+            self.descartadas += 1
+
+    @staticmethod
+    def _cerrar_silencioso(conexion) -> None:
+        """Cierra una conexión ignorando los errores de una sesión ya caída."""
+        try:
+            conexion.close()
+        except Error:
+            pass
+
+
+_pool_conexiones: Optional[PoolConexiones] = None
+_bloqueo_pool = threading.Lock()
 
 
 def inicializar_pool(min_conexiones: int = 1, max_conexiones: int = 10) -> None:
     """
-    Inicializa el pool de conexiones a la base de datos.
+    Inicializa el pool de conexiones y abre min_conexiones por adelantado.
 
     Args:
         min_conexiones: Número mínimo de conexiones en el pool
@@ -25,23 +309,39 @@ def inicializar_pool(min_conexiones: int = 1, max_conexiones: int = 10) -> None:
     """
     global _pool_conexiones
 
-    if _pool_conexiones is not None:
-        return
+    with _bloqueo_pool:
+        if _pool_conexiones is not None:
+            return
 
-    try:
         config = Configuracion()
-        _pool_conexiones = pool.SimpleConnectionPool(
+        parametros = {
+            'host': config.base_datos.host,
+            'port': config.base_datos.puerto,
+            'database': config.base_datos.base_datos,
+            'user': config.base_datos.usuario,
+            'password': config.base_datos.contrasena
+        }
+        if config.base_datos.sentencias_preparadas:
+            parametros['connection_factory'] = ConexionPreparada
+
+        nuevo_pool = PoolConexiones(
             min_conexiones,
             max_conexiones,
-            host=config.base_datos.host,
-            port=config.base_datos.puerto,
-            database=config.base_datos.base_datos,
-            user=config.base_datos.usuario,
-            password=config.base_datos.contrasena
+            parametros=parametros,
+            tiempo_espera=config.base_datos.pool_tiempo_espera,
+            max_vida_segundos=config.base_datos.pool_max_vida_segundos,
+            max_inactividad_segundos=config.base_datos.pool_max_inactividad_segundos,
+            validar_tras_segundos=config.base_datos.pool_validar_tras_segundos
         )
-    except Error as e:
-        logger.error(f"Error al inicializar pool de conexiones: {e}")
-        raise
+
+        try:
+            nuevo_pool.calentar()
+        except Error as e:
+            logger.error(f"Error al inicializar pool de conexiones: {e}")
+            nuevo_pool.cerrar()
+            raise
+
+        _pool_conexiones = nuevo_pool
 
 
 def obtener_conexion():
@@ -52,16 +352,13 @@ def obtener_conexion():
         Conexión a la base de datos
 
     Raises:
-        Exception: Si el pool no está inicializado
+        Exception: Si no se pudo obtener una conexión
     """
-    global _pool_conexiones
-
     if _pool_conexiones is None:
         inicializar_pool()
 
     try:
-        conexion = _pool_conexiones.getconn()
-        return conexion
+        return _pool_conexiones.tomar()
     except Error as e:
         logger.error(f"Error al obtener conexión: {e}")
         raise
@@ -74,19 +371,29 @@ def cerrar_conexion(conexion) -> None:
     Args:
         conexion: Conexión a devolver al pool
     """
-    global _pool_conexiones
-
     if _pool_conexiones is not None and conexion is not None:
-        _pool_conexiones.putconn(conexion)
+        _pool_conexiones.devolver(conexion)
+
+
+def estadisticas_pool() -> dict:
+    """
+    Returns:
+        Uso acumulado del pool, o diccionario vacío si no está inicializado
+    """
+    if _pool_conexiones is None:
+        return {}
+    return _pool_conexiones.estadisticas()
 
 
 def cerrar_pool() -> None:
     """Cierra todas las conexiones del pool."""
     global _pool_conexiones
 
-    if _pool_conexiones is not None:
-        _pool_conexiones.closeall()
-        _pool_conexiones = None
+    with _bloqueo_pool:
+        if _pool_conexiones is not None:
+            logger.info(f"Uso del pool de conexiones: {_pool_conexiones.estadisticas()}")
+            _pool_conexiones.cerrar()
+            _pool_conexiones = None
 
 
 class ConexionContextManager:
@@ -102,7 +409,10 @@ class ConexionContextManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.conexion:
             if exc_type is not None:
-                self.conexion.rollback()
+                try:
+                    self.conexion.rollback()
+                except Error:
+                    pass
             cerrar_conexion(self.conexion)
         return False
 
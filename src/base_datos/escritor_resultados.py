@@ -0,0 +1,181 @@
+"""
+Escritor de resultados en segundo plano.
+Acumula los resultados de las búsquedas y los inserta por lotes,
+fuera del camino crítico del navegador.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+from .repositorio_resultados import RepositorioResultados, Resultado
+
+logger = logging.getLogger(__name__)
+
+_FIN = object()
+
+
+class EscritorResultados:
+    """
+    Inserta resultados por lotes desde un hilo propio. Vuelca cada
+    tamano_lote resultados o cada intervalo_segundos, lo que ocurra
+    primero. La cola es acotada: si la base de datos se atrasa,
+    agregar() bloquea a quien produce resultados. Si un lote falla se
+    reintenta fila a fila, para no perder los resultados válidos por uno
+    rechazado.
+    """
+
+    def __init__(
+        self,
+        repositorio: Optional[RepositorioResultados] = None,
+        tamano_lote: int = 100,
+        intervalo_segundos: float = 5.0,
+        capacidad: int = 1000,
+        al_volcar: Optional[Callable[[List[Resultado]], None]] = None,
+        al_fallar: Optional[Callable[[List[Resultado]], None]] = None
+    ):
+        """
+        Inicializa el escritor.
+
+        Args:
+            repositorio: Repositorio donde insertar (por defecto, uno nuevo)
+            tamano_lote: Resultados que disparan un volcado
+            intervalo_segundos: Tiempo máximo que un resultado espera en memoria
+            capacidad: Tamaño máximo de la cola antes de bloquear
+            al_volcar: Función que recibe cada lote ya insertado
+            al_fallar: Función que recibe los resultados que no se pudieron insertar
+        """
+        self.repositorio = repositorio or RepositorioResultados()
+        self.tamano_lote = max(1, tamano_lote)
+        self.intervalo_segundos = intervalo_segundos
+        self.al_volcar = al_volcar
+        self.al_fallar = al_fallar
+
+        self.escritos = 0
+        self.errores = 0
+
+        self._cola: queue.Queue = queue.Queue(maxsize=max(1, capacidad))
+        self._hilo: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'EscritorResultados':
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cerrar()
+        return False
+
+    def iniciar(self) -> None:
+        """Arranca el hilo de escritura."""
+        if self._hilo is not None:
+            return
+
+        self._hilo = threading.Thread(
+            target=self._bucle,
+            name="escritor-resultados",
+            daemon=True
+        )
+        self._hilo.start()
+
+    def agregar(self, resultado: Resultado) -> None:
+        """
+        Encola un resultado para su inserción.
+
+        Args:
+            resultado: Resultado a insertar
+        """
+        if self._hilo is None:
+            raise RuntimeError("El escritor de resultados no está iniciado")
+
+        self._cola.put(resultado)
+
+    def cerrar(self) -> None:
+        """Vuelca los resultados pendientes y detiene el hilo."""
+        if self._hilo is None:
+            return
+
+        self._cola.put(_FIN)
+        self._hilo.join()
+        self._hilo = None
+
+    def _bucle(self) -> None:
+        """Bucle del hilo: acumula resultados y los vuelca por tamaño o por tiempo."""
+        pendientes: List[Resultado] = []
+        limite = time.monotonic() + self.intervalo_segundos
+
+        while True:
+            espera = max(0.0, limite - time.monotonic())
+
+            try:
+                elemento = self._cola.get(timeout=espera)
+            except queue.Empty:
+                elemento = None
+
+            if elemento is _FIN:
+                break
+
+            if elemento is not None:
+                pendientes.append(elemento)
+
+            if len(pendientes) >= self.tamano_lote or time.monotonic() >= limite:
+                self._volcar(pendientes)
+                pendientes = []
+                limite = time.monotonic() + self.intervalo_segundos
+
+        self._volcar(pendientes)
+
+    def _volcar(self, lote: List[Resultado]) -> None:
+        """
+        Inserta un lote y actualiza los contadores. Si el lote falla, lo
+        reintenta fila a fila y entrega las filas rechazadas a al_fallar.
+        """
+        if not lote:
+            return
+
+        try:
+            self.escritos += self.repositorio.insertar_lote(lote)
+            insertados, rechazados = lote, []
+        except Exception as e:
+            logger.error(f"Error al volcar {len(lote)} resultados: {e}")
+            if len(lote) > 1:
+                insertados, rechazados = self._volcar_por_fila(lote)
+            else:
+                insertados, rechazados = [], lote
+
+        if rechazados:
+            self.errores += len(rechazados)
+            self._notificar(self.al_fallar, rechazados, "al descartar")
+
+        if insertados:
+            self._notificar(self.al_volcar, insertados, "tras volcar")
+
+    def _volcar_por_fila(self, lote: List[Resultado]):
+        """
+        Inserta los resultados de un lote de a uno.
+
+        Returns:
+            Tupla (insertados, rechazados)
+        """
+        insertados, rechazados = [], []
+
+        for resultado in lote:
+            try:
+                self.escritos += self.repositorio.insertar_lote([resultado])
+                insertados.append(resultado)
+            except Exception as e:
+                logger.error(f"Resultado de la persona {resultado.id_persona} descartado: {e}")
+                rechazados.append(resultado)
+
+        return insertados, rechazados
+
+    @staticmethod
+    def _notificar(funcion, resultados: List[Resultado], momento: str) -> None:
+        """Llama a una función de aviso sin dejar que sus errores detengan el hilo."""
+        if funcion is None:
+            return
+        try:
+            funcion(resultados)
+        except Exception as e:
+            logger.error(f"Error {momento} {len(resultados)} resultados: {e}")
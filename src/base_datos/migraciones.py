@@ -0,0 +1,477 @@
+"""
+Migraciones de esquema: índices de las tablas que filtran y cruzan los
+repositorios, registro de las migraciones aplicadas y revisión de los
+planes de las consultas para detectar escaneos secuenciales.
+
+Uso:
+    python -m src.base_datos.migraciones aplicar
+    python -m src.base_datos.migraciones verificar
+    python -m src.base_datos.migraciones explicar
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.config.constantes import (
+    TABLA_PERSONAS,
+    TABLA_MAESTRA,
+    TABLA_RESULTADOS,
+    RESTRICCION_RESULTADOS_PERSONA,
+    CONSULTAR_SI,
+    ESTADO_OK,
+    ESTADO_NO_CRUZA_MAESTRA,
+    ESTADO_INFORMACION_INCOMPLETA,
+    COLA_PENDIENTE,
+    COLA_EN_CURSO,
+    COLA_HECHA,
+    COLA_FALLIDA
+)
+from .conexion import conexion_bd, cerrar_pool
+from .cola_trabajo import (
+    CONSULTA_ENCOLAR,
+    CONSULTA_REINTENTAR_FALLIDAS,
+    CONSULTA_CERRAR_VENCIDAS,
+    CONSULTA_RECLAMAR,
+    CONSULTA_COMPLETAR,
+    CONSULTA_FALLAR,
+    CONSULTA_RENOVAR,
+    CONSULTA_LIBERAR,
+    CONSULTA_CONTAR_SIN_TERMINAR
+)
+from .repositorio_personas import (
+    CONSULTA_PERSONA_POR_ID,
+    CONSULTA_PERSONAS_POR_IDS,
+    CONSULTA_CONTAR_PERSONAS,
+    TAMANO_LOTE_LECTURA,
+    FILTRO_SIN_RESULTADO,
+    consulta_contar_por_pais,
+    consulta_pagina
+)
+from .repositorio_resultados import (
+    CONSULTA_POR_ESTADO,
+    CONSULTA_EXISTE_PERSONA,
+    CONSULTA_INCOMPLETOS_CON_DIRECCION,
+    COLUMNA_EJECUCION,
+    consulta_no_consultables
+)
+
+logger = logging.getLogger(__name__)
+
+TABLA_MIGRACIONES = '"MigracionesEsquema"'
+
+INDICE_RESULTADOS_ESTADO = "Resultadosuser9145_estadoTransaccion_idx"
+INDICE_MAESTRA_PERSONA = "MaestraDetallePersonas_idPersona_idx"
+INDICE_PERSONAS_PERSONA = "Personas_idPersona_idx"
+INDICE_PERSONAS_CONSULTAR = "Personas_aConsultar_id_idx"
+
+# Filas repetidas que se listan cuando una comprobación impide aplicar una migración
+MAX_CONFLICTOS_LISTADOS = 10
+
+
+@dataclass(frozen=True)
+class Migracion:
+    """Cambio de esquema identificado por nombre, que se aplica una sola vez."""
+    nombre: str
+    sentencias: Tuple[str, ...]
+    # CREATE INDEX CONCURRENTLY no admite transacciones: se ejecuta en autocommit
+    concurrente: bool = False
+    # Índice que crea, para descartar los inválidos de un intento fallido
+    indice: Optional[str] = None
+    # Consulta de las filas (clave, repeticiones) que impiden aplicarla
+    comprobacion: Optional[str] = None
+
+
+MIGRACIONES: List[Migracion] = [
+    Migracion(
+        nombre="001_resultados_estado",
+        sentencias=(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDICE_RESULTADOS_ESTADO}" '
+            f'ON {TABLA_RESULTADOS} ("estadoTransaccion")',
+        ),
+        concurrente=True,
+        indice=INDICE_RESULTADOS_ESTADO
+    ),
+    Migracion(
+        nombre="002_maestra_id_persona",
+        sentencias=(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDICE_MAESTRA_PERSONA}" '
+            f'ON {TABLA_MAESTRA} ("idPersona")',
+        ),
+        concurrente=True,
+        indice=INDICE_MAESTRA_PERSONA
+    ),
+    Migracion(
+        nombre="003_personas_id_persona",
+        sentencias=(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDICE_PERSONAS_PERSONA}" '
+            f'ON {TABLA_PERSONAS} ("idPersona")',
+        ),
+        concurrente=True,
+        indice=INDICE_PERSONAS_PERSONA
+    ),
+    Migracion(
+        nombre="004_personas_a_consultar",
+        sentencias=(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDICE_PERSONAS_CONSULTAR}" '
+            f'ON {TABLA_PERSONAS} ("aConsultar", id)',
+        ),
+        concurrente=True,
+        indice=INDICE_PERSONAS_CONSULTAR
+    ),
+    # Un resultado por persona. No se aplica si la tabla ya tiene duplicados:
+    # hay que depurarlos (o vaciar la tabla) y volver a aplicar.
+    Migracion(
+        nombre="005_resultados_id_persona_unico",
+        sentencias=(
+            f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "{RESTRICCION_RESULTADOS_PERSONA}" '
+            f'ON {TABLA_RESULTADOS} ("idPersona")',
+            f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint WHERE conname = '{RESTRICCION_RESULTADOS_PERSONA}'
+                ) THEN
+                    ALTER TABLE {TABLA_RESULTADOS}
+                    ADD CONSTRAINT "{RESTRICCION_RESULTADOS_PERSONA}"
+                    UNIQUE USING INDEX "{RESTRICCION_RESULTADOS_PERSONA}";
+                END IF;
+            END $$
+            """,
+        ),
+        concurrente=True,
+        indice=RESTRICCION_RESULTADOS_PERSONA,
+        comprobacion=f"""
+            SELECT "idPersona", COUNT(*)
+            FROM {TABLA_RESULTADOS}
+            GROUP BY "idPersona"
+            HAVING COUNT(*) > 1
+            ORDER BY COUNT(*) DESC, "idPersona"
+        """
+    ),
+    # Ejecución que escribió cada resultado; el bot solo comprueba que exista
+    Migracion(
+        nombre="006_resultados_id_ejecucion",
+        sentencias=(
+            f"ALTER TABLE {TABLA_RESULTADOS} "
+            f"ADD COLUMN IF NOT EXISTS {COLUMNA_EJECUCION} VARCHAR(40)",
+        )
+    ),
+]
+
+
+# Consultas de los repositorios tal como se ejecutan, con parámetros de
+# ejemplo, para revisar sus planes. Se arman con las mismas constantes y
+# funciones que usan los repositorios, para que no se desincronicen.
+CONSULTAS_REPOSITORIOS: Dict[str, Tuple[str, tuple]] = {
+    **{
+        f"personas_{nombre}{'_pagina_siguiente' if siguiente else ''}": (
+            consulta_pagina(solo_pendientes, solo_validas, siguiente),
+            (CONSULTAR_SI,) + ((0,) if siguiente else ()) + (TAMANO_LOTE_LECTURA,)
+        )
+        for nombre, solo_pendientes, solo_validas in (
+            ("a_consultar", False, False),
+            ("pendientes", True, False),
+            ("validas", False, True),
+            ("validas_pendientes", True, True),
+        )
+        for siguiente in (False, True)
+    },
+    "persona_por_id": (CONSULTA_PERSONA_POR_ID, (1,)),
+    "personas_por_ids": (CONSULTA_PERSONAS_POR_IDS, ([1, 2, 3],)),
+    "contar_personas": (CONSULTA_CONTAR_PERSONAS, (CONSULTAR_SI,)),
+    "contar_personas_pendientes": (
+        CONSULTA_CONTAR_PERSONAS + FILTRO_SIN_RESULTADO,
+        (CONSULTAR_SI,)
+    ),
+    "contar_por_pais": (consulta_contar_por_pais(), (CONSULTAR_SI,)),
+    "contar_por_pais_pendientes": (consulta_contar_por_pais(True), (CONSULTAR_SI,)),
+    "insertar_no_consultables": (
+        consulta_no_consultables(con_ejecucion=True, solo_pendientes=True),
+        (ESTADO_NO_CRUZA_MAESTRA, ESTADO_INFORMACION_INCOMPLETA, "ejecucion", CONSULTAR_SI)
+    ),
+    "existe_resultado_persona": (CONSULTA_EXISTE_PERSONA, (1,)),
+    "resultados_por_estado": (CONSULTA_POR_ESTADO, (ESTADO_OK,)),
+    "incompletos_con_direccion": (
+        CONSULTA_INCOMPLETOS_CON_DIRECCION,
+        (ESTADO_INFORMACION_INCOMPLETA,)
+    ),
+    "cola_encolar": (CONSULTA_ENCOLAR, (CONSULTAR_SI,)),
+    "cola_reintentar_fallidas": (CONSULTA_REINTENTAR_FALLIDAS, (COLA_PENDIENTE, COLA_FALLIDA)),
+    "cola_cerrar_vencidas": (
+        CONSULTA_CERRAR_VENCIDAS,
+        (COLA_HECHA, COLA_FALLIDA, COLA_EN_CURSO, 3)
+    ),
+    "cola_reclamar": (
+        CONSULTA_RECLAMAR,
+        (COLA_EN_CURSO, "nodo", 300, COLA_PENDIENTE, COLA_EN_CURSO, 5)
+    ),
+    "cola_completar": (CONSULTA_COMPLETAR, (COLA_HECHA, [1, 2, 3], "nodo", COLA_EN_CURSO)),
+    "cola_fallar": (
+        CONSULTA_FALLAR,
+        (3, COLA_FALLIDA, COLA_PENDIENTE, "error", 1, "nodo", COLA_EN_CURSO)
+    ),
+    "cola_renovar": (CONSULTA_RENOVAR, (300, "nodo", COLA_EN_CURSO, [1, 2, 3])),
+    "cola_liberar": (CONSULTA_LIBERAR, (COLA_HECHA, COLA_PENDIENTE, "nodo", COLA_EN_CURSO)),
+    "cola_contar_sin_terminar": (CONSULTA_CONTAR_SIN_TERMINAR, (COLA_PENDIENTE, COLA_EN_CURSO)),
+}
+
+
+def crear_tabla_migraciones() -> None:
+    """Crea la tabla que registra las migraciones aplicadas."""
+    query = f"""
+        CREATE TABLE IF NOT EXISTS {TABLA_MIGRACIONES} (
+            nombre VARCHAR(100) PRIMARY KEY,
+            "aplicadaEn" TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """
+
+    with conexion_bd() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute(query)
+        conexion.commit()
+        cursor.close()
+
+
+def migraciones_aplicadas() -> Dict[str, object]:
+    """
+    Returns:
+        Diccionario {nombre: fecha de aplicación}
+    """
+    crear_tabla_migraciones()
+
+    with conexion_bd() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute(f'SELECT nombre, "aplicadaEn" FROM {TABLA_MIGRACIONES}')
+        aplicadas = dict(cursor.fetchall())
+        cursor.close()
+
+    return aplicadas
+
+
+def aplicar_migraciones() -> List[str]:
+    """
+    Aplica en orden las migraciones pendientes y las registra.
+    Se detiene en la primera que falle; las anteriores quedan registradas.
+
+    Returns:
+        Nombres de las migraciones aplicadas en esta llamada
+    """
+    aplicadas = migraciones_aplicadas()
+    nuevas = []
+
+    for migracion in MIGRACIONES:
+        if migracion.nombre in aplicadas:
+            continue
+
+        try:
+            _comprobar(migracion)
+            _aplicar(migracion)
+        except Exception as e:
+            logger.error(f"Error al aplicar la migración {migracion.nombre}: {e}")
+            raise
+
+        nuevas.append(migracion.nombre)
+
+    return nuevas
+
+
+def _comprobar(migracion: Migracion) -> None:
+    """
+    Ejecuta la comprobación de la migración y, si encuentra filas que
+    la harían fallar, informa cuáles antes de intentar aplicarla.
+    """
+    if not migracion.comprobacion:
+        return
+
+    with conexion_bd() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute(migracion.comprobacion)
+        conflictos = cursor.fetchall()
+        cursor.close()
+
+    if not conflictos:
+        return
+
+    listados = ', '.join(
+        f"{clave} (x{repeticiones})" for clave, repeticiones in conflictos[:MAX_CONFLICTOS_LISTADOS]
+    )
+    raise ValueError(
+        f"{len(conflictos)} valores repetidos impiden aplicar {migracion.nombre}: {listados}"
+    )
+
+
+def _aplicar(migracion: Migracion) -> None:
+    """Ejecuta una migración y la registra como aplicada."""
+    registrar = f"INSERT INTO {TABLA_MIGRACIONES} (nombre) VALUES (%s)"
+
+    with conexion_bd() as conexion:
+        cursor = conexion.cursor()
+
+        if migracion.concurrente:
+            conexion.autocommit = True
+            try:
+                if migracion.indice:
+                    _eliminar_indice_invalido(cursor, migracion.indice)
+                for sentencia in migracion.sentencias:
+                    cursor.execute(sentencia)
+                cursor.execute(registrar, (migracion.nombre,))
+            finally:
+                conexion.autocommit = False
+        else:
+            for sentencia in migracion.sentencias:
+                cursor.execute(sentencia)
+            cursor.execute(registrar, (migracion.nombre,))
+            conexion.commit()
+
+        cursor.close()
+
+
+def _eliminar_indice_invalido(cursor, indice: str) -> None:
+    """
+    Elimina el índice si quedó inválido por un CREATE INDEX CONCURRENTLY
+    interrumpido; si no, IF NOT EXISTS lo daría por creado.
+    """
+    cursor.execute(
+        """
+        SELECT NOT i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = %s
+        """,
+        (indice,)
+    )
+    fila = cursor.fetchone()
+    if fila and fila[0]:
+        logger.warning(f"Se elimina el índice inválido {indice} para recrearlo")
+        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{indice}"')
+
+
+def verificar_indices() -> Dict[str, str]:
+    """
+    Comprueba que existan y sean válidos los índices de las migraciones.
+
+    Returns:
+        Diccionario {índice: 'ok' | 'falta' | 'invalido'}
+    """
+    query = """
+        SELECT c.relname, i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = ANY(%s)
+    """
+    indices = [m.indice for m in MIGRACIONES if m.indice]
+
+    with conexion_bd() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute(query, (indices,))
+        validos = dict(cursor.fetchall())
+        cursor.close()
+
+    return {
+        indice: 'falta' if indice not in validos else ('ok' if validos[indice] else 'invalido')
+        for indice in indices
+    }
+
+
+def escaneos_secuenciales(plan: dict) -> List[str]:
+    """
+    Recorre un plan de EXPLAIN (FORMAT JSON) y devuelve las tablas que
+    se leen con Seq Scan.
+
+    Args:
+        plan: Nodo raíz del plan ("Plan" del resultado de EXPLAIN)
+
+    Returns:
+        Nombres de las tablas escaneadas secuencialmente
+    """
+    tablas = []
+    if plan.get("Node Type") == "Seq Scan":
+        tablas.append(plan.get("Relation Name", "?"))
+    for hijo in plan.get("Plans", []):
+        tablas.extend(escaneos_secuenciales(hijo))
+    return tablas
+
+
+def revisar_planes() -> Dict[str, List[str]]:
+    """
+    Ejecuta EXPLAIN sobre cada consulta de los repositorios con los
+    escaneos secuenciales desaconsejados (enable_seqscan = off): una
+    tabla que aun así se escanea entera no tiene índice utilizable.
+    EXPLAIN sin ANALYZE no ejecuta las escrituras. Una consulta que no se
+    puede explicar (por ejemplo, sin la tabla de la cola creada) se
+    informa como None y no detiene la revisión de las demás.
+
+    Returns:
+        Diccionario {consulta: tablas escaneadas secuencialmente, o None}
+    """
+    hallazgos: Dict[str, Optional[List[str]]] = {}
+
+    with conexion_bd() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+        for nombre, (consulta, params) in CONSULTAS_REPOSITORIOS.items():
+            cursor.execute("SAVEPOINT explicar")
+            try:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {consulta}", params)
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT explicar")
+                logger.warning(f"No se pudo explicar {nombre}: {e}")
+                hallazgos[nombre] = None
+                continue
+
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            hallazgos[nombre] = escaneos_secuenciales(plan[0]["Plan"])
+
+        cursor.close()
+        conexion.rollback()
+
+    return hallazgos
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la herramienta de migraciones."""
+    parser = argparse.ArgumentParser(description="Migraciones de esquema del bot RPA")
+    parser.add_argument("accion", choices=["aplicar", "verificar", "explicar"])
+    accion = parser.parse_args(argumentos).accion
+
+    try:
+        return _ejecutar_accion(accion)
+    finally:
+        cerrar_pool()
+
+
+def _ejecutar_accion(accion: str) -> int:
+    """Ejecuta la acción pedida y devuelve el código de salida."""
+    if accion == "aplicar":
+        nuevas = aplicar_migraciones()
+        print(f"Migraciones aplicadas: {', '.join(nuevas) if nuevas else 'ninguna pendiente'}")
+        return 0
+
+    if accion == "verificar":
+        aplicadas = migraciones_aplicadas()
+        for migracion in MIGRACIONES:
+            print(f"  {migracion.nombre}: {aplicadas.get(migracion.nombre, 'pendiente')}")
+
+        estados = verificar_indices()
+        for indice, estado in estados.items():
+            print(f"  {indice}: {estado}")
+        return 0 if all(estado == 'ok' for estado in estados.values()) else 1
+
+    hallazgos = revisar_planes()
+    for nombre, tablas in hallazgos.items():
+        if tablas is None:
+            print(f"  {nombre}: no se pudo explicar")
+        else:
+            print(f"  {nombre}: {'Seq Scan en ' + ', '.join(tablas) if tablas else 'ok'}")
+    return 1 if any(hallazgos.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Repositorio de las coincidencias OFAC de cada persona: las filas de la
+grilla de resultados, para consultarlas sin repetir la búsqueda.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+from psycopg2 import extras
+
+from src.config.constantes import TABLA_COINCIDENCIAS
+from .conexion import conexion_bd
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS_COINCIDENCIA = (
+    '"idPersona", nombre, direccion, tipo, programas, lista, puntaje, "idEjecucion"'
+)
+
+
+@dataclass
+class Coincidencia:
+    """Modelo de datos para una coincidencia OFAC de una persona."""
+    id_persona: int
+    nombre: str
+    direccion: str = ""
+    tipo: str = ""
+    programas: str = ""
+    lista: str = ""
+    puntaje: Optional[int] = None
+
+
+class RepositorioCoincidencias:
+    """Repositorio para acceder a las coincidencias OFAC."""
+
+    def __init__(self, id_ejecucion: Optional[str] = None):
+        """
+        Inicializa el repositorio.
+
+        Args:
+            id_ejecucion: Identificador de la ejecución que se guarda en cada fila
+        """
+        self.id_ejecucion = id_ejecucion
+
+    def crear_tabla(self) -> None:
+        """Crea la tabla de coincidencias y su índice si no existen."""
+        query = f"""
+            CREATE TABLE IF NOT EXISTS {TABLA_COINCIDENCIAS} (
+                id SERIAL PRIMARY KEY,
+                "idPersona" INTEGER NOT NULL,
+                nombre TEXT NOT NULL,
+                direccion TEXT,
+                tipo VARCHAR(50),
+                programas TEXT,
+                lista VARCHAR(50),
+                puntaje INTEGER,
+                "idEjecucion" VARCHAR(40),
+                "creadoEn" TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS "CoincidenciasOfac_idPersona_idx"
+                ON {TABLA_COINCIDENCIAS} ("idPersona");
+        """
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query)
+                conexion.commit()
+                cursor.close()
+
+        except Exception as e:
+            logger.error(f"Error al crear la tabla de coincidencias: {e}")
+            raise
+
+    def insertar_lote(self, coincidencias: List[Coincidencia]) -> int:
+        """
+        Inserta varias coincidencias con un INSERT multi-fila.
+
+        Args:
+            coincidencias: Coincidencias a insertar
+
+        Returns:
+            Número de filas insertadas
+        """
+        if not coincidencias:
+            return 0
+
+        query = f"INSERT INTO {TABLA_COINCIDENCIAS} ({COLUMNAS_COINCIDENCIA}) VALUES %s"
+        datos = [
+            (
+                c.id_persona, c.nombre, c.direccion, c.tipo,
+                c.programas, c.lista, c.puntaje, self.id_ejecucion
+            )
+            for c in coincidencias
+        ]
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                extras.execute_values(cursor, query, datos, page_size=1000)
+                conexion.commit()
+                cursor.close()
+
+            return len(datos)
+
+        except Exception as e:
+            logger.error(f"Error al insertar coincidencias: {e}")
+            raise
+
+    def obtener_por_persona(self, id_persona: int) -> List[Coincidencia]:
+        """
+        Obtiene las coincidencias guardadas de una persona.
+
+        Args:
+            id_persona: ID de la persona
+
+        Returns:
+            Lista de coincidencias ordenadas por puntaje descendente
+        """
+        query = f"""
+            SELECT "idPersona", nombre, direccion, tipo, programas, lista, puntaje
+            FROM {TABLA_COINCIDENCIAS}
+            WHERE "idPersona" = %s
+            ORDER BY puntaje DESC NULLS LAST, id
+        """
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query, (id_persona,))
+                filas = cursor.fetchall()
+                cursor.close()
+
+            return [Coincidencia(*fila) for fila in filas]
+
+        except Exception as e:
+            logger.error(f"Error al obtener coincidencias: {e}")
+            raise
+
+    def limpiar_tabla(self) -> int:
+        """
+        Elimina todas las coincidencias guardadas.
+
+        Returns:
+            Número de registros eliminados
+        """
+        query = f"DELETE FROM {TABLA_COINCIDENCIAS}"
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query)
+                eliminados = cursor.rowcount
+                conexion.commit()
+                cursor.close()
+
+            return eliminados
+
+        except Exception as e:
+            logger.error(f"Error al limpiar coincidencias: {e}")
+            raise
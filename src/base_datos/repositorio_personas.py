@@ -3,7 +3,7 @@ Repositorio para operaciones CRUD de la tabla Personas.
 """
 
 import logging
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from dataclasses import dataclass
 
 import pandas as pd
@@ -11,12 +11,143 @@ import pandas as pd
 from src.config.constantes import (
     TABLA_PERSONAS,
     TABLA_MAESTRA,
+    TABLA_RESULTADOS,
     CONSULTAR_SI
 )
 from .conexion import conexion_bd
+from .sentencias import ejecutar_preparada
 
 logger = logging.getLogger(__name__)
 
+# Filas que se leen en cada página
+TAMANO_LOTE_LECTURA = 5000
+
+# Ids por consulta en obtener_personas_por_ids, para acotar el tamaño del arreglo
+TAMANO_BLOQUE_IDS = 10000
+
+# Nombres de las columnas de CONSULTA_PERSONAS, en orden
+COLUMNAS_PERSONA = ['id', 'idPersona', 'nombrePersona', 'aConsultar', 'direccion', 'pais']
+
+CONSULTA_PERSONAS = f"""
+    SELECT
+        p.id,
+        p."idPersona",
+        p."nombrePersona",
+        p."aConsultar",
+        m.direccion,
+        m.pais
+    FROM {TABLA_PERSONAS} p
+    LEFT JOIN {TABLA_MAESTRA} m ON p."idPersona" = m."idPersona"
+"""
+
+# Como CONSULTA_PERSONAS, con una sola fila por persona aunque tenga varias
+# en la maestra (la que indica ORDEN_PERSONAS_UNICAS); la paginación por
+# p.id no debe partir sus filas entre páginas
+CONSULTA_PERSONAS_UNICAS = f"""
+    SELECT DISTINCT ON (p.id)
+        p.id,
+        p."idPersona",
+        p."nombrePersona",
+        p."aConsultar",
+        m.direccion,
+        m.pais
+    FROM {TABLA_PERSONAS} p
+    LEFT JOIN {TABLA_MAESTRA} m ON p."idPersona" = m."idPersona"
+"""
+
+# Caracteres que quita str.strip(): todos los de str.isspace(), no solo los ASCII
+ESPACIOS_STRIP = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
+
+# Mismas reglas que ServicioValidacion: sin fila en la maestra, o con
+# dirección o país nulos, vacíos (str.strip) o con el texto 'None'.
+# Los escapes \uXXXX requieren una base de datos con codificación UTF8.
+_ESPACIOS = "E'" + ''.join(f'\\u{ord(c):04X}' for c in ESPACIOS_STRIP) + "'"
+CONDICION_NO_CRUZA = "m.direccion IS NULL AND m.pais IS NULL"
+CONDICION_INCOMPLETA = f"""(
+    m.direccion IS NULL
+    OR BTRIM(m.direccion::text, {_ESPACIOS}) IN ('', 'None')
+    OR m.pais IS NULL
+    OR BTRIM(m.pais::text, {_ESPACIOS}) IN ('', 'None')
+)"""
+
+# Fila de la maestra que se usa cuando una persona tiene varias: primero las
+# completas y, entre ellas, por dirección y país. Depende solo del contenido,
+# no del orden físico de la tabla, así que es la misma en cada ejecución.
+ORDEN_PERSONAS_UNICAS = f"p.id, ({CONDICION_INCOMPLETA}), m.direccion, m.pais"
+
+# Anti-join para reanudar: descarta las personas que ya tienen resultado
+FILTRO_SIN_RESULTADO = f"""
+    AND NOT EXISTS (
+        SELECT 1 FROM {TABLA_RESULTADOS} r WHERE r."idPersona" = p."idPersona"
+    )
+"""
+
+
+CONSULTA_PERSONA_POR_ID = (
+    CONSULTA_PERSONAS + f' WHERE p."idPersona" = %s ORDER BY {ORDEN_PERSONAS_UNICAS} LIMIT 1'
+)
+CONSULTA_PERSONAS_POR_IDS = (
+    CONSULTA_PERSONAS + f' WHERE p."idPersona" = ANY(%s) ORDER BY {ORDEN_PERSONAS_UNICAS}'
+)
+
+CONSULTA_CONTAR_PERSONAS = f"""
+    SELECT COUNT(*)
+    FROM {TABLA_PERSONAS} p
+    WHERE p."aConsultar" = %s
+"""
+
+
+def consulta_pagina(
+    solo_pendientes: bool = False,
+    solo_validas: bool = False,
+    siguiente: bool = False
+) -> str:
+    """
+    Construye la consulta de una página de personas a consultar.
+
+    Args:
+        solo_pendientes: Si es True, omite las personas que ya tienen resultado
+        solo_validas: Si es True, omite las que no cruzan o están incompletas
+        siguiente: Si es True, lee a partir del último p.id leído
+
+    Returns:
+        Consulta con parámetros (aConsultar, [último id,] límite)
+    """
+    consulta = CONSULTA_PERSONAS_UNICAS + ' WHERE p."aConsultar" = %s'
+    if solo_pendientes:
+        consulta += FILTRO_SIN_RESULTADO
+    if solo_validas:
+        consulta += f" AND NOT ({CONDICION_INCOMPLETA})"
+    if siguiente:
+        consulta += " AND p.id > %s"
+    return consulta + f" ORDER BY {ORDEN_PERSONAS_UNICAS} LIMIT %s"
+
+
+def consulta_contar_por_pais(solo_pendientes: bool = False) -> str:
+    """
+    Construye la consulta de contar_por_pais.
+
+    Args:
+        solo_pendientes: Si es True, no cuenta las que ya tienen resultado
+
+    Returns:
+        Consulta con el parámetro (aConsultar)
+    """
+    consulta = f"""
+        SELECT m.pais, COUNT(*)
+        FROM {TABLA_PERSONAS} p
+        JOIN {TABLA_MAESTRA} m ON p."idPersona" = m."idPersona"
+        WHERE p."aConsultar" = %s
+        AND NOT ({CONDICION_INCOMPLETA})
+    """
+    if solo_pendientes:
+        consulta += FILTRO_SIN_RESULTADO
+    return consulta + " GROUP BY m.pais"
+
 
 @dataclass
 class Persona:
@@ -39,40 +170,99 @@ class RepositorioPersonas:
         Returns:
             Lista de objetos Persona con aConsultar = 'Si'
         """
-        query = f"""
-            SELECT
-                p.id,
-                p."idPersona",
-                p."nombrePersona",
-                p."aConsultar",
-                m.direccion,
-                m.pais
-            FROM {TABLA_PERSONAS} p
-            LEFT JOIN {TABLA_MAESTRA} m ON p."idPersona" = m."idPersona"
-            WHERE p."aConsultar" = %s
+        return [
+            persona
+            for lote in self.iterar_personas_a_consultar()
+            for persona in lote
+        ]
+
+    def iterar_personas_a_consultar(
+        self,
+        tamano_lote: int = TAMANO_LOTE_LECTURA,
+        solo_pendientes: bool = False,
+        solo_validas: bool = False
+    ) -> Iterator[List[Persona]]:
         """
+        Recorre las personas a consultar por páginas, sin cargar la tabla
+        completa en memoria. Cada página es una consulta corta: entre
+        páginas no se retiene ninguna conexión ni transacción, aunque el
+        lote tarde horas en procesarse. Una persona con varias filas en la
+        maestra aparece una sola vez, con la fila de ORDEN_PERSONAS_UNICAS.
 
-        try:
-            with conexion_bd() as conexion:
-                df = pd.read_sql_query(query, conexion, params=(CONSULTAR_SI,))
-
-            personas = []
-            for _, row in df.iterrows():
-                persona = Persona(
-                    id=row['id'],
-                    id_persona=row['idPersona'],
-                    nombre_persona=row['nombrePersona'],
-                    a_consultar=row['aConsultar'],
-                    direccion=row.get('direccion'),
-                    pais=row.get('pais')
-                )
-                personas.append(persona)
+        Args:
+            tamano_lote: Filas por página y por lote devuelto
+            solo_pendientes: Si es True, omite las personas que ya tienen
+                resultado (reanudación de una ejecución interrumpida)
+            solo_validas: Si es True, omite en SQL las que no cruzan con la
+                maestra o tienen información incompleta
 
-            return personas
+        Yields:
+            Listas de hasta tamano_lote objetos Persona con aConsultar = 'Si'
+        """
+        for filas in self._iterar_filas(tamano_lote, solo_pendientes, solo_validas):
+            yield [self._crear_persona(fila) for fila in filas]
 
-        except Exception as e:
-            logger.error(f"Error al obtener personas: {e}")
-            raise
+    def iterar_personas_a_consultar_df(
+        self,
+        tamano_lote: int = TAMANO_LOTE_LECTURA,
+        solo_pendientes: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Como iterar_personas_a_consultar, pero entrega cada lote como un
+        DataFrame con las columnas de COLUMNAS_PERSONA, sin crear objetos
+        Persona, para clasificarlo de forma vectorizada.
+
+        Args:
+            tamano_lote: Filas por página y por lote devuelto
+            solo_pendientes: Si es True, omite las personas que ya tienen resultado
+
+        Yields:
+            DataFrames de hasta tamano_lote filas
+        """
+        for filas in self._iterar_filas(tamano_lote, solo_pendientes, solo_validas=False):
+            yield pd.DataFrame.from_records(filas, columns=COLUMNAS_PERSONA)
+
+    def _iterar_filas(
+        self,
+        tamano_lote: int,
+        solo_pendientes: bool,
+        solo_validas: bool
+    ) -> Iterator[List[tuple]]:
+        """
+        Recorre las filas de CONSULTA_PERSONAS_UNICAS a consultar con
+        paginación por clave (p.id mayor que el último leído): la conexión
+        vuelve al pool tras cada página, antes de entregarla.
+        """
+        primera_pagina = consulta_pagina(solo_pendientes, solo_validas)
+        siguiente_pagina = consulta_pagina(solo_pendientes, solo_validas, siguiente=True)
+        tamano_lote = max(1, tamano_lote)
+        ultimo_id = None
+
+        while True:
+            try:
+                with conexion_bd() as conexion:
+                    cursor = conexion.cursor()
+                    if ultimo_id is None:
+                        cursor.execute(primera_pagina, (CONSULTAR_SI, tamano_lote))
+                    else:
+                        cursor.execute(siguiente_pagina, (CONSULTAR_SI, ultimo_id, tamano_lote))
+                    filas = cursor.fetchall()
+                    cursor.close()
+                    # Cierra la transacción de solo lectura de la página
+                    conexion.commit()
+
+            except Exception as e:
+                logger.error(f"Error al obtener personas: {e}")
+                raise
+
+            if not filas:
+                return
+
+            yield filas
+
+            if len(filas) < tamano_lote:
+                return
+            ultimo_id = filas[-1][0]
 
     def obtener_persona_por_id(self, id_persona: int) -> Optional[Persona]:
         """
@@ -84,53 +274,76 @@ class RepositorioPersonas:
         Returns:
             Objeto Persona o None si no existe
         """
-        query = f"""
-            SELECT
-                p.id,
-                p."idPersona",
-                p."nombrePersona",
-                p."aConsultar",
-                m.direccion,
-                m.pais
-            FROM {TABLA_PERSONAS} p
-            LEFT JOIN {TABLA_MAESTRA} m ON p."idPersona" = m."idPersona"
-            WHERE p."idPersona" = %s
-        """
+        query = CONSULTA_PERSONA_POR_ID
 
         try:
             with conexion_bd() as conexion:
                 cursor = conexion.cursor()
-                cursor.execute(query, (id_persona,))
+                ejecutar_preparada(cursor, "personas_por_id", query, (id_persona,))
                 row = cursor.fetchone()
                 cursor.close()
 
             if row:
-                return Persona(
-                    id=row[0],
-                    id_persona=row[1],
-                    nombre_persona=row[2],
-                    a_consultar=row[3],
-                    direccion=row[4],
-                    pais=row[5]
-                )
+                return self._crear_persona(row)
             return None
 
         except Exception as e:
             logger.error(f"Error al obtener persona: {e}")
             raise
 
-    def contar_personas_a_consultar(self) -> int:
+    def obtener_personas_por_ids(
+        self,
+        ids_persona: Iterable[int],
+        tamano_bloque: int = TAMANO_BLOQUE_IDS
+    ) -> Dict[int, Persona]:
+        """
+        Obtiene varias personas por su idPersona con una consulta
+        = ANY(%s) por cada bloque de ids, todas sobre la misma conexión.
+
+        Args:
+            ids_persona: IDs de las personas a buscar (se ignoran repetidos)
+            tamano_bloque: IDs como máximo por consulta
+
+        Returns:
+            Diccionario {idPersona: Persona}; los ids inexistentes no aparecen
+        """
+        ids = sorted(set(ids_persona))
+        if not ids:
+            return {}
+
+        query = CONSULTA_PERSONAS_POR_IDS
+        personas: Dict[int, Persona] = {}
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                for inicio in range(0, len(ids), tamano_bloque):
+                    bloque = ids[inicio:inicio + tamano_bloque]
+                    ejecutar_preparada(cursor, "personas_por_ids", query, (bloque,))
+                    for fila in cursor.fetchall():
+                        # Con varias filas en la maestra se queda la de ORDEN_PERSONAS_UNICAS
+                        personas.setdefault(fila[1], self._crear_persona(fila))
+                cursor.close()
+
+            return personas
+
+        except Exception as e:
+            logger.error(f"Error al obtener personas por ids: {e}")
+            raise
+
+    def contar_personas_a_consultar(self, solo_pendientes: bool = False) -> int:
         """
         Cuenta el número de personas pendientes de consultar.
 
+        Args:
+            solo_pendientes: Si es True, no cuenta las que ya tienen resultado
+
         Returns:
             Número de personas con aConsultar = 'Si'
         """
-        query = f"""
-            SELECT COUNT(*)
-            FROM {TABLA_PERSONAS}
-            WHERE "aConsultar" = %s
-        """
+        query = CONSULTA_CONTAR_PERSONAS
+        if solo_pendientes:
+            query += FILTRO_SIN_RESULTADO
 
         try:
             with conexion_bd() as conexion:
@@ -144,3 +357,55 @@ class RepositorioPersonas:
         except Exception as e:
             logger.error(f"Error al contar personas: {e}")
             raise
+
+    def contar_por_pais(self, solo_pendientes: bool = False) -> Dict[str, int]:
+        """
+        Cuenta las personas válidas a consultar por cada valor distinto
+        de país en la maestra, tal como está escrito.
+
+        Args:
+            solo_pendientes: Si es True, no cuenta las que ya tienen resultado
+
+        Returns:
+            Diccionario {país: número de personas}
+        """
+        query = consulta_contar_por_pais(solo_pendientes)
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query, (CONSULTAR_SI,))
+                conteos = {pais: cantidad for pais, cantidad in cursor.fetchall()}
+                cursor.close()
+
+            return conteos
+
+        except Exception as e:
+            logger.error(f"Error al contar personas por país: {e}")
+            raise
+
+    def personas_desde_dataframe(self, df: pd.DataFrame) -> Iterator[Persona]:
+        """
+        Convierte en objetos Persona las filas de un lote de
+        iterar_personas_a_consultar_df.
+
+        Args:
+            df: DataFrame con las columnas de COLUMNAS_PERSONA
+
+        Yields:
+            Una Persona por fila
+        """
+        for fila in df[COLUMNAS_PERSONA].itertuples(index=False, name=None):
+            yield self._crear_persona(fila)
+
+    @staticmethod
+    def _crear_persona(fila: tuple) -> Persona:
+        """Construye una Persona a partir de una fila de CONSULTA_PERSONAS."""
+        return Persona(
+            id=fila[0],
+            id_persona=fila[1],
+            nombre_persona=fila[2],
+            a_consultar=fila[3],
+            direccion=fila[4],
+            pais=fila[5]
+        )
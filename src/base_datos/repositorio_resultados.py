@@ -2,17 +2,141 @@
 Repositorio para operaciones CRUD de la tabla de Resultados.
 """
 
+import io
 import logging
+import time
 from typing import List, Optional
 from dataclasses import dataclass
 
 import pandas as pd
-
-from src.config.constantes import TABLA_RESULTADOS
+from psycopg2 import errors, extras
+
+from src.config.constantes import (
+    TABLA_RESULTADOS,
+    TABLA_PERSONAS,
+    TABLA_MAESTRA,
+    RESTRICCION_RESULTADOS_PERSONA,
+    CONSULTAR_SI,
+    ESTADO_NO_CRUZA_MAESTRA,
+    ESTADO_INFORMACION_INCOMPLETA
+)
 from .conexion import conexion_bd
+from .sentencias import ejecutar_preparada
+from .repositorio_personas import (
+    CONSULTA_PERSONAS_UNICAS,
+    ORDEN_PERSONAS_UNICAS,
+    CONDICION_NO_CRUZA,
+    CONDICION_INCOMPLETA,
+    FILTRO_SIN_RESULTADO
+)
 
 logger = logging.getLogger(__name__)
 
+COLUMNAS_INSERCION = (
+    '"idPersona", "nombrePersona", "pais", "cantidadDeResultados", "estadoTransaccion"'
+)
+
+# Identifica la ejecución que escribió cada fila (la agrega la migración 006)
+COLUMNA_EJECUCION = '"idEjecucion"'
+
+CONSULTA_POR_ESTADO = f"""
+    SELECT id, "idPersona", "nombrePersona", "pais",
+           "cantidadDeResultados", "estadoTransaccion"
+    FROM {TABLA_RESULTADOS}
+    WHERE "estadoTransaccion" = %s
+"""
+
+CONSULTA_EXISTE_PERSONA = f"""
+    SELECT COUNT(*)
+    FROM {TABLA_RESULTADOS}
+    WHERE "idPersona" = %s
+"""
+
+CONSULTA_INCOMPLETOS_CON_DIRECCION = f"""
+    SELECT
+        r.id,
+        r."idPersona",
+        r."nombrePersona",
+        m.direccion,
+        r.pais,
+        r."cantidadDeResultados",
+        r."estadoTransaccion"
+    FROM {TABLA_RESULTADOS} r
+    LEFT JOIN {TABLA_MAESTRA} m ON r."idPersona" = m."idPersona"
+    WHERE r."estadoTransaccion" = %s
+    ORDER BY r.id
+"""
+
+# Filas por cada COPY, para acotar la memoria del buffer en lotes muy grandes
+TAMANO_BLOQUE_COPY = 50000
+
+CONSULTA_RESTRICCION_UNICA = """
+    SELECT 1
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE c.relname = %s AND i.indisunique AND i.indisvalid
+"""
+
+
+def consulta_no_consultables(con_ejecucion: bool = False, solo_pendientes: bool = False) -> str:
+    """
+    Construye el INSERT ... SELECT de insertar_no_consultables. Elige la
+    fila de cada persona igual que consulta_pagina (una por p.id, según
+    ORDEN_PERSONAS_UNICAS) y clasifica después, para que el resultado no
+    dependa de si se clasifica en SQL o en Python.
+
+    Args:
+        con_ejecucion: Si es True, escribe también el id de ejecución
+        solo_pendientes: Si es True, omite las personas que ya tienen resultado
+
+    Returns:
+        Consulta con parámetros (estado no cruza, estado incompleta,
+        [id de ejecución,] aConsultar)
+    """
+    columna_ejecucion = f", {COLUMNA_EJECUCION}" if con_ejecucion else ""
+    valor_ejecucion = ", %s" if con_ejecucion else ""
+
+    # La subconsulta se llama m para que las condiciones de la maestra apliquen tal cual
+    return f"""
+        WITH insertados AS (
+            INSERT INTO {TABLA_RESULTADOS} ({COLUMNAS_INSERCION}{columna_ejecucion})
+            SELECT
+                m."idPersona",
+                m."nombrePersona",
+                CASE WHEN {CONDICION_NO_CRUZA} THEN '' ELSE COALESCE(m.pais, '') END,
+                0,
+                CASE WHEN {CONDICION_NO_CRUZA} THEN %s ELSE %s END
+                {valor_ejecucion}
+            FROM (
+                {CONSULTA_PERSONAS_UNICAS}
+                WHERE p."aConsultar" = %s
+                {FILTRO_SIN_RESULTADO if solo_pendientes else ""}
+                ORDER BY {ORDEN_PERSONAS_UNICAS}
+            ) m
+            WHERE {CONDICION_INCOMPLETA}
+            ORDER BY m.id
+            ON CONFLICT DO NOTHING
+            RETURNING "estadoTransaccion"
+        )
+        SELECT "estadoTransaccion", COUNT(*) FROM insertados GROUP BY 1
+    """
+
+
+def _fila_csv(fila: tuple) -> str:
+    """
+    Convierte una fila al formato CSV de COPY: los textos van siempre entre
+    comillas para distinguir '' de NULL, que se escribe como campo vacío.
+    """
+    campos = []
+    for valor in fila:
+        if valor is None:
+            campos.append('')
+        elif isinstance(valor, str):
+            campos.append('"' + valor.replace('"', '""') + '"')
+        else:
+            campos.append(str(valor))
+    return ','.join(campos) + '\n'
+
 
 @dataclass
 class Resultado:
@@ -28,7 +152,18 @@ class Resultado:
 class RepositorioResultados:
     """Repositorio para acceder a datos de resultados."""
 
-    def insertar(self, resultado: Resultado) -> int:
+    def __init__(self, id_ejecucion: Optional[str] = None):
+        """
+        Inicializa el repositorio.
+
+        Args:
+            id_ejecucion: Identificador que se guarda en cada fila insertada;
+                si es None no se escribe la columna idEjecucion
+        """
+        self.id_ejecucion = id_ejecucion
+        self._restriccion_unica: Optional[bool] = None
+
+    def insertar(self, resultado: Resultado) -> Optional[int]:
         """
         Inserta un nuevo resultado en la base de datos.
 
@@ -36,30 +171,28 @@ class RepositorioResultados:
             resultado: Objeto Resultado a insertar
 
         Returns:
-            ID del registro insertado
+            ID del registro insertado, o None si la persona ya tenía
+            resultado y la tabla tiene la restricción única
         """
+        fila = self._fila(resultado)
+        marcadores = ', '.join(['%s'] * len(fila))
         query = f"""
             INSERT INTO {TABLA_RESULTADOS}
-            ("idPersona", "nombrePersona", "pais", "cantidadDeResultados", "estadoTransaccion")
-            VALUES (%s, %s, %s, %s, %s)
+            ({self._columnas()})
+            VALUES ({marcadores})
+            ON CONFLICT DO NOTHING
             RETURNING id
         """
 
         try:
             with conexion_bd() as conexion:
                 cursor = conexion.cursor()
-                cursor.execute(query, (
-                    resultado.id_persona,
-                    resultado.nombre_persona,
-                    resultado.pais,
-                    resultado.cantidad_resultados,
-                    resultado.estado_transaccion
-                ))
-                id_insertado = cursor.fetchone()[0]
+                ejecutar_preparada(cursor, self._nombre_sentencia("resultados_insertar"), query, fila)
+                insertado = cursor.fetchone()
                 conexion.commit()
                 cursor.close()
 
-            return id_insertado
+            return insertado[0] if insertado else None
 
         except Exception as e:
             logger.error(f"Error al insertar resultado: {e}")
@@ -68,6 +201,8 @@ class RepositorioResultados:
     def insertar_lote(self, resultados: List[Resultado]) -> int:
         """
         Inserta múltiples resultados en una sola operación.
+        Usa COPY ... FROM STDIN por bloques y, si el servidor no permite
+        COPY, recurre a INSERT multi-fila con execute_values.
 
         Args:
             resultados: Lista de objetos Resultado a insertar
@@ -78,36 +213,243 @@ class RepositorioResultados:
         if not resultados:
             return 0
 
-        query = f"""
-            INSERT INTO {TABLA_RESULTADOS}
-            ("idPersona", "nombrePersona", "pais", "cantidadDeResultados", "estadoTransaccion")
-            VALUES (%s, %s, %s, %s, %s)
+        return self._insertar_datos([self._fila(r) for r in resultados])
+
+    def insertar_dataframe(self, df: pd.DataFrame) -> int:
+        """
+        Inserta en bloque un DataFrame de resultados sin crear objetos
+        Resultado. Usa la misma vía COPY que insertar_lote.
+
+        Args:
+            df: DataFrame con las columnas idPersona, nombrePersona, pais,
+                cantidadDeResultados y estadoTransaccion
+
+        Returns:
+            Número de registros insertados
         """
+        if df.empty:
+            return 0
+
+        columnas = ['idPersona', 'nombrePersona', 'pais', 'cantidadDeResultados', 'estadoTransaccion']
+        datos = df[columnas]
+        if self.id_ejecucion is not None:
+            datos = datos.assign(idEjecucion=self.id_ejecucion)
+
+        # astype(object) entrega enteros de Python, que psycopg2 sabe adaptar
+        return self._insertar_datos(list(datos.astype(object).itertuples(index=False, name=None)))
+
+    def _insertar_datos(self, datos: List[tuple]) -> int:
+        """
+        Inserta filas ya ordenadas según _columnas() con COPY por bloques
+        o, si el servidor no permite COPY, con INSERT multi-fila. Con la
+        restricción única sobre idPersona, COPY no admite ON CONFLICT: las
+        filas se copian a una tabla temporal y se pasan con INSERT ... SELECT.
+
+        Returns:
+            Número de registros insertados
+        """
+        inicio = time.perf_counter()
 
         try:
             with conexion_bd() as conexion:
-                cursor = conexion.cursor()
-                datos = [
-                    (
-                        r.id_persona,
-                        r.nombre_persona,
-                        r.pais,
-                        r.cantidad_resultados,
-                        r.estado_transaccion
-                    )
-                    for r in resultados
-                ]
-                cursor.executemany(query, datos)
+                if self._tiene_restriccion_unica(conexion):
+                    copiar = self._copiar_sin_duplicados
+                else:
+                    copiar = self._copiar_filas
+
+                try:
+                    registros_insertados = copiar(conexion, datos)
+                except (errors.InsufficientPrivilege, errors.FeatureNotSupported) as e:
+                    conexion.rollback()
+                    logger.warning(f"COPY no permitido, se usa INSERT multi-fila: {e}")
+                    registros_insertados = self._insertar_valores(conexion, datos)
+
                 conexion.commit()
-                registros_insertados = cursor.rowcount
-                cursor.close()
 
+            duracion = time.perf_counter() - inicio
+            logger.info(
+                f"Lote insertado: {registros_insertados} registros en {duracion:.2f} s "
+                f"({registros_insertados / max(duracion, 1e-6):.0f} registros/s)"
+            )
             return registros_insertados
 
         except Exception as e:
             logger.error(f"Error al insertar lote: {e}")
             raise
 
+    def insertar_no_consultables(self, solo_pendientes: bool = False) -> dict:
+        """
+        Clasifica en la base de datos las personas a consultar que no cruzan
+        con la maestra o tienen información incompleta, e inserta su
+        resultado con un único INSERT ... SELECT, sin traerlas a Python.
+        Aplica las mismas reglas que ServicioValidacion sobre la misma fila
+        de la maestra que la lectura por páginas (ORDEN_PERSONAS_UNICAS), y
+        omite las personas que ya tienen resultado si la tabla tiene la
+        restricción única.
+
+        Args:
+            solo_pendientes: Si es True, omite las personas que ya tienen resultado
+
+        Returns:
+            Diccionario {estado: registros insertados}
+        """
+        query = consulta_no_consultables(self.id_ejecucion is not None, solo_pendientes)
+        params = (ESTADO_NO_CRUZA_MAESTRA, ESTADO_INFORMACION_INCOMPLETA)
+        if self.id_ejecucion is not None:
+            params += (self.id_ejecucion,)
+        params += (CONSULTAR_SI,)
+
+        inicio = time.perf_counter()
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query, params)
+                conteos = dict(cursor.fetchall())
+                conexion.commit()
+                cursor.close()
+
+            logger.info(
+                f"No consultables clasificados en SQL: {conteos} "
+                f"en {time.perf_counter() - inicio:.2f} s"
+            )
+            return conteos
+
+        except Exception as e:
+            logger.error(f"Error al clasificar no consultables: {e}")
+            raise
+
+    def _tiene_restriccion_unica(self, conexion) -> bool:
+        """
+        Indica si ya existe el índice único sobre idPersona (migración 005).
+        Se consulta una sola vez por repositorio.
+        """
+        if self._restriccion_unica is None:
+            cursor = conexion.cursor()
+            cursor.execute(CONSULTA_RESTRICCION_UNICA, (RESTRICCION_RESULTADOS_PERSONA,))
+            self._restriccion_unica = cursor.fetchone() is not None
+            cursor.close()
+        return self._restriccion_unica
+
+    def _columnas(self) -> str:
+        """Columnas que se escriben al insertar, según haya o no id de ejecución."""
+        if self.id_ejecucion is None:
+            return COLUMNAS_INSERCION
+        return f"{COLUMNAS_INSERCION}, {COLUMNA_EJECUCION}"
+
+    def _nombre_sentencia(self, base: str) -> str:
+        """Nombre de sentencia preparada distinto según las columnas que se escriben."""
+        if self.id_ejecucion is None:
+            return base
+        return f"{base}_ejecucion"
+
+    def _fila(self, resultado: Resultado) -> tuple:
+        """Valores de un resultado en el orden de _columnas()."""
+        fila = (
+            resultado.id_persona,
+            resultado.nombre_persona,
+            resultado.pais,
+            resultado.cantidad_resultados,
+            resultado.estado_transaccion
+        )
+        if self.id_ejecucion is None:
+            return fila
+        return fila + (self.id_ejecucion,)
+
+    def _copiar_filas(self, conexion, datos: List[tuple], tabla: str = TABLA_RESULTADOS) -> int:
+        """
+        Envía las filas con COPY FROM STDIN en formato CSV, por bloques,
+        armando cada bloque en un buffer en memoria.
+
+        Args:
+            tabla: Tabla de destino (por defecto, la de resultados)
+
+        Returns:
+            Número de filas copiadas
+        """
+        query = (
+            f"COPY {tabla} ({self._columnas()}) "
+            f"FROM STDIN WITH (FORMAT csv)"
+        )
+        copiadas = 0
+
+        cursor = conexion.cursor()
+        try:
+            for inicio in range(0, len(datos), TAMANO_BLOQUE_COPY):
+                bloque = datos[inicio:inicio + TAMANO_BLOQUE_COPY]
+
+                buffer = io.StringIO()
+                buffer.writelines(_fila_csv(fila) for fila in bloque)
+                buffer.seek(0)
+
+                cursor.copy_expert(query, buffer)
+                copiadas += len(bloque)
+        finally:
+            cursor.close()
+
+        return copiadas
+
+    def _copiar_sin_duplicados(self, conexion, datos: List[tuple]) -> int:
+        """
+        Copia las filas con COPY a una tabla temporal de la sesión y las
+        pasa a la de resultados con INSERT ... SELECT ... ON CONFLICT, que
+        omite las personas que ya tienen resultado. La tabla temporal se
+        vacía sola al terminar la transacción.
+
+        Returns:
+            Número de filas insertadas
+        """
+        columnas = self._columnas()
+        tabla_carga = self._nombre_sentencia("resultados_carga")
+
+        cursor = conexion.cursor()
+        try:
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {tabla_carga} ON COMMIT DELETE ROWS "
+                f"AS SELECT {columnas} FROM {TABLA_RESULTADOS} WITH NO DATA"
+            )
+            self._copiar_filas(conexion, datos, tabla_carga)
+            cursor.execute(
+                f"INSERT INTO {TABLA_RESULTADOS} ({columnas}) "
+                f"SELECT {columnas} FROM {tabla_carga} "
+                f'ON CONFLICT ("idPersona") DO NOTHING'
+            )
+            insertadas = cursor.rowcount
+        finally:
+            cursor.close()
+
+        if insertadas < len(datos):
+            logger.warning(
+                f"Se omitieron {len(datos) - insertadas} resultados de personas que ya tenían uno"
+            )
+        return insertadas
+
+    def _insertar_valores(self, conexion, datos: List[tuple]) -> int:
+        """
+        Inserta las filas con INSERT multi-fila (execute_values). Las de
+        personas que ya tienen resultado se omiten si la tabla tiene la
+        restricción única.
+
+        Returns:
+            Número de filas insertadas
+        """
+        query = (
+            f"INSERT INTO {TABLA_RESULTADOS} ({self._columnas()}) VALUES %s "
+            f"ON CONFLICT DO NOTHING RETURNING 1"
+        )
+
+        cursor = conexion.cursor()
+        try:
+            insertadas = len(extras.execute_values(cursor, query, datos, page_size=1000, fetch=True))
+        finally:
+            cursor.close()
+
+        if insertadas < len(datos):
+            logger.warning(
+                f"Se omitieron {len(datos) - insertadas} resultados de personas que ya tenían uno"
+            )
+        return insertadas
+
     def obtener_por_estado(self, estado: str) -> List[Resultado]:
         """
         Obtiene todos los resultados con un estado específico.
@@ -118,12 +460,7 @@ class RepositorioResultados:
         Returns:
             Lista de objetos Resultado
         """
-        query = f"""
-            SELECT id, "idPersona", "nombrePersona", "pais",
-                   "cantidadDeResultados", "estadoTransaccion"
-            FROM {TABLA_RESULTADOS}
-            WHERE "estadoTransaccion" = %s
-        """
+        query = CONSULTA_POR_ESTADO
 
         try:
             with conexion_bd() as conexion:
@@ -157,16 +494,12 @@ class RepositorioResultados:
         Returns:
             True si existe, False en caso contrario
         """
-        query = f"""
-            SELECT COUNT(*)
-            FROM {TABLA_RESULTADOS}
-            WHERE "idPersona" = %s
-        """
+        query = CONSULTA_EXISTE_PERSONA
 
         try:
             with conexion_bd() as conexion:
                 cursor = conexion.cursor()
-                cursor.execute(query, (id_persona,))
+                ejecutar_preparada(cursor, "resultados_existe_persona", query, (id_persona,))
                 count = cursor.fetchone()[0]
                 cursor.close()
 
@@ -176,6 +509,85 @@ class RepositorioResultados:
             logger.error(f"Error al verificar resultado: {e}")
             raise
 
+    def tiene_columna_ejecucion(self) -> bool:
+        """
+        Indica si la tabla de resultados tiene la columna idEjecucion, que
+        agrega la migración 006. Solo la consulta: el usuario del bot no
+        necesita ser dueño de la tabla para ejecutar.
+
+        Returns:
+            True si la columna existe
+        """
+        query = """
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name = %s AND column_name = %s
+        """
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(
+                    query,
+                    (TABLA_RESULTADOS.strip('"'), COLUMNA_EJECUCION.strip('"'))
+                )
+                existe = cursor.fetchone() is not None
+                cursor.close()
+
+            return existe
+
+        except Exception as e:
+            logger.error(f"Error al buscar la columna de ejecución: {e}")
+            raise
+
+    def contar(self) -> int:
+        """
+        Cuenta los resultados guardados en la tabla.
+
+        Returns:
+            Número de registros
+        """
+        query = f"SELECT COUNT(*) FROM {TABLA_RESULTADOS}"
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query)
+                count = cursor.fetchone()[0]
+                cursor.close()
+
+            return count
+
+        except Exception as e:
+            logger.error(f"Error al contar resultados: {e}")
+            raise
+
+    def contar_por_estado(self) -> dict:
+        """
+        Cuenta los resultados guardados agrupados por estado de transacción.
+
+        Returns:
+            Diccionario {estado: registros}
+        """
+        query = f"""
+            SELECT "estadoTransaccion", COUNT(*)
+            FROM {TABLA_RESULTADOS}
+            GROUP BY "estadoTransaccion"
+        """
+
+        try:
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute(query)
+                conteos = dict(cursor.fetchall())
+                cursor.close()
+
+            return conteos
+
+        except Exception as e:
+            logger.error(f"Error al contar resultados por estado: {e}")
+            raise
+
     def obtener_todos(self) -> pd.DataFrame:
         """
         Obtiene todos los resultados como DataFrame.
@@ -202,22 +614,7 @@ class RepositorioResultados:
         Returns:
             DataFrame con los registros incompletos y sus direcciones
         """
-        from src.config.constantes import TABLA_MAESTRA, ESTADO_INFORMACION_INCOMPLETA
-
-        query = f"""
-            SELECT
-                r.id,
-                r."idPersona",
-                r."nombrePersona",
-                m.direccion,
-                r.pais,
-                r."cantidadDeResultados",
-                r."estadoTransaccion"
-            FROM {TABLA_RESULTADOS} r
-            LEFT JOIN {TABLA_MAESTRA} m ON r."idPersona" = m."idPersona"
-            WHERE r."estadoTransaccion" = %s
-            ORDER BY r.id
-        """
+        query = CONSULTA_INCOMPLETOS_CON_DIRECCION
 
         try:
             with conexion_bd() as conexion:
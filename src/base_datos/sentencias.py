@@ -0,0 +1,67 @@
+"""
+Sentencias preparadas por conexión.
+
+Las consultas frecuentes se preparan (PREPARE) la primera vez que se
+usan en cada conexión del pool y después se ejecutan por nombre
+(EXECUTE), evitando que PostgreSQL vuelva a analizarlas y planificarlas
+en cada llamada. Cada conexión recuerda qué sentencias tiene preparadas:
+cuando el pool la recicla, la conexión nueva empieza sin ninguna.
+"""
+
+import re
+
+from psycopg2 import errors, extensions
+
+_MARCADOR = re.compile(r'%s')
+
+
+class ConexionPreparada(extensions.connection):
+    """Conexión que registra las sentencias preparadas en su sesión."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preparadas = set()
+
+
+def a_parametros_posicionales(query: str) -> str:
+    """
+    Convierte los marcadores %s de psycopg2 en $1, $2, ... de PREPARE.
+
+    Args:
+        query: Consulta con marcadores %s
+
+    Returns:
+        Consulta con marcadores posicionales
+    """
+    contador = iter(range(1, query.count('%s') + 1))
+    return _MARCADOR.sub(lambda _: f"${next(contador)}", query)
+
+
+def ejecutar_preparada(cursor, nombre: str, query: str, params: tuple) -> None:
+    """
+    Ejecuta una consulta como sentencia preparada, preparándola antes si
+    la conexión del cursor aún no la tiene. Si la conexión no es una
+    ConexionPreparada (preparación deshabilitada), la ejecuta normalmente.
+
+    Args:
+        cursor: Cursor de la conexión donde ejecutar
+        nombre: Nombre único de la sentencia
+        query: Consulta con marcadores %s
+        params: Parámetros de la consulta
+    """
+    preparadas = getattr(cursor.connection, 'preparadas', None)
+    if preparadas is None:
+        cursor.execute(query, params)
+        return
+
+    if nombre not in preparadas:
+        cursor.execute(f"PREPARE {nombre} AS {a_parametros_posicionales(query)}")
+        preparadas.add(nombre)
+
+    marcadores = ', '.join(['%s'] * len(params))
+    try:
+        cursor.execute(f"EXECUTE {nombre} ({marcadores})", params)
+    except errors.InvalidSqlStatementName:
+        # La sesión perdió la sentencia (p. ej. DISCARD ALL): se prepara en el próximo uso
+        preparadas.discard(nombre)
+        raise
@@ -4,6 +4,7 @@ Carga variables de entorno y proporciona acceso a la configuración.
 """
 
 import os
+import socket
 from dataclasses import dataclass
 from typing import Optional
 
@@ -20,6 +21,11 @@ class ConfiguracionBaseDatos:
     base_datos: str
     usuario: str
     contrasena: str
+    pool_tiempo_espera: float = 30.0
+    pool_max_vida_segundos: float = 1800.0
+    pool_max_inactividad_segundos: float = 300.0
+    pool_validar_tras_segundos: float = 5.0
+    sentencias_preparadas: bool = True
 
     @property
     def url_conexion(self) -> str:
@@ -37,6 +43,61 @@ class ConfiguracionSelenium:
     tiempo_espera_implicito: int = 10
     tiempo_espera_explicito: int = 20
     modo_headless: bool = False
+    bloquear_recursos: bool = False
+    espera_por_eventos: bool = True
+    llenado_rapido: bool = True
+    llenado_diferencial: bool = False
+    max_busquedas_por_sesion: int = 500
+    max_memoria_mb: int = 1500
+    intervalo_medicion_memoria: int = 25
+
+
+@dataclass
+class ConfiguracionProcesamiento:
+    """Configuración del flujo de procesamiento de personas."""
+    num_navegadores: int = 1
+    backend_busqueda: str = "selenium"
+    modo_asincrono: bool = False
+    escritura_tamano_lote: int = 100
+    escritura_intervalo_segundos: float = 5.0
+    escritura_capacidad: int = 1000
+    tamano_lote_lectura: int = 5000
+    reanudar: bool = False
+    clasificacion_sql: bool = False
+    clasificacion_columnar: bool = False
+    deduplicar_busquedas: bool = True
+    ordenar_busquedas: bool = True
+    ventana_deduplicacion: int = 1000
+    archivo_mapeo_paises: str = ""
+    extraer_coincidencias: bool = False
+
+
+@dataclass
+class ConfiguracionCache:
+    """Configuración de la caché persistente de búsquedas OFAC."""
+    habilitada: bool = False
+    directorio: str = "cache"
+    ttl_horas: float = 168
+    ttl_sin_resultados_horas: float = 24
+    max_entradas: int = 200000
+
+
+@dataclass
+class ConfiguracionColaDistribuida:
+    """Configuración del reparto de búsquedas entre varios nodos."""
+    habilitada: bool = False
+    nodo: str = ""
+    reserva_segundos: float = 300.0
+    max_intentos: int = 3
+    tamano_reclamo: int = 5
+    espera_segundos: float = 10.0
+
+
+@dataclass
+class ConfiguracionListaSdn:
+    """Configuración del cribado local contra la lista SDN."""
+    archivo: str = "listas/sdn.xml"
+    puntaje_minimo: int = 90
 
 
 class Configuracion:
@@ -59,7 +120,14 @@ class Configuracion:
             puerto=os.getenv('DB_PORT', '5432'),
             base_datos=os.getenv('DB_NAME'),
             usuario=os.getenv('DB_USER'),
-            contrasena=os.getenv('DB_PASSWORD')
+            contrasena=os.getenv('DB_PASSWORD'),
+            pool_tiempo_espera=float(os.getenv('DB_POOL_TIEMPO_ESPERA', '30')),
+            pool_max_vida_segundos=float(os.getenv('DB_POOL_MAX_VIDA_SEGUNDOS', '1800')),
+            pool_max_inactividad_segundos=float(
+                os.getenv('DB_POOL_MAX_INACTIVIDAD_SEGUNDOS', '300')
+            ),
+            pool_validar_tras_segundos=float(os.getenv('DB_POOL_VALIDAR_TRAS_SEGUNDOS', '5')),
+            sentencias_preparadas=os.getenv('DB_SENTENCIAS_PREPARADAS', 'true').lower() == 'true'
         )
 
         self.selenium = ConfiguracionSelenium(
@@ -69,7 +137,56 @@ class Configuracion:
             ),
             tiempo_espera_implicito=int(os.getenv('SELENIUM_IMPLICIT_WAIT', '10')),
             tiempo_espera_explicito=int(os.getenv('SELENIUM_EXPLICIT_WAIT', '20')),
-            modo_headless=os.getenv('SELENIUM_HEADLESS', 'false').lower() == 'true'
+            modo_headless=os.getenv('SELENIUM_HEADLESS', 'false').lower() == 'true',
+            bloquear_recursos=os.getenv('SELENIUM_BLOQUEAR_RECURSOS', 'false').lower() == 'true',
+            espera_por_eventos=os.getenv('SELENIUM_ESPERA_EVENTOS', 'true').lower() == 'true',
+            llenado_rapido=os.getenv('SELENIUM_LLENADO_RAPIDO', 'true').lower() == 'true',
+            llenado_diferencial=os.getenv('SELENIUM_LLENADO_DIFERENCIAL', 'false').lower() == 'true',
+            max_busquedas_por_sesion=int(os.getenv('SELENIUM_MAX_BUSQUEDAS_SESION', '500')),
+            max_memoria_mb=int(os.getenv('SELENIUM_MAX_MEMORIA_MB', '1500')),
+            intervalo_medicion_memoria=max(
+                1, int(os.getenv('SELENIUM_INTERVALO_MEDICION_MEMORIA', '25'))
+            )
+        )
+
+        self.procesamiento = ConfiguracionProcesamiento(
+            num_navegadores=max(1, int(os.getenv('RPA_NUM_NAVEGADORES', '1'))),
+            backend_busqueda=os.getenv('RPA_BACKEND_BUSQUEDA', 'selenium').lower(),
+            modo_asincrono=os.getenv('RPA_MODO_ASINCRONO', 'false').lower() == 'true',
+            escritura_tamano_lote=max(1, int(os.getenv('RPA_ESCRITURA_TAMANO_LOTE', '100'))),
+            escritura_intervalo_segundos=float(os.getenv('RPA_ESCRITURA_INTERVALO_SEGUNDOS', '5')),
+            escritura_capacidad=max(1, int(os.getenv('RPA_ESCRITURA_CAPACIDAD', '1000'))),
+            tamano_lote_lectura=max(1, int(os.getenv('RPA_TAMANO_LOTE_LECTURA', '5000'))),
+            reanudar=os.getenv('RPA_REANUDAR', 'false').lower() == 'true',
+            clasificacion_sql=os.getenv('RPA_CLASIFICACION_SQL', 'false').lower() == 'true',
+            clasificacion_columnar=os.getenv('RPA_CLASIFICACION_COLUMNAR', 'false').lower() == 'true',
+            deduplicar_busquedas=os.getenv('RPA_DEDUPLICAR_BUSQUEDAS', 'true').lower() == 'true',
+            ordenar_busquedas=os.getenv('RPA_ORDENAR_BUSQUEDAS', 'true').lower() == 'true',
+            ventana_deduplicacion=max(1, int(os.getenv('RPA_VENTANA_DEDUPLICACION', '1000'))),
+            archivo_mapeo_paises=os.getenv('RPA_ARCHIVO_MAPEO_PAISES', ''),
+            extraer_coincidencias=os.getenv('RPA_EXTRAER_COINCIDENCIAS', 'false').lower() == 'true'
+        )
+
+        self.cache = ConfiguracionCache(
+            habilitada=os.getenv('CACHE_HABILITADA', 'false').lower() == 'true',
+            directorio=os.getenv('DIR_CACHE', 'cache'),
+            ttl_horas=float(os.getenv('CACHE_TTL_HORAS', '168')),
+            ttl_sin_resultados_horas=float(os.getenv('CACHE_TTL_SIN_RESULTADOS_HORAS', '24')),
+            max_entradas=int(os.getenv('CACHE_MAX_ENTRADAS', '200000'))
+        )
+
+        self.cola = ConfiguracionColaDistribuida(
+            habilitada=os.getenv('COLA_DISTRIBUIDA', 'false').lower() == 'true',
+            nodo=os.getenv('COLA_NODO') or f"{socket.gethostname()}-{os.getpid()}",
+            reserva_segundos=max(3.0, float(os.getenv('COLA_RESERVA_SEGUNDOS', '300'))),
+            max_intentos=max(1, int(os.getenv('COLA_MAX_INTENTOS', '3'))),
+            tamano_reclamo=max(1, int(os.getenv('COLA_TAMANO_RECLAMO', '5'))),
+            espera_segundos=float(os.getenv('COLA_ESPERA_SEGUNDOS', '10'))
+        )
+
+        self.lista_sdn = ConfiguracionListaSdn(
+            archivo=os.getenv('SDN_ARCHIVO', 'listas/sdn.xml'),
+            puntaje_minimo=int(os.getenv('SDN_PUNTAJE_MINIMO', '90'))
         )
 
         self.directorio_capturas = os.getenv('DIR_CAPTURAS', 'capturas')
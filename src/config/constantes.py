@@ -6,6 +6,11 @@ Constantes del proyecto.
 TABLA_PERSONAS = '"Personas"'
 TABLA_MAESTRA = '"MaestraDetallePersonas"'
 TABLA_RESULTADOS = '"Resultadosuser9145"'
+TABLA_COLA = '"ColaBusquedas"'
+TABLA_COINCIDENCIAS = '"CoincidenciasOfac"'
+
+# Restricción única de un resultado por persona (migración 005)
+RESTRICCION_RESULTADOS_PERSONA = "Resultadosuser9145_idPersona_key"
 
 # Estados de transacción
 ESTADO_OK = "OK"
@@ -13,6 +18,12 @@ ESTADO_NOK = "NOK"
 ESTADO_INFORMACION_INCOMPLETA = "Información incompleta"
 ESTADO_NO_CRUZA_MAESTRA = "No cruza con maestra"
 
+# Estados de la cola de trabajo distribuida
+COLA_PENDIENTE = "pendiente"
+COLA_EN_CURSO = "en_curso"
+COLA_HECHA = "hecha"
+COLA_FALLIDA = "fallida"
+
 # Valores para el campo aConsultar
 CONSULTAR_SI = "Si"
 CONSULTAR_NO = "No"
@@ -31,9 +42,30 @@ SELECTORES_OFAC = {
     'campo_pais': '#ctl00_MainContent_ddlCountry',  # Dropdown Country
     'boton_buscar': '#ctl00_MainContent_btnSearch',  # Boton Search
     'boton_reset': '#ctl00_MainContent_btnReset',  # Boton Reset
-    'resultado_conteo': '#ctl00_MainContent_lbResults'  # Texto "X Found"
+    'resultado_conteo': '#ctl00_MainContent_lbResults',  # Texto "X Found"
+    'resultado_tabla': '#gvSearchResults'  # Grilla de resultados
 }
 
+# Recursos que no se descargan cuando está activo el bloqueo de recursos
+# (patrones de Network.setBlockedURLs de Chrome DevTools)
+RECURSOS_BLOQUEADOS = [
+    # Imágenes
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico', '*.webp', '*.bmp',
+    # Fuentes
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Scripts de terceros (analítica y fuentes externas)
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*dap.digitalgov.gov*', '*fonts.googleapis.com*', '*fonts.gstatic.com*'
+]
+
+# Hojas de estilo: solo se cargan justo antes de una captura de pantalla
+ESTILOS_BLOQUEADOS = ['*.css', '*.css?*']
+
+# Backends de búsqueda OFAC
+BACKEND_SELENIUM = "selenium"
+BACKEND_HTTP = "http"
+BACKEND_LOCAL = "local"
+
 # Configuración de reintentos
 MAX_REINTENTOS = 3
 TIEMPO_ENTRE_REINTENTOS = 2
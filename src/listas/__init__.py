@@ -0,0 +1,7 @@
+"""
+Módulo de cribado local contra la lista SDN de OFAC.
+"""
+
+from .cargador_sdn import EntradaSdn, cargar_lista_sdn
+from .indice_sdn import IndiceSdn, CoincidenciaSdn
+from .buscador_sdn import BuscadorSdnLocal
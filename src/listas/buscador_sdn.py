@@ -0,0 +1,160 @@
+"""
+Buscador OFAC local: criba personas contra la lista SDN sin navegador.
+"""
+
+import html
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from src.config import Configuracion
+from src.scraping.buscador_ofac import ResultadoBusqueda
+from src.scraping.paises import IndiceOpcionesPais
+from .cargador_sdn import cargar_lista_sdn
+from .indice_sdn import IndiceSdn, CoincidenciaSdn
+
+logger = logging.getLogger(__name__)
+
+_indices: Dict[str, IndiceSdn] = {}
+_bloqueo_indices = threading.Lock()
+
+
+def obtener_indice(ruta: str) -> IndiceSdn:
+    """
+    Obtiene el índice de la lista, construyéndolo solo la primera vez.
+
+    Args:
+        ruta: Ruta del archivo de la lista SDN
+
+    Returns:
+        Índice compartido para esa lista
+    """
+    with _bloqueo_indices:
+        if ruta not in _indices:
+            _indices[ruta] = IndiceSdn(cargar_lista_sdn(ruta))
+        return _indices[ruta]
+
+
+class BuscadorSdnLocal:
+    """Buscador con la misma interfaz que BuscadorOfac, sobre la lista local."""
+
+    def __init__(
+        self,
+        ruta_lista: Optional[str] = None,
+        puntaje_minimo: Optional[int] = None
+    ):
+        """
+        Inicializa el buscador local.
+
+        Args:
+            ruta_lista: Archivo XML o CSV de la lista (por defecto, el configurado)
+            puntaje_minimo: Puntaje mínimo de similitud de nombre (0-100)
+        """
+        if ruta_lista is None or puntaje_minimo is None:
+            config = Configuracion()
+            ruta_lista = ruta_lista or config.lista_sdn.archivo
+            if puntaje_minimo is None:
+                puntaje_minimo = config.lista_sdn.puntaje_minimo
+
+        self.ruta_lista = ruta_lista
+        self.puntaje_minimo = puntaje_minimo
+        self.indice: Optional[IndiceSdn] = None
+        self.indice_paises: Optional[IndiceOpcionesPais] = None
+        self.coincidencias: List[CoincidenciaSdn] = []
+        self._consulta_actual = ""
+
+    def navegar_a_ofac(self) -> bool:
+        """
+        Carga el índice de la lista local y resuelve los países de la
+        maestra contra los de la lista, igual que contra el dropdown OFAC.
+
+        Returns:
+            True si la lista se cargó correctamente
+        """
+        try:
+            self.indice = obtener_indice(self.ruta_lista)
+            self.indice_paises = IndiceOpcionesPais((p, p) for p in self.indice.paises)
+            return True
+        except Exception as e:
+            logger.error(f"Error al cargar la lista SDN: {e}")
+            return False
+
+    def buscar_persona(
+        self,
+        nombre: str,
+        direccion: Optional[str] = None,
+        pais: Optional[str] = None
+    ) -> ResultadoBusqueda:
+        """
+        Criba una persona contra la lista local.
+
+        Args:
+            nombre: Nombre de la persona a buscar
+            direccion: Dirección de la persona (opcional)
+            pais: País de la persona (opcional)
+
+        Returns:
+            Objeto ResultadoBusqueda con el número de entradas coincidentes
+        """
+        if self.indice is None and not self.navegar_a_ofac():
+            return ResultadoBusqueda(
+                exito=False,
+                mensaje_error="Lista SDN no disponible"
+            )
+
+        # Como en el sitio, un país sin equivalente en la lista no filtra
+        pais_lista = self.indice_paises.resolver(pais) if pais else None
+
+        self.coincidencias = self.indice.buscar(
+            nombre,
+            direccion=direccion,
+            pais=pais_lista,
+            puntaje_minimo=self.puntaje_minimo
+        )
+        self._consulta_actual = f"{nombre} | {direccion or ''} | {pais or ''}"
+
+        return ResultadoBusqueda(
+            exito=True,
+            cantidad_resultados=len(self.coincidencias)
+        )
+
+    def capturar_pantalla(self, ruta_archivo: str) -> bool:
+        """
+        Guarda como evidencia una tabla HTML con las coincidencias de la última búsqueda.
+
+        Args:
+            ruta_archivo: Ruta donde guardar la evidencia
+
+        Returns:
+            True si la evidencia se guardó
+        """
+        filas = "\n".join(
+            "<tr>"
+            f"<td>{html.escape(c.entrada.nombre)}</td>"
+            f"<td>{html.escape('; '.join(c.entrada.direcciones))}</td>"
+            f"<td>{html.escape(c.entrada.tipo)}</td>"
+            f"<td>{html.escape('; '.join(c.entrada.programas))}</td>"
+            f"<td>{html.escape(c.entrada.lista)}</td>"
+            f"<td>{c.puntaje}</td>"
+            "</tr>"
+            for c in self.coincidencias
+        )
+        contenido = (
+            "<html><body>"
+            f"<p>Búsqueda local: {html.escape(self._consulta_actual)}</p>"
+            f"<p>{len(self.coincidencias)} Found</p>"
+            "<table><tr><th>Name</th><th>Address</th><th>Type</th>"
+            "<th>Program(s)</th><th>List</th><th>Score</th></tr>"
+            f"{filas}</table></body></html>"
+        )
+
+        try:
+            with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido)
+            return True
+        except OSError as e:
+            logger.error(f"Error en captura: {e}")
+            return False
+
+    def cerrar(self) -> None:
+        """No mantiene recursos abiertos; existe por simetría con otros buscadores."""
@@ -0,0 +1,208 @@
+"""
+Carga de la lista SDN / consolidada de OFAC desde archivos XML o CSV.
+"""
+
+import csv
+import logging
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Valor que OFAC usa para los campos vacíos en los CSV
+VALOR_NULO_CSV = "-0-"
+
+# Archivos complementarios de direcciones y alias según el archivo principal
+ARCHIVOS_COMPLEMENTARIOS = {
+    'sdn.csv': ('add.csv', 'alt.csv'),
+    'cons_prim.csv': ('cons_add.csv', 'cons_alt.csv'),
+}
+
+
+@dataclass
+class EntradaSdn:
+    """Entrada de la lista SDN con sus nombres alternativos y direcciones."""
+    uid: str
+    nombre: str
+    tipo: str = ""
+    programas: List[str] = field(default_factory=list)
+    alias: List[str] = field(default_factory=list)
+    direcciones: List[str] = field(default_factory=list)
+    paises: List[str] = field(default_factory=list)
+    lista: str = "SDN"
+
+
+def cargar_lista_sdn(ruta: str) -> List[EntradaSdn]:
+    """
+    Carga la lista desde un archivo XML (sdn.xml, consolidated.xml)
+    o CSV (sdn.csv, cons_prim.csv, con sus add/alt si existen).
+
+    Args:
+        ruta: Ruta del archivo de la lista
+
+    Returns:
+        Lista de entradas cargadas
+    """
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No existe el archivo de la lista SDN: {ruta}")
+
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension == '.xml':
+        entradas = _cargar_xml(ruta)
+    elif extension == '.csv':
+        entradas = _cargar_csv(ruta)
+    else:
+        raise ValueError(f"Formato de lista SDN no soportado: {extension}")
+
+    logger.info(f"Lista SDN cargada: {len(entradas)} entradas desde {ruta}")
+    return entradas
+
+
+def _cargar_xml(ruta: str) -> List[EntradaSdn]:
+    """Carga el formato XML publicado por OFAC (sdnEntry)."""
+    entradas = []
+    lista = 'SDN' if 'sdn' in os.path.basename(ruta).lower() else 'Non-SDN'
+
+    for _, elemento in ET.iterparse(ruta, events=('end',)):
+        if _etiqueta(elemento) != 'sdnEntry':
+            continue
+
+        hijos = {_etiqueta(h): h for h in elemento}
+
+        entrada = EntradaSdn(
+            uid=_texto(hijos.get('uid')),
+            nombre=_unir_nombre(
+                _texto(hijos.get('firstName')),
+                _texto(hijos.get('lastName'))
+            ),
+            tipo=_texto(hijos.get('sdnType')),
+            lista=lista
+        )
+
+        for programa in _descendientes(hijos.get('programList'), 'program'):
+            entrada.programas.append(_texto(programa))
+
+        for aka in _descendientes(hijos.get('akaList'), 'aka'):
+            partes = {_etiqueta(h): _texto(h) for h in aka}
+            nombre_alias = _unir_nombre(partes.get('firstName', ''), partes.get('lastName', ''))
+            if nombre_alias:
+                entrada.alias.append(nombre_alias)
+
+        for direccion in _descendientes(hijos.get('addressList'), 'address'):
+            partes = {_etiqueta(h): _texto(h) for h in direccion}
+            _agregar_direccion(
+                entrada,
+                ' '.join(
+                    partes.get(clave, '')
+                    for clave in ('address1', 'address2', 'address3',
+                                  'city', 'stateOrProvince', 'postalCode')
+                ),
+                partes.get('country', '')
+            )
+
+        entradas.append(entrada)
+        elemento.clear()
+
+    return entradas
+
+
+def _cargar_csv(ruta: str) -> List[EntradaSdn]:
+    """Carga el formato CSV publicado por OFAC (sin encabezados)."""
+    directorio = os.path.dirname(ruta)
+    nombre_archivo = os.path.basename(ruta).lower()
+    lista = 'Non-SDN' if nombre_archivo.startswith('cons_') else 'SDN'
+
+    entradas: Dict[str, EntradaSdn] = {}
+
+    for fila in _leer_csv(ruta):
+        if len(fila) < 4:
+            continue
+        entradas[fila[0]] = EntradaSdn(
+            uid=fila[0],
+            nombre=_valor_csv(fila[1]),
+            tipo=_valor_csv(fila[2]),
+            programas=[p.strip() for p in _valor_csv(fila[3]).split(';') if p.strip()],
+            lista=lista
+        )
+
+    archivo_direcciones, archivo_alias = ARCHIVOS_COMPLEMENTARIOS.get(
+        nombre_archivo, (None, None)
+    )
+
+    if archivo_direcciones:
+        for fila in _leer_csv(os.path.join(directorio, archivo_direcciones)):
+            entrada = entradas.get(fila[0]) if fila else None
+            if entrada is None or len(fila) < 5:
+                continue
+            _agregar_direccion(
+                entrada,
+                f"{_valor_csv(fila[2])} {_valor_csv(fila[3])}",
+                _valor_csv(fila[4])
+            )
+
+    if archivo_alias:
+        for fila in _leer_csv(os.path.join(directorio, archivo_alias)):
+            entrada = entradas.get(fila[0]) if fila else None
+            if entrada is None or len(fila) < 4:
+                continue
+            nombre_alias = _valor_csv(fila[3])
+            if nombre_alias:
+                entrada.alias.append(nombre_alias)
+
+    return list(entradas.values())
+
+
+def _leer_csv(ruta: str):
+    """Itera las filas de un CSV de OFAC, si el archivo existe."""
+    if not os.path.exists(ruta):
+        return
+
+    with open(ruta, encoding='utf-8', errors='replace', newline='') as archivo:
+        for fila in csv.reader(archivo):
+            yield [valor.strip() for valor in fila]
+
+
+def _agregar_direccion(entrada: EntradaSdn, direccion: str, pais: str) -> None:
+    """Agrega una dirección y su país a la entrada."""
+    direccion = ' '.join(direccion.split())
+    if direccion:
+        entrada.direcciones.append(direccion)
+    if pais and pais not in entrada.paises:
+        entrada.paises.append(pais)
+
+
+def _valor_csv(valor: str) -> str:
+    """Convierte el marcador de nulo de OFAC en cadena vacía."""
+    valor = valor.strip()
+    return '' if valor == VALOR_NULO_CSV else valor
+
+
+def _unir_nombre(nombre: str, apellido: str) -> str:
+    """Une nombre y apellido como los muestra OFAC: 'APELLIDO, Nombre'."""
+    if nombre and apellido:
+        return f"{apellido}, {nombre}"
+    return apellido or nombre
+
+
+def _etiqueta(elemento: Optional[ET.Element]) -> str:
+    """Obtiene la etiqueta de un elemento sin el espacio de nombres."""
+    if elemento is None:
+        return ''
+    return elemento.tag.rsplit('}', 1)[-1]
+
+
+def _texto(elemento: Optional[ET.Element]) -> str:
+    """Obtiene el texto de un elemento o cadena vacía."""
+    if elemento is None or elemento.text is None:
+        return ''
+    return elemento.text.strip()
+
+
+def _descendientes(elemento: Optional[ET.Element], etiqueta: str):
+    """Itera los hijos directos de un elemento con la etiqueta indicada."""
+    if elemento is None:
+        return []
+    return [h for h in elemento if _etiqueta(h) == etiqueta]
@@ -0,0 +1,186 @@
+"""
+Índice en memoria de la lista SDN con recuperación por trigramas
+y puntaje de similitud de nombres.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.utilidades.normalizacion import normalizar_texto
+from .cargador_sdn import EntradaSdn
+
+logger = logging.getLogger(__name__)
+
+# Trigramas presentes en más de esta fracción de nombres no discriminan
+FRACCION_MAXIMA_TRIGRAMA = 0.05
+
+# Fracción mínima de trigramas compartidos para considerar un candidato
+FRACCION_MINIMA_CANDIDATO = 0.3
+
+
+@dataclass
+class CoincidenciaSdn:
+    """Entrada de la lista que coincide con una búsqueda."""
+    entrada: EntradaSdn
+    nombre_coincidente: str
+    puntaje: int
+
+
+def trigramas(texto: str) -> Set[str]:
+    """
+    Obtiene los trigramas de caracteres de un texto ya normalizado.
+    El relleno (dos espacios al inicio y uno al final) se agrega al texto
+    completo, no a cada palabra: los trigramas del medio cruzan el
+    espacio entre palabras, como "n p" en "juan perez".
+
+    Args:
+        texto: Texto normalizado
+
+    Returns:
+        Conjunto de trigramas del texto con relleno en sus bordes
+    """
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def puntaje_similitud(consulta: str, candidato: str) -> int:
+    """
+    Calcula la similitud (0-100) entre dos nombres normalizados.
+    Toma el mejor valor entre la comparación directa y la comparación con
+    las palabras ordenadas, para no depender del orden nombre/apellido.
+
+    Args:
+        consulta: Nombre buscado, normalizado
+        candidato: Nombre de la lista, normalizado
+
+    Returns:
+        Puntaje de similitud entre 0 y 100
+    """
+    directo = SequenceMatcher(None, consulta, candidato).ratio()
+    ordenado = SequenceMatcher(
+        None,
+        ' '.join(sorted(consulta.split())),
+        ' '.join(sorted(candidato.split()))
+    ).ratio()
+
+    return int(round(max(directo, ordenado) * 100))
+
+
+class IndiceSdn:
+    """Índice de nombres de la lista SDN para cribado local."""
+
+    def __init__(self, entradas: Iterable[EntradaSdn]):
+        """
+        Construye el índice de trigramas de todos los nombres y alias.
+
+        Args:
+            entradas: Entradas cargadas de la lista SDN
+        """
+        self.entradas: List[EntradaSdn] = []
+        self._nombres: List[str] = []
+        self._entrada_de_nombre: List[int] = []
+        self._paises: List[Set[str]] = []
+        self.paises: List[str] = []
+        self._direcciones: List[List[str]] = []
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+
+        for entrada in entradas:
+            posicion_entrada = len(self.entradas)
+            self.entradas.append(entrada)
+            self._paises.append({normalizar_texto(p) for p in entrada.paises})
+            self._direcciones.append([normalizar_texto(d) for d in entrada.direcciones])
+
+            for nombre in [entrada.nombre] + entrada.alias:
+                nombre_normalizado = normalizar_texto(nombre.replace(',', ' '))
+                if not nombre_normalizado:
+                    continue
+
+                posicion_nombre = len(self._nombres)
+                self._nombres.append(nombre_normalizado)
+                self._entrada_de_nombre.append(posicion_entrada)
+
+                for trigrama in trigramas(nombre_normalizado):
+                    postings[trigrama].append(posicion_nombre)
+
+        self.paises = sorted({p for entrada in self.entradas for p in entrada.paises if p})
+
+        limite = max(50, int(len(self._nombres) * FRACCION_MAXIMA_TRIGRAMA))
+        self._postings = {
+            trigrama: posiciones
+            for trigrama, posiciones in postings.items()
+            if len(posiciones) <= limite
+        }
+
+        logger.info(
+            f"Índice SDN construido: {len(self.entradas)} entradas, "
+            f"{len(self._nombres)} nombres"
+        )
+
+    def buscar(
+        self,
+        nombre: str,
+        direccion: Optional[str] = None,
+        pais: Optional[str] = None,
+        puntaje_minimo: int = 90
+    ) -> List[CoincidenciaSdn]:
+        """
+        Busca las entradas cuyo nombre se parece al buscado y que cumplen
+        los filtros de dirección y país, como lo hace el sitio OFAC.
+
+        Args:
+            nombre: Nombre de la persona
+            direccion: Dirección de la persona (opcional)
+            pais: País tal como figura en la lista (opcional); los países
+                de la maestra se resuelven antes con BuscadorSdnLocal
+            puntaje_minimo: Puntaje mínimo de similitud (0-100)
+
+        Returns:
+            Coincidencias ordenadas por puntaje, una por entrada
+        """
+        consulta = normalizar_texto(nombre.replace(',', ' '))
+        if not consulta:
+            return []
+
+        trigramas_consulta = [t for t in trigramas(consulta) if t in self._postings]
+        if not trigramas_consulta:
+            return []
+
+        conteo = Counter()
+        for trigrama in trigramas_consulta:
+            conteo.update(self._postings[trigrama])
+
+        minimo_compartidos = max(1, int(len(trigramas_consulta) * FRACCION_MINIMA_CANDIDATO))
+        pais_normalizado = normalizar_texto(pais)
+        direccion_normalizada = normalizar_texto(direccion)
+
+        mejores: Dict[int, CoincidenciaSdn] = {}
+
+        for posicion_nombre, compartidos in conteo.items():
+            if compartidos < minimo_compartidos:
+                continue
+
+            posicion_entrada = self._entrada_de_nombre[posicion_nombre]
+            if pais_normalizado and pais_normalizado not in self._paises[posicion_entrada]:
+                continue
+            if direccion_normalizada and not any(
+                direccion_normalizada in d for d in self._direcciones[posicion_entrada]
+            ):
+                continue
+
+            puntaje = puntaje_similitud(consulta, self._nombres[posicion_nombre])
+            if puntaje < puntaje_minimo:
+                continue
+
+            actual = mejores.get(posicion_entrada)
+            if actual is None or puntaje > actual.puntaje:
+                mejores[posicion_entrada] = CoincidenciaSdn(
+                    entrada=self.entradas[posicion_entrada],
+                    nombre_coincidente=self._nombres[posicion_nombre],
+                    puntaje=puntaje
+                )
+
+        return sorted(mejores.values(), key=lambda c: c.puntaje, reverse=True)
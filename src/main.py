@@ -3,6 +3,7 @@ Punto de entrada principal del bot RPA para verificación OFAC.
 """
 
 import sys
+import asyncio
 import logging
 
 from src.utilidades.logger import configurar_logging_global, escribir_resumen
@@ -15,7 +16,12 @@ def main():
 
     try:
         servicio = ServicioProcesamiento()
-        estadisticas = servicio.ejecutar()
+
+        # El modo distribuido ya solapa el trabajo entre nodos: siempre es síncrono
+        if servicio.config.procesamiento.modo_asincrono and not servicio.config.cola.habilitada:
+            estadisticas = asyncio.run(servicio.ejecutar_async())
+        else:
+            estadisticas = servicio.ejecutar()
 
         print("\n" + "=" * 50)
         print("RESUMEN")
@@ -26,6 +32,7 @@ def main():
         print(f"  No cruzan maestra:   {estadisticas['no_cruzan_maestra']}")
         print(f"  Info incompleta:     {estadisticas['informacion_incompleta']}")
         print(f"  Errores:             {estadisticas['errores']}")
+        print(f"  Búsquedas evitadas:  {estadisticas['busquedas_ahorradas']}")
         print("=" * 50)
 
         ruta_resumen = escribir_resumen(estadisticas)
@@ -1,6 +1,13 @@
 """
-Módulo de scraping web con Selenium.
+Módulo de scraping web con Selenium o peticiones HTTP.
 """
 
-from .navegador import crear_navegador, cerrar_navegador
+from .navegador import (
+    crear_navegador,
+    cerrar_navegador,
+    crear_navegador_independiente,
+    cerrar_navegador_independiente
+)
 from .buscador_ofac import BuscadorOfac
+from .buscador_http import BuscadorOfacHttp
+from .ciclo_vida import GestorNavegador
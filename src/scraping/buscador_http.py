@@ -0,0 +1,391 @@
+"""
+Buscador de sanciones OFAC mediante peticiones HTTP directas.
+Reproduce el POST del formulario ASP.NET sin abrir un navegador.
+"""
+
+import logging
+import re
+import time
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import Configuracion
+from src.config.constantes import SELECTORES_OFAC, MAX_REINTENTOS, TIEMPO_ENTRE_REINTENTOS
+from .buscador_ofac import ResultadoBusqueda
+from .resultados_ofac import extraer_resultados
+from .paises import IndiceOpcionesPais
+
+logger = logging.getLogger(__name__)
+
+# Campos de estado de ASP.NET que siempre se toman de la última respuesta
+CAMPOS_ESTADO_ASPNET = (
+    '__VIEWSTATE',
+    '__VIEWSTATEGENERATOR',
+    '__EVENTVALIDATION',
+    '__EVENTTARGET',
+    '__EVENTARGUMENT',
+    '__LASTFOCUS',
+    '__PREVIOUSPAGE'
+)
+
+
+class _ParserFormulario(HTMLParser):
+    """Extrae los campos del formulario principal y el texto de resultados."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.accion: Optional[str] = None
+        self.campos: List[Dict[str, str]] = []
+        self.selects: Dict[str, Dict] = {}
+        self.texto_resultados: Optional[str] = None
+
+        self._select_actual: Optional[str] = None
+        self._opcion_actual: Optional[Dict] = None
+        self._en_resultados = False
+        self._textarea_actual: Optional[Dict[str, str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        atributos = {k: (v if v is not None else '') for k, v in attrs}
+
+        if tag == 'form' and self.accion is None:
+            self.accion = atributos.get('action', '')
+
+        elif tag == 'input' and atributos.get('name'):
+            self.campos.append({
+                'nombre': atributos['name'],
+                'id': atributos.get('id', ''),
+                'tipo': atributos.get('type', 'text').lower(),
+                'valor': atributos.get('value', ''),
+                'marcado': 'checked' in atributos
+            })
+
+        elif tag == 'textarea' and atributos.get('name'):
+            self._textarea_actual = {
+                'nombre': atributos['name'],
+                'id': atributos.get('id', ''),
+                'tipo': 'textarea',
+                'valor': '',
+                'marcado': False
+            }
+
+        elif tag == 'select' and atributos.get('name'):
+            self._select_actual = atributos['name']
+            self.selects[self._select_actual] = {
+                'id': atributos.get('id', ''),
+                'opciones': [],
+                'seleccionado': None
+            }
+
+        elif tag == 'option' and self._select_actual is not None:
+            self._opcion_actual = {
+                'valor': atributos.get('value'),
+                'texto': '',
+                'seleccionada': 'selected' in atributos
+            }
+
+        elif tag == 'span' and atributos.get('id') == SELECTORES_OFAC['resultado_conteo'].lstrip('#'):
+            self._en_resultados = True
+            self.texto_resultados = ''
+
+    def handle_endtag(self, tag):
+        if tag == 'option' and self._opcion_actual is not None:
+            opcion = self._opcion_actual
+            opcion['texto'] = opcion['texto'].strip()
+            if opcion['valor'] is None:
+                opcion['valor'] = opcion['texto']
+
+            select = self.selects[self._select_actual]
+            select['opciones'].append((opcion['valor'], opcion['texto']))
+            if opcion['seleccionada']:
+                select['seleccionado'] = opcion['valor']
+            self._opcion_actual = None
+
+        elif tag == 'select':
+            select = self.selects.get(self._select_actual)
+            if select is not None and select['seleccionado'] is None and select['opciones']:
+                select['seleccionado'] = select['opciones'][0][0]
+            self._select_actual = None
+
+        elif tag == 'textarea' and self._textarea_actual is not None:
+            self.campos.append(self._textarea_actual)
+            self._textarea_actual = None
+
+        elif tag == 'span' and self._en_resultados:
+            self._en_resultados = False
+
+    def handle_data(self, data):
+        if self._opcion_actual is not None:
+            self._opcion_actual['texto'] += data
+        if self._textarea_actual is not None:
+            self._textarea_actual['valor'] += data
+        if self._en_resultados:
+            self.texto_resultados += data
+
+
+class BuscadorOfacHttp:
+    """Buscador OFAC que envía el formulario por HTTP, sin Selenium."""
+
+    def __init__(
+        self,
+        url_ofac: Optional[str] = None,
+        tiempo_espera: Optional[int] = None,
+        conexiones_por_host: int = 4,
+        extraer_coincidencias: bool = False
+    ):
+        """
+        Inicializa el buscador HTTP.
+
+        Args:
+            url_ofac: URL del formulario de búsqueda (por defecto, la configurada)
+            tiempo_espera: Timeout de cada petición en segundos
+            conexiones_por_host: Tamaño del pool de conexiones keep-alive
+            extraer_coincidencias: Si es True, además de la cantidad lee
+                las filas de la grilla de resultados
+        """
+        if url_ofac is None or tiempo_espera is None:
+            config = Configuracion()
+            url_ofac = url_ofac or config.selenium.url_ofac
+            if tiempo_espera is None:
+                tiempo_espera = config.selenium.tiempo_espera_explicito
+
+        self.url_ofac = url_ofac
+        self.tiempo_espera = tiempo_espera
+        self.extraer_coincidencias = extraer_coincidencias
+
+        self.sesion = requests.Session()
+        adaptador = HTTPAdapter(
+            pool_connections=conexiones_por_host,
+            pool_maxsize=conexiones_por_host
+        )
+        self.sesion.mount('http://', adaptador)
+        self.sesion.mount('https://', adaptador)
+        self.sesion.headers.update({
+            'User-Agent': (
+                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+            )
+        })
+
+        self.html_actual: str = ''
+        self._url_accion: Optional[str] = None
+        self._campos_iniciales: List[Dict[str, str]] = []
+        self._selects_iniciales: Dict[str, Dict] = {}
+        self._estado_aspnet: Dict[str, str] = {}
+        self._indice_paises: Optional[IndiceOpcionesPais] = None
+
+    def navegar_a_ofac(self) -> bool:
+        """
+        Descarga el formulario de búsqueda y guarda su estado ASP.NET.
+
+        Returns:
+            True si la página se obtuvo y contiene el formulario
+        """
+        try:
+            respuesta = self.sesion.get(self.url_ofac, timeout=self.tiempo_espera)
+            respuesta.raise_for_status()
+
+            parser = self._analizar(respuesta.text)
+            if parser.accion is None:
+                logger.error("La página OFAC no contiene el formulario de búsqueda")
+                return False
+
+            self._campos_iniciales = parser.campos
+            self._selects_iniciales = parser.selects
+            self._indice_paises = None
+            self._actualizar_estado(respuesta, parser)
+            return True
+
+        except requests.RequestException as e:
+            logger.error(f"Error al navegar a OFAC: {e}")
+            return False
+
+    def buscar_persona(
+        self,
+        nombre: str,
+        direccion: Optional[str] = None,
+        pais: Optional[str] = None
+    ) -> ResultadoBusqueda:
+        """
+        Realiza una búsqueda de persona en OFAC enviando el formulario.
+
+        Args:
+            nombre: Nombre de la persona a buscar
+            direccion: Dirección de la persona (opcional)
+            pais: País de la persona (opcional)
+
+        Returns:
+            Objeto ResultadoBusqueda con el resultado
+        """
+        for intento in range(MAX_REINTENTOS):
+            try:
+                if self._url_accion is None and not self.navegar_a_ofac():
+                    raise requests.RequestException("Formulario OFAC no disponible")
+
+                datos = self._construir_formulario(nombre, direccion, pais)
+                respuesta = self.sesion.post(
+                    self._url_accion,
+                    data=datos,
+                    timeout=self.tiempo_espera
+                )
+                respuesta.raise_for_status()
+
+                parser = self._analizar(respuesta.text)
+                self._actualizar_estado(respuesta, parser)
+
+                if self.extraer_coincidencias:
+                    cantidad, coincidencias = extraer_resultados(respuesta.text)
+                else:
+                    cantidad, coincidencias = self._extraer_cantidad(respuesta.text, parser), []
+
+                return ResultadoBusqueda(
+                    exito=True,
+                    cantidad_resultados=cantidad,
+                    coincidencias=coincidencias
+                )
+
+            except Exception as e:
+                logger.warning(f"Intento {intento + 1} de búsqueda HTTP fallido: {e}")
+                if intento < MAX_REINTENTOS - 1:
+                    time.sleep(TIEMPO_ENTRE_REINTENTOS)
+                    self.navegar_a_ofac()
+
+        return ResultadoBusqueda(
+            exito=False,
+            mensaje_error=f"Falló después de {MAX_REINTENTOS} intentos"
+        )
+
+    def capturar_pantalla(self, ruta_archivo: str) -> bool:
+        """
+        Guarda el HTML de la última respuesta como evidencia.
+
+        Args:
+            ruta_archivo: Ruta donde guardar el HTML
+
+        Returns:
+            True si la evidencia se guardó
+        """
+        try:
+            with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+                archivo.write(self.html_actual)
+            return True
+        except OSError as e:
+            logger.error(f"Error en captura: {e}")
+            return False
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones keep-alive de la sesión."""
+        self.sesion.close()
+
+    def _construir_formulario(
+        self,
+        nombre: str,
+        direccion: Optional[str],
+        pais: Optional[str]
+    ) -> List[Tuple[str, str]]:
+        """
+        Arma los datos del POST: valores por defecto del formulario,
+        estado ASP.NET de la última respuesta y los criterios de búsqueda.
+        """
+        nombre_campo = self._nombre_por_selector('campo_nombre')
+        direccion_campo = self._nombre_por_selector('campo_direccion')
+        pais_campo = self._nombre_por_selector('campo_pais')
+        boton_buscar = self._nombre_por_selector('boton_buscar')
+
+        if nombre_campo is None:
+            raise ValueError("El formulario OFAC no contiene el campo de nombre")
+
+        valores: Dict[str, str] = {}
+        datos: List[Tuple[str, str]] = []
+
+        for campo in self._campos_iniciales:
+            tipo = campo['tipo']
+            if tipo in ('submit', 'button', 'image', 'reset') and campo['nombre'] != boton_buscar:
+                continue
+            if tipo in ('checkbox', 'radio') and not campo['marcado']:
+                continue
+            if campo['nombre'] in CAMPOS_ESTADO_ASPNET:
+                continue
+            datos.append((campo['nombre'], campo['valor']))
+
+        for nombre_select, select in self._selects_iniciales.items():
+            datos.append((nombre_select, select['seleccionado'] or ''))
+
+        for clave, valor in self._estado_aspnet.items():
+            datos.append((clave, valor))
+
+        valores[nombre_campo] = nombre
+        if direccion_campo:
+            valores[direccion_campo] = direccion or ''
+        if pais_campo:
+            valor_pais = self._resolver_pais(pais_campo, pais) if pais else None
+            if valor_pais is not None:
+                valores[pais_campo] = valor_pais
+
+        return [(clave, valores.get(clave, valor)) for clave, valor in datos]
+
+    def _resolver_pais(self, nombre_select: str, pais: str) -> Optional[str]:
+        """Obtiene el valor de la opción del dropdown que corresponde al país."""
+        if self._indice_paises is None:
+            opciones = self._selects_iniciales.get(nombre_select, {}).get('opciones', [])
+            self._indice_paises = IndiceOpcionesPais(opciones)
+
+        return self._indice_paises.resolver(pais)
+
+    def _nombre_por_selector(self, clave: str) -> Optional[str]:
+        """Traduce un selector de SELECTORES_OFAC al atributo name del campo."""
+        id_campo = SELECTORES_OFAC[clave].lstrip('#')
+
+        for campo in self._campos_iniciales:
+            if campo['id'] == id_campo:
+                return campo['nombre']
+
+        for nombre_select, select in self._selects_iniciales.items():
+            if select['id'] == id_campo:
+                return nombre_select
+
+        return None
+
+    def _actualizar_estado(
+        self,
+        respuesta: requests.Response,
+        parser: _ParserFormulario
+    ) -> None:
+        """Guarda el HTML actual y los campos de estado ASP.NET de la respuesta."""
+        self.html_actual = respuesta.text
+        if parser.accion is not None:
+            self._url_accion = urljoin(respuesta.url, parser.accion)
+        self._estado_aspnet = {
+            campo['nombre']: campo['valor']
+            for campo in parser.campos
+            if campo['nombre'] in CAMPOS_ESTADO_ASPNET
+        }
+
+    @staticmethod
+    def _analizar(html: str) -> _ParserFormulario:
+        """Analiza el HTML de una respuesta del sitio OFAC."""
+        parser = _ParserFormulario()
+        parser.feed(html)
+        parser.close()
+        return parser
+
+    @staticmethod
+    def _extraer_cantidad(html: str, parser: _ParserFormulario) -> int:
+        """
+        Extrae la cantidad de resultados "X Found" de la respuesta.
+
+        Returns:
+            Número de resultados encontrados
+        """
+        texto = parser.texto_resultados
+        if texto is None:
+            texto = re.sub(r'<[^>]+>', ' ', html)
+
+        numeros = re.findall(r'(\d+)\s+Found', texto)
+        if numeros:
+            return int(numeros[0])
+
+        return 0
@@ -5,8 +5,8 @@ Buscador de sanciones OFAC mediante web scraping.
 import logging
 import time
 import re
-from typing import Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -16,9 +16,30 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from src.config import Configuracion
 from src.config.constantes import SELECTORES_OFAC, MAX_REINTENTOS, TIEMPO_ENTRE_REINTENTOS
+from .esperas import PoliticaEspera
+from .paises import IndiceOpcionesPais
+from .resultados_ofac import CoincidenciaOfac, extraer_resultados
 
 logger = logging.getLogger(__name__)
 
+# Escribe los campos [id, valor, obligatorio] disparando input y change.
+# Con arguments[1] verdadero omite los que ya tienen el valor pedido.
+# Devuelve cuántos campos escribió, o -1 si la página no aceptó alguno.
+_SCRIPT_ESCRIBIR_CAMPOS = (
+    "var campos = arguments[0], soloCambios = arguments[1], escritos = 0;"
+    "for (var i = 0; i < campos.length; i++) {"
+    "  var campo = document.getElementById(campos[i][0]);"
+    "  if (!campo) { if (campos[i][2]) { return -1; } continue; }"
+    "  if (soloCambios && campo.value === campos[i][1]) { continue; }"
+    "  campo.value = campos[i][1];"
+    "  campo.dispatchEvent(new Event('input', {bubbles: true}));"
+    "  campo.dispatchEvent(new Event('change', {bubbles: true}));"
+    "  if (campo.value !== campos[i][1]) { return -1; }"
+    "  escritos++;"
+    "}"
+    "return escritos;"
+)
+
 
 @dataclass
 class ResultadoBusqueda:
@@ -26,6 +47,9 @@ class ResultadoBusqueda:
     exito: bool
     cantidad_resultados: int = 0
     mensaje_error: Optional[str] = None
+    desde_cache: bool = False
+    ruta_evidencia: Optional[str] = None
+    coincidencias: List[CoincidenciaOfac] = field(default_factory=list)
 
 
 class BuscadorOfac:
@@ -42,6 +66,18 @@ class BuscadorOfac:
         self.config = Configuracion()
         self.url_ofac = self.config.selenium.url_ofac
         self.tiempo_espera = self.config.selenium.tiempo_espera_explicito
+        self.esperas = PoliticaEspera(
+            navegador,
+            self.tiempo_espera,
+            por_eventos=self.config.selenium.espera_por_eventos,
+            tiempo_espera_implicito=self.config.selenium.tiempo_espera_implicito
+        )
+        self._indice_paises: Optional[IndiceOpcionesPais] = None
+        self._sesion_indice: Optional[str] = None
+
+        # Contadores para medir el costo de llenar el formulario
+        self.reinicios_formulario = 0
+        self.campos_escritos = 0
 
     def navegar_a_ofac(self) -> bool:
         """
@@ -89,23 +125,42 @@ class BuscadorOfac:
         """
         for intento in range(MAX_REINTENTOS):
             try:
-                self._limpiar_formulario()
+                # El formulario conserva los valores de la búsqueda anterior:
+                # solo se cambian los campos distintos, sin pasar por Reset
+                llenado = (
+                    self.config.selenium.llenado_diferencial and
+                    self._llenar_formulario_diferencial(nombre, direccion, pais)
+                )
 
-                self._llenar_campo_nombre(nombre)
+                if not llenado:
+                    self._limpiar_formulario()
 
-                if direccion:
-                    self._llenar_campo_direccion(direccion)
+                    llenado = (
+                        self.config.selenium.llenado_rapido and
+                        self._llenar_formulario_rapido(nombre, direccion, pais)
+                    )
 
-                if pais:
-                    self._seleccionar_pais(pais)
+                if not llenado:
+                    self._llenar_campo_nombre(nombre)
+
+                    if direccion:
+                        self._llenar_campo_direccion(direccion)
+
+                    if pais:
+                        self._seleccionar_pais(pais)
 
                 self._hacer_clic_buscar()
 
-                cantidad = self._extraer_cantidad_resultados()
+                if self.config.procesamiento.extraer_coincidencias:
+                    # Una sola lectura del DOM en lugar de consultar elemento por elemento
+                    cantidad, coincidencias = extraer_resultados(self.navegador.page_source)
+                else:
+                    cantidad, coincidencias = self._extraer_cantidad_resultados(), []
 
                 return ResultadoBusqueda(
                     exito=True,
-                    cantidad_resultados=cantidad
+                    cantidad_resultados=cantidad,
+                    coincidencias=coincidencias
                 )
 
             except Exception as e:
@@ -118,6 +173,88 @@ class BuscadorOfac:
             mensaje_error=f"Falló después de {MAX_REINTENTOS} intentos"
         )
 
+    def _llenar_formulario_rapido(
+        self,
+        nombre: str,
+        direccion: Optional[str],
+        pais: Optional[str]
+    ) -> bool:
+        """
+        Llena nombre, dirección y país con un único execute_script,
+        disparando los eventos input y change de cada campo.
+
+        Returns:
+            True si la página aceptó todos los valores; False para usar
+            el llenado campo a campo
+        """
+        campos = [["ctl00_MainContent_txtLastName", nombre, True]]
+
+        if direccion:
+            campos.append(["ctl00_MainContent_txtAddress", direccion, False])
+
+        if pais:
+            indice = self._obtener_indice_paises()
+            valor_pais = indice.resolver(pais) if indice is not None else None
+            if valor_pais is not None:
+                campos.append(["ctl00_MainContent_ddlCountry", valor_pais, True])
+
+        return self._escribir_campos(campos, solo_cambios=False) is not None
+
+    def _llenar_formulario_diferencial(
+        self,
+        nombre: str,
+        direccion: Optional[str],
+        pais: Optional[str]
+    ) -> bool:
+        """
+        Deja el formulario con los valores de esta búsqueda escribiendo
+        solo los campos que difieren de lo que ya muestra la página. Los
+        campos que esta búsqueda no usa vuelven a vacío o a "All", como
+        los dejaría Reset.
+
+        Returns:
+            True si la página quedó con todos los valores; False para
+            limpiar el formulario y llenarlo completo
+        """
+        campos = [
+            ["ctl00_MainContent_txtLastName", nombre, True],
+            ["ctl00_MainContent_txtAddress", direccion or '', False]
+        ]
+
+        indice = self._obtener_indice_paises()
+        if indice is not None:
+            valor_pais = indice.resolver(pais) if pais else None
+            campos.append(["ctl00_MainContent_ddlCountry", valor_pais or '', True])
+        elif pais:
+            return False
+
+        return self._escribir_campos(campos, solo_cambios=True) is not None
+
+    def _escribir_campos(self, campos: list, solo_cambios: bool) -> Optional[int]:
+        """
+        Escribe los campos del formulario con un único execute_script.
+
+        Args:
+            campos: Lista de [id, valor, obligatorio]
+            solo_cambios: Si es True, omite los campos que ya tienen el valor
+
+        Returns:
+            Número de campos escritos, o None si la página no aceptó alguno
+        """
+        try:
+            escritos = self.navegador.execute_script(
+                _SCRIPT_ESCRIBIR_CAMPOS, campos, solo_cambios
+            )
+        except Exception as e:
+            logger.debug(f"Llenado rápido rechazado: {e}")
+            return None
+
+        if escritos is None or escritos < 0:
+            return None
+
+        self.campos_escritos += escritos
+        return escritos
+
     def _llenar_campo_nombre(self, nombre: str) -> None:
         """Llena el campo de nombre en el formulario."""
         campo = WebDriverWait(self.navegador, self.tiempo_espera).until(
@@ -130,38 +267,60 @@ class BuscadorOfac:
 
     def _llenar_campo_direccion(self, direccion: str) -> None:
         """Llena el campo de dirección en el formulario."""
-        try:
-            campo = self.navegador.find_element(
-                By.ID, "ctl00_MainContent_txtAddress"
-            )
-            campo.clear()
-            campo.send_keys(direccion)
-        except NoSuchElementException:
-            pass
+        campo = self.esperas.buscar_opcional(
+            By.ID, "ctl00_MainContent_txtAddress"
+        )
+        if campo is None:
+            return
+
+        campo.clear()
+        campo.send_keys(direccion)
 
     def _seleccionar_pais(self, pais: str) -> None:
-        """Selecciona el país en el dropdown."""
-        try:
-            elemento_select = self.navegador.find_element(
-                By.ID, "ctl00_MainContent_ddlCountry"
-            )
-            select = Select(elemento_select)
+        """Selecciona el país en el dropdown usando el índice de opciones."""
+        indice = self._obtener_indice_paises()
+        if indice is None:
+            return
+
+        valor = indice.resolver(pais)
+        if valor is None:
+            return
+
+        self.navegador.execute_script(
+            "var select = document.getElementById(arguments[0]);"
+            "select.value = arguments[1];"
+            "select.dispatchEvent(new Event('change', {bubbles: true}));",
+            "ctl00_MainContent_ddlCountry",
+            valor
+        )
 
-            # Intentar seleccionar por texto exacto primero
-            try:
-                select.select_by_visible_text(pais)
-                return
-            except:
-                pass
+    def _obtener_indice_paises(self) -> Optional[IndiceOpcionesPais]:
+        """
+        Obtiene el índice de opciones de país, leyéndolo una sola vez por
+        sesión del navegador con un único execute_script.
 
-            # Si no funciona, buscar coincidencia parcial
-            for opcion in select.options:
-                if pais.lower() in opcion.text.lower():
-                    select.select_by_visible_text(opcion.text)
-                    return
+        Returns:
+            Índice de opciones o None si el dropdown no está disponible
+        """
+        sesion = getattr(self.navegador, 'session_id', None)
+        if self._indice_paises is not None and self._sesion_indice == sesion:
+            return self._indice_paises
+
+        opciones = self.navegador.execute_script(
+            "var select = document.getElementById(arguments[0]);"
+            "if (!select) { return null; }"
+            "return Array.from(select.options).map("
+            "function (o) { return [o.value, o.text]; });",
+            "ctl00_MainContent_ddlCountry"
+        )
+        if not opciones:
+            return None
 
-        except NoSuchElementException:
-            pass
+        self._indice_paises = IndiceOpcionesPais(
+            (valor, texto) for valor, texto in opciones
+        )
+        self._sesion_indice = sesion
+        return self._indice_paises
 
     def _hacer_clic_buscar(self) -> None:
         """Hace clic en el botón de búsqueda."""
@@ -170,21 +329,21 @@ class BuscadorOfac:
                 (By.ID, "ctl00_MainContent_btnSearch")
             )
         )
-        boton.click()
 
-        # Esperar a que aparezca el texto de resultados
-        time.sleep(2)  # Pequeña espera para asegurar que los resultados se carguen
+        # Esperar a que el postback devuelva la página de resultados
+        self.esperas.ejecutar_postback(boton.click, espera_fija=2)
 
     def _limpiar_formulario(self) -> None:
         """Hace clic en el botón Reset para limpiar el formulario."""
-        try:
-            boton_reset = self.navegador.find_element(
-                By.ID, "ctl00_MainContent_btnReset"
-            )
-            boton_reset.click()
-            time.sleep(1)  # Esperar a que se limpie el formulario
-        except NoSuchElementException:
-            pass
+        boton_reset = self.esperas.buscar_opcional(
+            By.ID, "ctl00_MainContent_btnReset"
+        )
+        if boton_reset is None:
+            return
+
+        # Esperar a que el postback devuelva el formulario limpio
+        self.esperas.ejecutar_postback(boton_reset.click, espera_fija=1)
+        self.reinicios_formulario += 1
 
     def _extraer_cantidad_resultados(self) -> int:
         """
@@ -195,9 +354,12 @@ class BuscadorOfac:
         """
         try:
             # Buscar el elemento que contiene "Found"
-            elemento_resultado = self.navegador.find_element(
+            elemento_resultado = self.esperas.buscar_opcional(
                 By.XPATH, "//*[contains(text(), 'Found')]"
             )
+            if elemento_resultado is None:
+                return 0
+
             texto = elemento_resultado.text
 
             # Extraer el numero usando regex: "X Found"
@@ -0,0 +1,343 @@
+"""
+Caché persistente de resultados de búsquedas OFAC.
+Guarda en SQLite el resultado de cada (nombre, dirección, país) normalizado.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import List, Optional
+
+from src.utilidades.normalizacion import normalizar_texto
+from .buscador_ofac import ResultadoBusqueda
+from .resultados_ofac import CoincidenciaOfac
+
+logger = logging.getLogger(__name__)
+
+NOMBRE_ARCHIVO_CACHE = "cache_busquedas_ofac.sqlite3"
+
+# Separa nombre, dirección y país dentro de la clave de búsqueda
+SEPARADOR_CLAVE = '\x1f'
+
+
+def clave_busqueda(
+    nombre: str,
+    direccion: Optional[str] = None,
+    pais: Optional[str] = None
+) -> str:
+    """
+    Construye la clave normalizada de una búsqueda.
+
+    Args:
+        nombre: Nombre de la persona
+        direccion: Dirección de la persona (opcional)
+        pais: País de la persona (opcional)
+
+    Returns:
+        Clave única para la combinación normalizada
+    """
+    return SEPARADOR_CLAVE.join(
+        normalizar_texto(valor) for valor in (nombre, direccion, pais)
+    )
+
+
+def _escribir_coincidencias(
+    coincidencias: List[CoincidenciaOfac],
+    extraidas: bool
+) -> Optional[str]:
+    """
+    Serializa las filas de la grilla a JSON.
+    Una grilla leída pero vacía se guarda como '[]'; None indica que no
+    se extrajeron las filas.
+    """
+    if not extraidas and not coincidencias:
+        return None
+    return json.dumps([asdict(c) for c in coincidencias], ensure_ascii=False)
+
+
+def _leer_coincidencias(texto: Optional[str]) -> List[CoincidenciaOfac]:
+    """Reconstruye las filas de la grilla guardadas con _escribir_coincidencias."""
+    if not texto:
+        return []
+    return [CoincidenciaOfac(**fila) for fila in json.loads(texto)]
+
+
+class CacheBusquedas:
+    """Caché en disco con TTL y desalojo LRU por número de entradas."""
+
+    def __init__(
+        self,
+        directorio: str,
+        ttl_segundos: float,
+        ttl_sin_resultados_segundos: float,
+        max_entradas: int,
+        requiere_coincidencias: bool = False
+    ):
+        """
+        Abre (o crea) la caché en el directorio indicado.
+
+        Args:
+            directorio: Directorio donde se guarda el archivo SQLite
+            ttl_segundos: Vigencia de los resultados con coincidencias
+            ttl_sin_resultados_segundos: Vigencia de los resultados sin coincidencias
+            max_entradas: Número máximo de entradas antes de desalojar
+            requiere_coincidencias: Si es True, las búsquedas leen la grilla de
+                resultados y un resultado con coincidencias solo cuenta como
+                acierto si se guardaron sus filas (aunque la grilla esté vacía)
+        """
+        os.makedirs(directorio, exist_ok=True)
+
+        self.ruta = os.path.join(directorio, NOMBRE_ARCHIVO_CACHE)
+        self.ttl_segundos = ttl_segundos
+        self.ttl_sin_resultados_segundos = ttl_sin_resultados_segundos
+        self.max_entradas = max_entradas
+        self.requiere_coincidencias = requiere_coincidencias
+
+        self.aciertos = 0
+        self.fallos = 0
+
+        self._bloqueo = threading.Lock()
+        self._conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS busquedas (
+                clave TEXT PRIMARY KEY,
+                cantidad_resultados INTEGER NOT NULL,
+                expira REAL NOT NULL,
+                ultimo_acceso REAL NOT NULL,
+                ruta_evidencia TEXT,
+                coincidencias TEXT
+            )
+        """)
+        columnas = {fila[1] for fila in self._conexion.execute("PRAGMA table_info(busquedas)")}
+        if 'coincidencias' not in columnas:
+            # Archivos creados antes de guardar las filas de la grilla
+            self._conexion.execute("ALTER TABLE busquedas ADD COLUMN coincidencias TEXT")
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_busquedas_acceso ON busquedas (ultimo_acceso)"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_busquedas_expira ON busquedas (expira)"
+        )
+        self._conexion.commit()
+
+        # Se cuenta una sola vez; después se lleva la cuenta en cada escritura
+        self._entradas = self._conexion.execute("SELECT COUNT(*) FROM busquedas").fetchone()[0]
+
+    def obtener(
+        self,
+        nombre: str,
+        direccion: Optional[str] = None,
+        pais: Optional[str] = None
+    ) -> Optional[ResultadoBusqueda]:
+        """
+        Busca un resultado vigente en la caché.
+        Un resultado con coincidencias solo cuenta como acierto si su
+        evidencia sigue en disco, para poder reutilizarla, y, con
+        requiere_coincidencias, si trae guardadas las filas de la grilla.
+
+        Returns:
+            ResultadoBusqueda marcado como desde_cache, o None si no hay acierto
+        """
+        clave = clave_busqueda(nombre, direccion, pais)
+        ahora = time.time()
+
+        with self._bloqueo:
+            fila = self._conexion.execute(
+                "SELECT cantidad_resultados, expira, ruta_evidencia, coincidencias "
+                "FROM busquedas WHERE clave = ?",
+                (clave,)
+            ).fetchone()
+
+            if fila is not None:
+                cantidad, expira, ruta_evidencia, coincidencias = fila
+                vigente = expira > ahora
+                con_evidencia = cantidad == 0 or (
+                    ruta_evidencia is not None and os.path.exists(ruta_evidencia)
+                )
+                con_detalle = (
+                    cantidad == 0 or coincidencias is not None or not self.requiere_coincidencias
+                )
+
+                if vigente and con_evidencia and con_detalle:
+                    self._conexion.execute(
+                        "UPDATE busquedas SET ultimo_acceso = ? WHERE clave = ?",
+                        (ahora, clave)
+                    )
+                    self._conexion.commit()
+                    self.aciertos += 1
+                    return ResultadoBusqueda(
+                        exito=True,
+                        cantidad_resultados=cantidad,
+                        desde_cache=True,
+                        ruta_evidencia=ruta_evidencia,
+                        coincidencias=_leer_coincidencias(coincidencias)
+                    )
+
+            self.fallos += 1
+            return None
+
+    def guardar(
+        self,
+        nombre: str,
+        direccion: Optional[str],
+        pais: Optional[str],
+        resultado: ResultadoBusqueda
+    ) -> None:
+        """
+        Guarda el resultado de una búsqueda exitosa.
+
+        Args:
+            nombre: Nombre de la persona
+            direccion: Dirección de la persona
+            pais: País de la persona
+            resultado: Resultado obtenido del sitio OFAC
+        """
+        if not resultado.exito:
+            return
+
+        ahora = time.time()
+        ttl = (
+            self.ttl_segundos if resultado.cantidad_resultados > 0
+            else self.ttl_sin_resultados_segundos
+        )
+
+        clave = clave_busqueda(nombre, direccion, pais)
+
+        with self._bloqueo:
+            existe = self._conexion.execute(
+                "SELECT 1 FROM busquedas WHERE clave = ?", (clave,)
+            ).fetchone() is not None
+
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO busquedas "
+                "(clave, cantidad_resultados, expira, ultimo_acceso, ruta_evidencia, coincidencias) "
+                "VALUES (?, ?, ?, ?, NULL, ?)",
+                (
+                    clave,
+                    resultado.cantidad_resultados,
+                    ahora + ttl,
+                    ahora,
+                    _escribir_coincidencias(resultado.coincidencias, self.requiere_coincidencias)
+                )
+            )
+            if not existe:
+                self._entradas += 1
+            if self._entradas > self.max_entradas:
+                self._desalojar()
+            self._conexion.commit()
+
+    def registrar_evidencia(
+        self,
+        nombre: str,
+        direccion: Optional[str],
+        pais: Optional[str],
+        ruta_evidencia: str
+    ) -> None:
+        """
+        Asocia la captura tomada a la entrada de la caché.
+
+        Args:
+            nombre: Nombre de la persona
+            direccion: Dirección de la persona
+            pais: País de la persona
+            ruta_evidencia: Ruta de la captura de pantalla o HTML guardado
+        """
+        with self._bloqueo:
+            self._conexion.execute(
+                "UPDATE busquedas SET ruta_evidencia = ? WHERE clave = ?",
+                (ruta_evidencia, clave_busqueda(nombre, direccion, pais))
+            )
+            self._conexion.commit()
+
+    def cerrar(self) -> None:
+        """Cierra el archivo de la caché."""
+        with self._bloqueo:
+            self._conexion.close()
+
+    def _desalojar(self) -> None:
+        """
+        Elimina entradas vencidas y, si se sigue superando el límite, las
+        menos usadas. Solo se llama con la caché llena: las vencidas que
+        quedan mientras tanto ya no cuentan como acierto en obtener().
+        """
+        cursor = self._conexion.execute(
+            "DELETE FROM busquedas WHERE expira <= ?", (time.time(),)
+        )
+        self._entradas -= cursor.rowcount
+
+        exceso = self._entradas - self.max_entradas
+
+        if exceso > 0:
+            cursor = self._conexion.execute(
+                "DELETE FROM busquedas WHERE clave IN ("
+                "SELECT clave FROM busquedas ORDER BY ultimo_acceso LIMIT ?)",
+                (exceso,)
+            )
+            self._entradas -= cursor.rowcount
+
+
+class BuscadorConCache:
+    """Envuelve un buscador OFAC y consulta la caché antes de cada búsqueda."""
+
+    def __init__(self, buscador, cache: CacheBusquedas):
+        """
+        Inicializa el buscador con caché.
+
+        Args:
+            buscador: BuscadorOfac o BuscadorOfacHttp a envolver
+            cache: Caché compartida de resultados
+        """
+        self.buscador = buscador
+        self.cache = cache
+
+    def navegar_a_ofac(self) -> bool:
+        """Delega la navegación en el buscador envuelto."""
+        return self.buscador.navegar_a_ofac()
+
+    def buscar_persona(
+        self,
+        nombre: str,
+        direccion: Optional[str] = None,
+        pais: Optional[str] = None
+    ) -> ResultadoBusqueda:
+        """
+        Devuelve el resultado de la caché o, si no lo hay, busca en OFAC.
+
+        Args:
+            nombre: Nombre de la persona a buscar
+            direccion: Dirección de la persona (opcional)
+            pais: País de la persona (opcional)
+
+        Returns:
+            Objeto ResultadoBusqueda con el resultado
+        """
+        resultado = self.cache.obtener(nombre, direccion, pais)
+        if resultado is not None:
+            return resultado
+
+        resultado = self.buscador.buscar_persona(
+            nombre=nombre,
+            direccion=direccion,
+            pais=pais
+        )
+        self.cache.guardar(nombre, direccion, pais, resultado)
+        return resultado
+
+    def registrar_evidencia(
+        self,
+        nombre: str,
+        direccion: Optional[str],
+        pais: Optional[str],
+        ruta_evidencia: str
+    ) -> None:
+        """Asocia la evidencia de una búsqueda real a su entrada en la caché."""
+        self.cache.registrar_evidencia(nombre, direccion, pais, ruta_evidencia)
+
+    def capturar_pantalla(self, ruta_archivo: str) -> bool:
+        """Delega la captura en el buscador envuelto."""
+        return self.buscador.capturar_pantalla(ruta_archivo)
@@ -0,0 +1,238 @@
+"""
+Gestión del ciclo de vida del navegador durante ejecuciones largas.
+Recicla Chrome al superar límites de búsquedas o memoria y reconstruye
+la sesión si el navegador muere.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from selenium import webdriver
+
+from src.config import Configuracion
+from src.config.constantes import MAX_REINTENTOS, TIEMPO_ENTRE_REINTENTOS
+from src.utilidades.captura_pantalla import CapturaPantalla
+from .buscador_ofac import BuscadorOfac, ResultadoBusqueda
+from .navegador import (
+    crear_navegador,
+    cerrar_navegador,
+    crear_navegador_independiente,
+    cerrar_navegador_independiente
+)
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - dependencia opcional
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+class GestorNavegador:
+    """
+    Mantiene un navegador con su BuscadorOfac y CapturaPantalla, y los
+    reemplaza de forma transparente entre personas cuando es necesario.
+    Expone la interfaz de ambos para usarse en su lugar.
+    """
+
+    def __init__(
+        self,
+        independiente: bool = False,
+        headless: Optional[bool] = None
+    ):
+        """
+        Inicializa el gestor.
+
+        Args:
+            independiente: Si es True, usa un navegador propio y no la instancia compartida
+            headless: Modo sin interfaz gráfica (None usa la configuración)
+        """
+        self.config = Configuracion()
+        self.independiente = independiente
+        self.headless = headless
+
+        self.max_busquedas = self.config.selenium.max_busquedas_por_sesion
+        self.max_memoria_mb = self.config.selenium.max_memoria_mb
+        self.intervalo_medicion = self.config.selenium.intervalo_medicion_memoria
+
+        self.navegador: Optional[webdriver.Chrome] = None
+        self.buscador: Optional[BuscadorOfac] = None
+        self.captura: Optional[CapturaPantalla] = None
+
+        self.busquedas_sesion = 0
+        self.reinicios = 0
+
+    def __enter__(self) -> 'GestorNavegador':
+        self._abrir()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._cerrar()
+        return False
+
+    def navegar_a_ofac(self) -> bool:
+        """
+        Navega al sitio OFAC con el navegador actual.
+
+        Returns:
+            True si la navegación fue exitosa
+        """
+        return self.buscador.navegar_a_ofac()
+
+    def buscar_persona(
+        self,
+        nombre: str,
+        direccion: Optional[str] = None,
+        pais: Optional[str] = None
+    ) -> ResultadoBusqueda:
+        """
+        Busca una persona, reciclando antes el navegador si corresponde.
+        Si la búsqueda falla porque la sesión murió, reconstruye el
+        navegador y repite la misma persona. Si un reinicio anterior no
+        pudo abrir el navegador, lo vuelve a intentar antes de buscar.
+
+        Args:
+            nombre: Nombre de la persona a buscar
+            direccion: Dirección de la persona (opcional)
+            pais: País de la persona (opcional)
+
+        Returns:
+            Objeto ResultadoBusqueda con el resultado
+        """
+        self._reciclar_si_corresponde()
+
+        if self.buscador is None:
+            logger.warning("No hay navegador abierto; se intenta abrir uno nuevo")
+            self._reabrir()
+
+        resultado = self.buscador.buscar_persona(nombre, direccion, pais)
+
+        if not resultado.exito and not self._sesion_activa():
+            logger.warning("Sesión del navegador perdida; reconstruyendo")
+            self._reiniciar()
+            resultado = self.buscador.buscar_persona(nombre, direccion, pais)
+
+        self.busquedas_sesion += 1
+        return resultado
+
+    def capturar(self, id_persona: int, sufijo: Optional[str] = None) -> Optional[str]:
+        """Captura la pantalla con el navegador actual."""
+        return self.captura.capturar(id_persona=id_persona, sufijo=sufijo)
+
+    def copiar(self, ruta_origen: str, id_persona: int) -> Optional[str]:
+        """Reutiliza una captura existente para otra persona."""
+        return self.captura.copiar(ruta_origen, id_persona)
+
+    def capturar_pantalla(self, ruta_archivo: str) -> bool:
+        """Guarda una captura de la página actual en la ruta indicada."""
+        return self.buscador.capturar_pantalla(ruta_archivo)
+
+    def memoria_mb(self) -> Optional[float]:
+        """
+        Mide la memoria residente (RSS) de chromedriver y sus procesos Chrome.
+
+        Returns:
+            Memoria en MB, o None si no se puede medir
+        """
+        if psutil is None or self.navegador is None:
+            return None
+
+        try:
+            pid = self.navegador.service.process.pid
+            proceso = psutil.Process(pid)
+            procesos = [proceso] + proceso.children(recursive=True)
+        except Exception:
+            return None
+
+        total = 0
+        for p in procesos:
+            try:
+                total += p.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        return total / (1024 * 1024)
+
+    def _reciclar_si_corresponde(self) -> None:
+        """Reinicia el navegador si se superó algún umbral configurado."""
+        if self.max_busquedas and self.busquedas_sesion >= self.max_busquedas:
+            logger.info(
+                f"Reciclando navegador tras {self.busquedas_sesion} búsquedas"
+            )
+            self._reiniciar()
+            return
+
+        if not self.max_memoria_mb or self.busquedas_sesion == 0:
+            return
+        if self.busquedas_sesion % self.intervalo_medicion != 0:
+            return
+
+        memoria = self.memoria_mb()
+        if memoria is not None and memoria > self.max_memoria_mb:
+            logger.info(
+                f"Reciclando navegador: {memoria:.0f} MB supera "
+                f"el límite de {self.max_memoria_mb} MB"
+            )
+            self._reiniciar()
+
+    def _sesion_activa(self) -> bool:
+        """Comprueba con una llamada mínima si la sesión sigue respondiendo."""
+        try:
+            self.navegador.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _abrir(self) -> None:
+        """Crea el navegador y los objetos que dependen de él."""
+        if self.independiente:
+            self.navegador = crear_navegador_independiente(self.headless)
+        else:
+            self.navegador = crear_navegador(self.headless)
+
+        self.buscador = BuscadorOfac(self.navegador)
+        self.captura = CapturaPantalla(self.navegador)
+        self.busquedas_sesion = 0
+
+    def _cerrar(self) -> None:
+        """Cierra el navegador actual."""
+        if self.independiente:
+            cerrar_navegador_independiente(self.navegador)
+        else:
+            cerrar_navegador()
+
+        self.navegador = None
+        self.buscador = None
+        self.captura = None
+
+    def _reiniciar(self) -> None:
+        """Cierra el navegador, abre uno nuevo y vuelve al formulario OFAC."""
+        self._cerrar()
+        self.reinicios += 1
+        self._reabrir()
+
+    def _reabrir(self) -> None:
+        """
+        Abre un navegador nuevo y vuelve al formulario OFAC, con hasta
+        MAX_REINTENTOS intentos y una espera que se duplica entre ellos.
+        Si ninguno lo logra, el gestor queda sin navegador y la próxima
+        búsqueda vuelve a intentarlo.
+
+        Raises:
+            Exception: El error del último intento de abrir el navegador
+        """
+        for intento in range(MAX_REINTENTOS):
+            try:
+                self._abrir()
+                break
+            except Exception as e:
+                logger.error(f"No se pudo abrir el navegador (intento {intento + 1}): {e}")
+                # Descarta lo que haya quedado a medio crear
+                self._cerrar()
+                if intento == MAX_REINTENTOS - 1:
+                    raise
+                time.sleep(TIEMPO_ENTRE_REINTENTOS * 2 ** intento)
+
+        if not self.buscador.navegar_a_ofac():
+            logger.error("No se pudo acceder al sitio OFAC tras reciclar el navegador")
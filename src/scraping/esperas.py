@@ -0,0 +1,169 @@
+"""
+Política de esperas para las páginas ASP.NET de OFAC.
+Reemplaza las pausas fijas por la detección del fin de cada postback.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+from src.config.constantes import SELECTORES_OFAC
+
+logger = logging.getLogger(__name__)
+
+# Texto que se pone en el contador antes de cada postback: si la respuesta
+# trae el mismo "X Found" que la búsqueda anterior, igual reemplaza la marca
+MARCA_POSTBACK = "__postback_en_curso__"
+
+_MARCAR_RESULTADOS = """
+var elemento = document.querySelector(arguments[0]);
+if (!elemento) { return null; }
+elemento.textContent = arguments[1];
+return elemento.textContent;
+"""
+
+
+class PoliticaEspera:
+    """Decide cómo esperar a que termine un postback del formulario OFAC."""
+
+    def __init__(
+        self,
+        navegador: webdriver.Chrome,
+        tiempo_espera: int,
+        por_eventos: bool = True,
+        tiempo_espera_implicito: int = 0
+    ):
+        """
+        Inicializa la política de esperas.
+
+        Args:
+            navegador: Instancia del navegador Selenium
+            tiempo_espera: Tiempo máximo de espera en segundos
+            por_eventos: Si es False, se usan las pausas fijas originales
+            tiempo_espera_implicito: Espera implícita a restaurar en modo fijo
+        """
+        self.navegador = navegador
+        self.tiempo_espera = tiempo_espera
+        self.por_eventos = por_eventos
+        self.tiempo_espera_implicito = tiempo_espera_implicito
+
+    def ejecutar_postback(self, accion: Callable[[], None], espera_fija: float) -> None:
+        """
+        Ejecuta una acción que provoca un postback y espera a que termine.
+
+        Args:
+            accion: Función que dispara el postback (por ejemplo, un clic)
+            espera_fija: Pausa en segundos cuando no se espera por eventos
+        """
+        if not self.por_eventos:
+            accion()
+            time.sleep(espera_fija)
+            return
+
+        pagina_anterior = self._elemento_raiz()
+        texto_anterior = self._marcar_resultados()
+
+        accion()
+
+        WebDriverWait(self.navegador, self.tiempo_espera).until(
+            lambda _: self._postback_terminado(pagina_anterior, texto_anterior)
+        )
+
+    def buscar_opcional(self, by: str, valor: str) -> Optional[WebElement]:
+        """
+        Busca un elemento sin bloquear si no existe.
+
+        Args:
+            by: Estrategia de localización de Selenium
+            valor: Valor del localizador
+
+        Returns:
+            El elemento encontrado o None
+        """
+        with self.sin_espera_implicita():
+            elementos = self.navegador.find_elements(by, valor)
+        return elementos[0] if elementos else None
+
+    @contextmanager
+    def sin_espera_implicita(self):
+        """Desactiva temporalmente la espera implícita del navegador."""
+        if self.por_eventos:
+            # En modo por eventos la espera implícita ya es cero
+            yield
+            return
+
+        self.navegador.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.navegador.implicitly_wait(self.tiempo_espera_implicito)
+
+    def _postback_terminado(
+        self,
+        pagina_anterior: Optional[WebElement],
+        texto_anterior: Optional[str]
+    ) -> bool:
+        """Condición de espera: página nueva (o resultado distinto) y documento cargado."""
+        pagina_nueva = pagina_anterior is None or self._es_obsoleto(pagina_anterior)
+
+        if not pagina_nueva:
+            texto_actual = self._texto_resultados()
+            if texto_actual is None or texto_actual == texto_anterior:
+                return False
+
+        try:
+            estado = self.navegador.execute_script("return document.readyState")
+        except WebDriverException:
+            return False
+
+        return estado == "complete"
+
+    def _elemento_raiz(self) -> Optional[WebElement]:
+        """Obtiene el elemento <html> actual, que se invalida tras un postback."""
+        try:
+            return self.navegador.find_element(By.TAG_NAME, "html")
+        except WebDriverException:
+            return None
+
+    def _marcar_resultados(self) -> Optional[str]:
+        """
+        Reemplaza el texto del contador de resultados por MARCA_POSTBACK.
+
+        Returns:
+            El texto que queda en el contador (la marca, o el texto actual
+            si no se pudo marcar), o None si el contador no está presente
+        """
+        try:
+            return self.navegador.execute_script(
+                _MARCAR_RESULTADOS, SELECTORES_OFAC['resultado_conteo'], MARCA_POSTBACK
+            )
+        except WebDriverException:
+            return self._texto_resultados()
+
+    def _texto_resultados(self) -> Optional[str]:
+        """Obtiene el texto del contador de resultados, si está presente."""
+        try:
+            elementos = self.navegador.find_elements(
+                By.CSS_SELECTOR, SELECTORES_OFAC['resultado_conteo']
+            )
+            return elementos[0].text if elementos else None
+        except WebDriverException:
+            return None
+
+    @staticmethod
+    def _es_obsoleto(elemento: WebElement) -> bool:
+        """Indica si el elemento ya no pertenece al documento actual."""
+        try:
+            elemento.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+        except WebDriverException:
+            return False
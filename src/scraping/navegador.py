@@ -10,28 +10,24 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
 from src.config import Configuracion
+from src.config.constantes import RECURSOS_BLOQUEADOS, ESTILOS_BLOQUEADOS
 
 logger = logging.getLogger(__name__)
 
 _navegador: Optional[webdriver.Chrome] = None
 
 
-def crear_navegador(headless: Optional[bool] = None) -> webdriver.Chrome:
+def _construir_navegador(headless: Optional[bool] = None) -> webdriver.Chrome:
     """
-    Crea y configura una instancia del navegador Chrome.
+    Construye una nueva instancia de Chrome con las opciones del proyecto.
 
     Args:
         headless: Si es True, ejecuta el navegador sin interfaz gráfica.
                   Si es None, usa el valor de configuración.
 
     Returns:
-        Instancia del navegador Chrome configurada
+        Nueva instancia del navegador Chrome configurada
     """
-    global _navegador
-
-    if _navegador is not None:
-        return _navegador
-
     config = Configuracion()
 
     opciones = Options()
@@ -55,21 +51,117 @@ def crear_navegador(headless: Optional[bool] = None) -> webdriver.Chrome:
     opciones.add_experimental_option("excludeSwitches", ["enable-automation"])
     opciones.add_experimental_option("useAutomationExtension", False)
 
+    if config.selenium.bloquear_recursos:
+        opciones.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2
+        })
+
     try:
-        _navegador = webdriver.Chrome(options=opciones)
-        _navegador.implicitly_wait(config.selenium.tiempo_espera_implicito)
+        navegador = webdriver.Chrome(options=opciones)
+
+        if config.selenium.bloquear_recursos:
+            bloquear_recursos(navegador)
+
+        # Con esperas por eventos la espera implícita se anula: cada búsqueda
+        # de un elemento inexistente bloquearía el tiempo completo
+        if config.selenium.espera_por_eventos:
+            navegador.implicitly_wait(0)
+        else:
+            navegador.implicitly_wait(config.selenium.tiempo_espera_implicito)
 
         # Maximizar ventana si no es headless
         if not headless:
-            _navegador.maximize_window()
+            navegador.maximize_window()
 
-        return _navegador
+        return navegador
 
     except Exception as e:
         logger.error(f"Error al crear navegador: {e}")
         raise
 
 
+def crear_navegador(headless: Optional[bool] = None) -> webdriver.Chrome:
+    """
+    Crea y configura la instancia compartida del navegador Chrome.
+
+    Args:
+        headless: Si es True, ejecuta el navegador sin interfaz gráfica.
+                  Si es None, usa el valor de configuración.
+
+    Returns:
+        Instancia del navegador Chrome configurada
+    """
+    global _navegador
+
+    if _navegador is not None:
+        return _navegador
+
+    _navegador = _construir_navegador(headless)
+    return _navegador
+
+
+def crear_navegador_independiente(headless: Optional[bool] = None) -> webdriver.Chrome:
+    """
+    Crea una instancia de Chrome propia, fuera de la instancia compartida.
+    Usada por los workers paralelos, cada uno con su propio navegador.
+
+    Args:
+        headless: Si es True, ejecuta el navegador sin interfaz gráfica.
+                  Si es None, usa el valor de configuración.
+
+    Returns:
+        Nueva instancia del navegador Chrome configurada
+    """
+    return _construir_navegador(headless)
+
+
+def bloquear_recursos(navegador: webdriver.Chrome, incluir_estilos: bool = True) -> None:
+    """
+    Bloquea la descarga de imágenes, fuentes y scripts de terceros mediante CDP.
+
+    Args:
+        navegador: Instancia del navegador
+        incluir_estilos: Si es True, también bloquea las hojas de estilo
+    """
+    patrones = list(RECURSOS_BLOQUEADOS)
+    if incluir_estilos:
+        patrones.extend(ESTILOS_BLOQUEADOS)
+
+    try:
+        navegador.execute_cdp_cmd("Network.enable", {})
+        navegador.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patrones})
+    except Exception as e:
+        logger.error(f"Error al bloquear recursos: {e}")
+
+
+def cargar_estilos(navegador: webdriver.Chrome) -> None:
+    """
+    Desbloquea las hojas de estilo y las vuelve a cargar en la página actual,
+    esperando a que terminen. Se usa justo antes de una captura de pantalla.
+
+    Args:
+        navegador: Instancia del navegador
+    """
+    bloquear_recursos(navegador, incluir_estilos=False)
+
+    try:
+        navegador.execute_async_script(
+            "var terminar = arguments[arguments.length - 1];"
+            "var enlaces = document.querySelectorAll('link[rel=\"stylesheet\"]');"
+            "var pendientes = enlaces.length;"
+            "if (!pendientes) { terminar(true); return; }"
+            "enlaces.forEach(function (enlace) {"
+            "  var nuevo = enlace.cloneNode();"
+            "  nuevo.onload = nuevo.onerror = function () {"
+            "    if (--pendientes === 0) { terminar(true); }"
+            "  };"
+            "  enlace.parentNode.replaceChild(nuevo, enlace);"
+            "});"
+        )
+    except Exception as e:
+        logger.error(f"Error al cargar hojas de estilo: {e}")
+
+
 def obtener_navegador() -> Optional[webdriver.Chrome]:
     """
     Obtiene la instancia actual del navegador.
@@ -111,22 +203,53 @@ def cerrar_navegador() -> None:
             _navegador = None
 
 
+def cerrar_navegador_independiente(navegador: Optional[webdriver.Chrome]) -> None:
+    """
+    Cierra una instancia creada con crear_navegador_independiente.
+
+    Args:
+        navegador: Instancia del navegador a cerrar
+    """
+    if navegador is None:
+        return
+
+    try:
+        navegador.quit()
+    except Exception as e:
+        logger.error(f"Error al cerrar navegador: {e}")
+
+
 class NavegadorContextManager:
     """Context manager para manejar el navegador automáticamente."""
 
-    def __init__(self, headless: Optional[bool] = None):
+    def __init__(
+        self,
+        headless: Optional[bool] = None,
+        independiente: bool = False
+    ):
         self.headless = headless
+        self.independiente = independiente
         self.navegador = None
 
     def __enter__(self) -> webdriver.Chrome:
-        self.navegador = crear_navegador(self.headless)
+        if self.independiente:
+            self.navegador = crear_navegador_independiente(self.headless)
+        else:
+            self.navegador = crear_navegador(self.headless)
         return self.navegador
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        cerrar_navegador()
+        if self.independiente:
+            cerrar_navegador_independiente(self.navegador)
+            self.navegador = None
+        else:
+            cerrar_navegador()
         return False
 
 
-def navegador_web(headless: Optional[bool] = None) -> NavegadorContextManager:
+def navegador_web(
+    headless: Optional[bool] = None,
+    independiente: bool = False
+) -> NavegadorContextManager:
     """Función auxiliar para usar el context manager del navegador."""
-    return NavegadorContextManager(headless)
+    return NavegadorContextManager(headless, independiente)
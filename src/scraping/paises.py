@@ -0,0 +1,262 @@
+"""
+Resolución de países contra las opciones del dropdown de OFAC.
+
+Cada país se resuelve por coincidencia exacta del texto normalizado,
+contra el texto de las opciones, una tabla de alias y, si se configura,
+un archivo de mapeo editable. Nunca se adivina por coincidencia parcial:
+"Niger" no debe terminar seleccionando "Nigeria".
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.utilidades.normalizacion import normalizar_texto
+
+logger = logging.getLogger(__name__)
+
+# Nombres habituales en la maestra -> texto de la opción del dropdown.
+# Un alias cuyo destino no existe en el dropdown se ignora.
+ALIAS_PAISES: Dict[str, str] = {
+    "estados unidos": "united states",
+    "estados unidos de america": "united states",
+    "eeuu": "united states",
+    "ee uu": "united states",
+    "ee. uu.": "united states",
+    "usa": "united states",
+    "corea del norte": "korea, north",
+    "corea del sur": "korea, south",
+    "reino unido": "united kingdom",
+    "rusia": "russia",
+    "siria": "syria",
+    "irak": "iraq",
+    "libano": "lebanon",
+    "libia": "libya",
+    "afganistan": "afghanistan",
+    "turquia": "turkey",
+    "chipre": "cyprus",
+    "grecia": "greece",
+    "ucrania": "ukraine",
+    "bielorrusia": "belarus",
+    "alemania": "germany",
+    "espana": "spain",
+    "francia": "france",
+    "italia": "italy",
+    "suiza": "switzerland",
+    "holanda": "netherlands",
+    "paises bajos": "netherlands",
+    "brasil": "brazil",
+    "belice": "belize",
+    "republica dominicana": "dominican republic",
+    "birmania": "burma",
+    "myanmar": "burma",
+    "japon": "japan",
+    "sudafrica": "south africa",
+    "costa de marfil": "cote d'ivoire",
+    "emiratos arabes unidos": "united arab emirates",
+}
+
+_paises_no_resueltos: Set[str] = set()
+_bloqueo_no_resueltos = threading.Lock()
+
+# Países de la maestra a resolver de antemano y archivo de mapeo de la ejecución
+_paises_bd: List[str] = []
+_ruta_mapeo: Optional[str] = None
+_mapeo_archivo: Dict[str, Optional[str]] = {}
+_mapeo_guardado = False
+_bloqueo_mapeo = threading.Lock()
+
+
+def reportar_pais_no_resuelto(pais: str) -> None:
+    """
+    Registra un país sin opción en el dropdown, avisando solo la primera vez.
+
+    Args:
+        pais: Valor del país tal como viene de la base de datos
+    """
+    with _bloqueo_no_resueltos:
+        if pais in _paises_no_resueltos:
+            return
+        _paises_no_resueltos.add(pais)
+
+    logger.warning(
+        f"País sin opción en el dropdown OFAC: '{pais}'. "
+        f"Se buscará sin filtro de país"
+    )
+
+
+def obtener_paises_no_resueltos() -> List[str]:
+    """
+    Obtiene los países que no pudieron resolverse durante la ejecución.
+
+    Returns:
+        Lista ordenada de países no resueltos
+    """
+    with _bloqueo_no_resueltos:
+        return sorted(_paises_no_resueltos)
+
+
+def cargar_mapeo_paises(ruta: str) -> Dict[str, Optional[str]]:
+    """
+    Lee el archivo de mapeo {país en la maestra: texto o valor de la opción}.
+    Las entradas con valor null son países pendientes de mapear.
+
+    Args:
+        ruta: Ruta del archivo JSON
+
+    Returns:
+        Mapeo leído, o vacío si el archivo no existe o no es válido
+    """
+    if not os.path.exists(ruta):
+        return {}
+
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            mapeo = json.load(archivo)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudo leer el mapeo de países {ruta}: {e}")
+        return {}
+
+    if not isinstance(mapeo, dict):
+        logger.error(f"El mapeo de países {ruta} debe ser un objeto JSON")
+        return {}
+    return mapeo
+
+
+def guardar_mapeo_paises(ruta: str, mapeo: Dict[str, Optional[str]]) -> None:
+    """
+    Escribe el archivo de mapeo ordenado por país, para poder editarlo.
+
+    Args:
+        ruta: Ruta del archivo JSON
+        mapeo: Mapeo {país en la maestra: texto de la opción o None}
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(dict(sorted(mapeo.items())), archivo, ensure_ascii=False, indent=2)
+
+
+def configurar_paises(paises_bd: Iterable[str], ruta_mapeo: Optional[str] = None) -> None:
+    """
+    Registra los países distintos de la maestra para que cada índice los
+    resuelva al construirse, y el archivo de mapeo opcional de la ejecución.
+    Olvida los países no resueltos de ejecuciones anteriores.
+
+    Args:
+        paises_bd: Valores distintos de país en la maestra
+        ruta_mapeo: Archivo JSON de mapeo; None o vacío para no usarlo
+    """
+    global _paises_bd, _ruta_mapeo, _mapeo_archivo, _mapeo_guardado
+
+    with _bloqueo_mapeo:
+        _paises_bd = sorted(p for p in paises_bd if p)
+        _ruta_mapeo = ruta_mapeo or None
+        _mapeo_archivo = cargar_mapeo_paises(ruta_mapeo) if ruta_mapeo else {}
+        _mapeo_guardado = False
+
+    with _bloqueo_no_resueltos:
+        _paises_no_resueltos.clear()
+
+
+class IndiceOpcionesPais:
+    """Tabla en memoria de las opciones del dropdown de países."""
+
+    def __init__(
+        self,
+        opciones: Iterable[Tuple[str, str]],
+        alias: Optional[Dict[str, Optional[str]]] = None
+    ):
+        """
+        Construye el índice a partir de las opciones del dropdown y resuelve
+        de una vez los países registrados con configurar_paises.
+
+        Args:
+            opciones: Pares (valor, texto) de cada opción
+            alias: Alias adicionales {país: texto o valor de la opción};
+                por defecto, los del archivo de mapeo configurado
+        """
+        self._por_texto: Dict[str, str] = {}
+        self._texto_por_valor: Dict[str, str] = {}
+        self._resueltos: Dict[str, Optional[str]] = {}
+
+        for valor, texto in opciones:
+            # La opción "All" tiene valor vacío y no identifica un país
+            if not valor:
+                continue
+            self._por_texto.setdefault(normalizar_texto(texto), valor)
+            self._texto_por_valor.setdefault(valor, texto)
+
+        # Los alias fijos no tapan una opción real; los del archivo sí
+        for origen, destino in ALIAS_PAISES.items():
+            if normalizar_texto(origen) not in self._por_texto:
+                self._agregar_alias(origen, destino)
+
+        for origen, destino in (_mapeo_archivo if alias is None else alias).items():
+            self._agregar_alias(origen, destino)
+
+        self._resolver_paises_bd()
+
+    def _agregar_alias(self, origen: str, destino: Optional[str]) -> None:
+        """Hace que origen resuelva a la opción de destino (texto o valor), si existe."""
+        if not destino:
+            return
+
+        valor = self._por_texto.get(normalizar_texto(destino))
+        if valor is None and destino in self._texto_por_valor:
+            valor = destino
+        if valor is None:
+            return
+
+        self._por_texto[normalizar_texto(origen)] = valor
+
+    def _resolver_paises_bd(self) -> None:
+        """
+        Resuelve los países de la maestra para que los no mapeados se
+        reporten antes de buscar, y guarda el mapeo resultante una vez.
+        """
+        global _mapeo_guardado
+
+        for pais in _paises_bd:
+            self.resolver(pais)
+
+        with _bloqueo_mapeo:
+            if _ruta_mapeo is None or _mapeo_guardado or not _paises_bd:
+                return
+            _mapeo_guardado = True
+
+            mapeo = dict(_mapeo_archivo)
+            for pais in _paises_bd:
+                if mapeo.get(pais) is None:
+                    valor = self._resueltos.get(pais)
+                    mapeo[pais] = self._texto_por_valor.get(valor) if valor else None
+
+        try:
+            guardar_mapeo_paises(_ruta_mapeo, mapeo)
+        except OSError as e:
+            logger.error(f"No se pudo guardar el mapeo de países {_ruta_mapeo}: {e}")
+
+    def resolver(self, pais: str) -> Optional[str]:
+        """
+        Obtiene el valor de la opción que corresponde al país.
+
+        Args:
+            pais: País a resolver
+
+        Returns:
+            Valor de la opción o None si el país no tiene opción
+        """
+        if pais in self._resueltos:
+            return self._resueltos[pais]
+
+        valor = self._por_texto.get(normalizar_texto(pais))
+
+        if valor is None:
+            reportar_pais_no_resuelto(pais)
+
+        self._resueltos[pais] = valor
+        return valor
@@ -0,0 +1,85 @@
+"""
+Extracción de la página de resultados OFAC con un único análisis del HTML.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+from src.config.constantes import SELECTORES_OFAC
+
+logger = logging.getLogger(__name__)
+
+_ID_CONTEO = SELECTORES_OFAC['resultado_conteo'].lstrip('#')
+_ID_TABLA = SELECTORES_OFAC['resultado_tabla'].lstrip('#')
+_CONTEO = re.compile(r'(\d+)\s+Found')
+_SEPARADOR_PROGRAMAS = re.compile(r'\s*[;,]\s*')
+
+# Columnas de la grilla de resultados, en orden
+COLUMNAS_RESULTADOS = ('nombre', 'direccion', 'tipo', 'programas', 'lista', 'puntaje')
+
+
+@dataclass
+class CoincidenciaOfac:
+    """Fila de la grilla de resultados de una búsqueda OFAC."""
+    nombre: str
+    direccion: str = ""
+    tipo: str = ""
+    programas: List[str] = field(default_factory=list)
+    lista: str = ""
+    puntaje: Optional[int] = None
+
+
+def extraer_resultados(html: str) -> Tuple[int, List[CoincidenciaOfac]]:
+    """
+    Obtiene la cantidad "X Found" y las filas de la grilla de resultados.
+
+    Args:
+        html: HTML completo de la página tras la búsqueda
+
+    Returns:
+        Tupla (cantidad, coincidencias); si la página no trae el texto
+        "X Found", la cantidad es el número de filas encontradas
+    """
+    if not html or not html.strip():
+        return 0, []
+
+    try:
+        documento = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError) as e:
+        logger.warning(f"No se pudo analizar la página de resultados: {e}")
+        return 0, []
+
+    coincidencias = []
+    for fila in documento.xpath(f'//table[@id="{_ID_TABLA}"]//tr[td]'):
+        coincidencia = _coincidencia(fila)
+        if coincidencia is not None:
+            coincidencias.append(coincidencia)
+
+    conteo = documento.xpath(f'//*[@id="{_ID_CONTEO}"]')
+    texto = conteo[0].text_content() if conteo else documento.text_content()
+    numeros = _CONTEO.findall(texto)
+
+    cantidad = int(numeros[0]) if numeros else len(coincidencias)
+    return cantidad, coincidencias
+
+
+def _coincidencia(fila) -> Optional[CoincidenciaOfac]:
+    """Convierte una fila <tr> de la grilla en CoincidenciaOfac."""
+    celdas = [' '.join(celda.text_content().split()) for celda in fila.xpath('./td')]
+    if len(celdas) < len(COLUMNAS_RESULTADOS) or not celdas[0]:
+        return None
+
+    nombre, direccion, tipo, programas, lista, puntaje = celdas[:len(COLUMNAS_RESULTADOS)]
+
+    return CoincidenciaOfac(
+        nombre=nombre,
+        direccion=direccion,
+        tipo=tipo,
+        programas=[p for p in _SEPARADOR_PROGRAMAS.split(programas) if p],
+        lista=lista,
+        puntaje=int(puntaje) if puntaje.isdigit() else None
+    )
@@ -0,0 +1,117 @@
+"""
+Planificación de búsquedas OFAC sin repeticiones.
+
+Agrupa las personas válidas cuya búsqueda sería idéntica (mismo nombre,
+dirección y país una vez normalizados) para buscar una sola vez por
+grupo y repartir el resultado entre todas sus personas, y ordena las
+búsquedas para que las consecutivas compartan la mayor cantidad de
+campos del formulario.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List
+
+from src.base_datos.repositorio_personas import Persona
+from src.scraping.cache_busquedas import SEPARADOR_CLAVE, clave_busqueda
+
+
+@dataclass
+class GrupoBusqueda:
+    """Personas que comparten la misma búsqueda normalizada."""
+    clave: str
+    personas: List[Persona] = field(default_factory=list)
+
+    @property
+    def representante(self) -> Persona:
+        """Persona con cuyos datos se hace la búsqueda."""
+        return self.personas[0]
+
+    @property
+    def orden(self) -> tuple:
+        """Criterio de orden: país, dirección y nombre normalizados."""
+        nombre, direccion, pais = self.clave.split(SEPARADOR_CLAVE)
+        return pais, direccion, nombre
+
+
+class PlanificadorBusquedas:
+    """Agrupa por clave de búsqueda las personas que llegan en flujo."""
+
+    def __init__(self, ventana: int, habilitado: bool = True, ordenar: bool = False):
+        """
+        Inicializa el planificador.
+
+        Args:
+            ventana: Personas que se reúnen antes de agrupar; acota la
+                memoria cuando las personas llegan de un generador
+            habilitado: Si es False, cada persona forma su propio grupo
+            ordenar: Si es True, los grupos de cada ventana salen ordenados
+                por país, dirección y nombre
+        """
+        self.ventana = max(1, ventana)
+        self.habilitado = habilitado
+        self.ordenar = ordenar
+        self.ahorradas = 0
+
+    def agrupar(self, personas: Iterable[Persona]) -> Iterator[GrupoBusqueda]:
+        """
+        Reparte las personas en grupos de búsqueda. Dentro de cada ventana
+        los grupos salen ordenados o, si no se ordena, en el orden en que
+        apareció su primera persona.
+
+        Args:
+            personas: Personas válidas; puede ser un generador
+
+        Yields:
+            Un GrupoBusqueda por cada búsqueda distinta de la ventana
+        """
+        if not self.habilitado and not self.ordenar:
+            for persona in personas:
+                yield GrupoBusqueda(clave_busqueda(
+                    persona.nombre_persona, persona.direccion, persona.pais
+                ), [persona])
+            return
+
+        grupos = {}
+        leidas = 0
+
+        for persona in personas:
+            clave = clave_busqueda(persona.nombre_persona, persona.direccion, persona.pais)
+            # Sin deduplicar, cada persona tiene su propia entrada
+            clave_grupo = clave if self.habilitado else (clave, leidas)
+            grupo = grupos.get(clave_grupo)
+            if grupo is None:
+                grupo = grupos[clave_grupo] = GrupoBusqueda(clave)
+            grupo.personas.append(persona)
+            leidas += 1
+
+            if leidas >= self.ventana:
+                yield from self._vaciar(grupos, leidas)
+                grupos = {}
+                leidas = 0
+
+        if grupos:
+            yield from self._vaciar(grupos, leidas)
+
+    def agrupar_lotes(self, lotes: Iterable[List[Persona]]) -> Iterator[GrupoBusqueda]:
+        """
+        Agrupa cada lote por separado, como una ventana cerrada: los grupos
+        de un lote salen completos antes de pedir el siguiente, aunque el
+        lote sea más chico que la ventana.
+
+        Args:
+            lotes: Lotes de personas válidas; puede ser un generador que
+                espera antes de entregar el siguiente lote
+
+        Yields:
+            Un GrupoBusqueda por cada búsqueda distinta de cada lote
+        """
+        for lote in lotes:
+            yield from self.agrupar(lote)
+
+    def _vaciar(self, grupos: dict, leidas: int) -> Iterator[GrupoBusqueda]:
+        """Entrega los grupos de una ventana y suma las búsquedas evitadas."""
+        self.ahorradas += leidas - len(grupos)
+        if self.ordenar:
+            yield from sorted(grupos.values(), key=lambda grupo: grupo.orden)
+        else:
+            yield from grupos.values()
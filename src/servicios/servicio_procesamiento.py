@@ -3,25 +3,47 @@ Servicio principal de procesamiento del bot RPA.
 Orquesta todas las operaciones del flujo de trabajo.
 """
 
+import asyncio
 import logging
 import os
+import queue
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from functools import partial
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
 
 from src.config import Configuracion
 from src.config.constantes import (
     ESTADO_OK,
     ESTADO_NOK,
-    FORMATO_FECHA_CAPTURA,
-    FORMATO_NOMBRE_CAPTURA
+    ESTADO_NO_CRUZA_MAESTRA,
+    ESTADO_INFORMACION_INCOMPLETA,
+    COLA_FALLIDA,
+    BACKEND_HTTP,
+    BACKEND_LOCAL
 )
-from src.base_datos import RepositorioPersonas, RepositorioResultados
+from src.base_datos import (
+    RepositorioPersonas,
+    RepositorioResultados,
+    RepositorioCoincidencias,
+    ColaTrabajo
+)
+from src.base_datos.repositorio_coincidencias import Coincidencia
 from src.base_datos.repositorio_resultados import Resultado
-from src.base_datos.conexion import inicializar_pool, cerrar_pool
-from src.scraping import BuscadorOfac
-from src.scraping.navegador import navegador_web
-from src.utilidades.captura_pantalla import CapturaPantalla
+from src.base_datos.conexion import inicializar_pool, cerrar_pool, estadisticas_pool
+from src.base_datos.escritor_resultados import EscritorResultados
+from src.scraping import BuscadorOfacHttp
+from src.scraping.ciclo_vida import GestorNavegador
+from src.scraping.cache_busquedas import CacheBusquedas, BuscadorConCache
+from src.scraping.paises import configurar_paises, obtener_paises_no_resueltos
+from src.listas import BuscadorSdnLocal
+from src.utilidades.captura_pantalla import CapturaHtml
 from .servicio_validacion import ServicioValidacion
+from .planificador_busquedas import GrupoBusqueda, PlanificadorBusquedas
 from .servicio_exportacion import ServicioExportacion
 
 logger = logging.getLogger(__name__)
@@ -35,8 +57,19 @@ class ServicioProcesamiento:
         self.config = Configuracion()
         self.repo_personas = RepositorioPersonas()
         self.repo_resultados = RepositorioResultados()
+        self.repo_coincidencias = RepositorioCoincidencias()
         self.servicio_validacion = ServicioValidacion()
         self.servicio_exportacion = ServicioExportacion()
+        self._cache_busquedas: Optional[CacheBusquedas] = None
+        self._escritor: Optional[EscritorResultados] = None
+        self._cola_trabajo: Optional[ColaTrabajo] = None
+        self._detener = threading.Event()
+
+        # Coincidencias a guardar cuando se inserte el resultado de su persona
+        self._coincidencias_pendientes: Dict[int, List[Coincidencia]] = {}
+        self._bloqueo_coincidencias = threading.Lock()
+        self._coincidencias_guardadas = 0
+        self._coincidencias_fallidas = 0
 
         self._crear_directorios()
 
@@ -59,135 +92,984 @@ class ServicioProcesamiento:
         Returns:
             Diccionario con estadísticas del proceso
         """
-        estadisticas = {
-            'total_personas': 0,
-            'procesadas_ok': 0,
-            'procesadas_nok': 0,
-            'no_cruzan_maestra': 0,
-            'informacion_incompleta': 0,
-            'errores': 0
-        }
+        estadisticas = self._estadisticas_iniciales()
+        self._detener.clear()
 
         print("\n" + "=" * 50)
         print("BOT RPA - VERIFICACIÓN OFAC")
         print("=" * 50)
 
         try:
-            inicializar_pool()
-            self.repo_resultados.limpiar_tabla()
+            inicializar_pool(max_conexiones=self._max_conexiones())
 
-            personas = self.repo_personas.obtener_personas_a_consultar()
-            estadisticas['total_personas'] = len(personas)
-            print(f"Personas a procesar: {len(personas)}")
+            if self.config.cola.habilitada:
+                self._ejecutar_distribuido(estadisticas)
+                return estadisticas
+
+            self._preparar_resultados(estadisticas)
+
+            total = self.repo_personas.contar_personas_a_consultar(self._reanudar())
+            estadisticas['total_personas'] = total
+            print(f"Personas a procesar: {total}")
 
-            if not personas:
+            if not total:
                 print("No hay personas para procesar")
                 return estadisticas
 
-            resultado_validacion = self.servicio_validacion.clasificar_personas(
-                personas
+            personas_validas = self._clasificar_en_flujo(estadisticas)
+            stats_ofac = self._procesar_busquedas_ofac(personas_validas)
+            self._aplicar_stats_ofac(estadisticas, stats_ofac)
+
+            self.servicio_exportacion.exportar_incompletos()
+
+        except Exception as e:
+            logger.error(f"Error en proceso principal: {e}")
+            raise
+
+        finally:
+            self._aplicar_stats_pool(estadisticas)
+            cerrar_pool()
+
+        return estadisticas
+
+    async def ejecutar_async(self) -> dict:
+        """
+        Ejecuta el proceso completo solapando las etapas independientes.
+        Primero guarda los resultados de todas las personas que no se
+        consultan; luego las búsquedas OFAC de las válidas y la exportación
+        de los incompletos corren a la vez en hilos del executor, sin que
+        la exportación espere a las búsquedas.
+
+        Returns:
+            Diccionario con estadísticas del proceso
+        """
+        estadisticas = self._estadisticas_iniciales()
+        self._detener.clear()
+
+        print("\n" + "=" * 50)
+        print("BOT RPA - VERIFICACIÓN OFAC")
+        print("=" * 50)
+
+        executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rpa")
+        pendientes = []
+
+        def en_hilo(funcion, *args):
+            futuro = executor.submit(funcion, *args)
+            pendientes.append(futuro)
+            return asyncio.wrap_future(futuro)
+
+        try:
+            await en_hilo(partial(inicializar_pool, max_conexiones=self._max_conexiones()))
+            await en_hilo(self._preparar_resultados, estadisticas)
+
+            total = await en_hilo(
+                self.repo_personas.contar_personas_a_consultar,
+                self._reanudar()
             )
+            estadisticas['total_personas'] = total
+            print(f"Personas a procesar: {total}")
 
-            if resultado_validacion.resultados_no_cruzan:
-                self.repo_resultados.insertar_lote(
-                    resultado_validacion.resultados_no_cruzan
-                )
-                estadisticas['no_cruzan_maestra'] = len(
-                    resultado_validacion.resultados_no_cruzan
-                )
+            if not total:
+                print("No hay personas para procesar")
+                return estadisticas
 
-            if resultado_validacion.resultados_incompletos:
-                self.repo_resultados.insertar_lote(
-                    resultado_validacion.resultados_incompletos
-                )
-                estadisticas['informacion_incompleta'] = len(
-                    resultado_validacion.resultados_incompletos
-                )
+            # Una pasada propia, que no depende del ritmo de las búsquedas,
+            # deja escritos todos los incompletos antes de exportarlos
+            await en_hilo(self._guardar_no_consultables, estadisticas)
 
-            if resultado_validacion.personas_validas:
-                stats_ofac = self._procesar_busquedas_ofac(
-                    resultado_validacion.personas_validas
+            async def buscar_validas():
+                stats_ofac = await en_hilo(
+                    self._procesar_busquedas_ofac,
+                    self._leer_pendientes()
                 )
-                estadisticas['procesadas_ok'] = stats_ofac['ok']
-                estadisticas['procesadas_nok'] = stats_ofac['nok']
-                estadisticas['errores'] = stats_ofac['errores']
+                self._aplicar_stats_ofac(estadisticas, stats_ofac)
 
-            self.servicio_exportacion.exportar_incompletos()
+            await asyncio.gather(
+                en_hilo(self.servicio_exportacion.exportar_incompletos),
+                buscar_validas()
+            )
+
+        except asyncio.CancelledError:
+            # Ctrl-C: los workers terminan la persona en curso y cierran el navegador
+            self._detener.set()
+            raise
 
         except Exception as e:
+            self._detener.set()
             logger.error(f"Error en proceso principal: {e}")
             raise
 
         finally:
+            # Los hilos no se pueden cancelar: se espera a que terminen
+            # antes de cerrar el pool de conexiones que usan
+            wait(pendientes)
+            executor.shutdown(wait=True)
+            self._aplicar_stats_pool(estadisticas)
             cerrar_pool()
 
         return estadisticas
 
-    def _procesar_busquedas_ofac(self, personas: list) -> dict:
+    @staticmethod
+    def _estadisticas_iniciales() -> dict:
+        """Crea el diccionario de estadísticas con todos los contadores en cero."""
+        return {
+            'id_ejecucion': None,
+            'reanudada': False,
+            'total_personas': 0,
+            'procesadas_ok': 0,
+            'procesadas_nok': 0,
+            'no_cruzan_maestra': 0,
+            'informacion_incompleta': 0,
+            'errores': 0,
+            'cache_aciertos': 0,
+            'cache_fallos': 0,
+            'busquedas_ahorradas': 0,
+            'coincidencias_guardadas': 0,
+            'coincidencias_fallidas': 0,
+            'paises_no_resueltos': {},
+            'pool_tomas': 0,
+            'pool_esperas': 0,
+            'pool_tiempo_espera': 0.0,
+            'pool_max_en_uso': 0
+        }
+
+    def _reanudar(self) -> bool:
+        """Indica si la ejecución continúa una anterior en lugar de empezar de cero."""
+        return self.config.procesamiento.reanudar
+
+    def _asignar_ejecucion(self, estadisticas: dict) -> None:
+        """
+        Genera el identificador de la ejecución y lo asigna al repositorio
+        de resultados para que quede en cada fila insertada, si la tabla ya
+        tiene la columna idEjecucion.
+
+        Args:
+            estadisticas: Estadísticas generales donde registrar la ejecución
+        """
+        id_ejecucion = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        estadisticas['id_ejecucion'] = id_ejecucion
+        estadisticas['reanudada'] = self._reanudar()
+        print(f"Ejecución: {id_ejecucion}")
+
+        if self.repo_resultados.tiene_columna_ejecucion():
+            self.repo_resultados.id_ejecucion = id_ejecucion
+        else:
+            logger.warning(
+                "La tabla de resultados no tiene la columna idEjecucion: las filas se "
+                "guardan sin ejecución (python -m src.base_datos.migraciones aplicar)"
+            )
+
+        if self.config.procesamiento.extraer_coincidencias:
+            self.repo_coincidencias.crear_tabla()
+        self.repo_coincidencias.id_ejecucion = id_ejecucion
+
+    def _ejecutar_distribuido(self, estadisticas: dict) -> None:
+        """
+        Ejecuta el proceso como un nodo más de la cola de trabajo compartida.
+        El primer nodo que encuentra la cola terminada abre una ronda nueva
+        (o, al reanudar, completa la anterior); los demás se suman a la que
+        está en curso. Cada nodo busca hasta vaciar la cola entre todos y
+        las estadísticas finales suman el trabajo de todos los nodos.
+
+        Args:
+            estadisticas: Estadísticas generales a completar
+        """
+        config_cola = self.config.cola
+        cola = ColaTrabajo(
+            nodo=config_cola.nodo,
+            reserva_segundos=config_cola.reserva_segundos,
+            max_intentos=config_cola.max_intentos
+        )
+        estadisticas['nodo'] = cola.nodo
+        print(f"Nodo: {cola.nodo}")
+
+        self._asignar_ejecucion(estadisticas)
+        cola.crear_tabla()
+
+        # Un solo nodo a la vez limpia, clasifica y encola
+        with cola.bloqueo_preparacion():
+            if not self._reanudar() and cola.terminada():
+                print("Cola terminada: se inicia una ronda nueva")
+                self.repo_resultados.limpiar_tabla()
+                self._limpiar_coincidencias()
+                cola.vaciar()
+
+            self.repo_resultados.insertar_no_consultables(solo_pendientes=True)
+            encoladas = cola.encolar_validas(reintentar_fallidas=self._reanudar())
+            print(f"Personas encoladas por este nodo: {encoladas}")
+
+        estadisticas['total_personas'] = self.repo_personas.contar_personas_a_consultar()
+        print(f"Personas a procesar (todos los nodos): {estadisticas['total_personas']}")
+
+        self._cola_trabajo = cola
+        try:
+            with cola:
+                # Cada reclamo se agrupa por separado: no se retiene trabajo
+                # reservado mientras se espera el siguiente reclamo
+                stats_ofac = self._procesar_busquedas_ofac(
+                    self._personas_de_cola(cola),
+                    por_lotes=True
+                )
+        finally:
+            self._cola_trabajo = None
+
+        estadisticas['busquedas_nodo'] = stats_ofac['ok'] + stats_ofac['nok']
+        self._aplicar_stats_ofac(estadisticas, stats_ofac)
+
+        # Totales de todos los nodos
+        conteos = self.repo_resultados.contar_por_estado()
+        estadisticas['procesadas_ok'] = conteos.get(ESTADO_OK, 0)
+        estadisticas['procesadas_nok'] = conteos.get(ESTADO_NOK, 0)
+        estadisticas['no_cruzan_maestra'] = conteos.get(ESTADO_NO_CRUZA_MAESTRA, 0)
+        estadisticas['informacion_incompleta'] = conteos.get(ESTADO_INFORMACION_INCOMPLETA, 0)
+        estadisticas['errores'] = cola.contar_por_estado().get(COLA_FALLIDA, 0)
+
+        self.servicio_exportacion.exportar_incompletos()
+
+    def _personas_de_cola(self, cola: ColaTrabajo):
+        """
+        Reclama personas de la cola compartida hasta que no quede trabajo
+        en ningún nodo. Mientras otros nodos tengan reservas vigentes
+        espera: si alguno cae, sus personas se reclaman al vencer.
+
+        Args:
+            cola: Cola de trabajo del nodo
+
+        Yields:
+            Lotes de personas reservadas para este nodo, uno por reclamo
+        """
+        config_cola = self.config.cola
+
+        while not self._detener.is_set():
+            personas = cola.reclamar(config_cola.tamano_reclamo)
+            if personas:
+                yield personas
+                continue
+
+            if cola.terminada():
+                return
+            self._detener.wait(config_cola.espera_segundos)
+
+    def _al_volcar_resultados(self, lote: list) -> None:
+        """
+        Guarda las coincidencias de las personas cuyo resultado ya se insertó
+        y las marca como hechas en la cola compartida.
+        """
+        with self._bloqueo_coincidencias:
+            coincidencias = [
+                coincidencia
+                for r in lote
+                for coincidencia in self._coincidencias_pendientes.pop(r.id_persona, ())
+            ]
+
+        if coincidencias:
+            try:
+                self._coincidencias_guardadas += self.repo_coincidencias.insertar_lote(
+                    coincidencias
+                )
+            except Exception as e:
+                # El resultado ya está guardado; solo se pierde el detalle
+                self._coincidencias_fallidas += len(coincidencias)
+                logger.error(f"No se pudieron guardar {len(coincidencias)} coincidencias: {e}")
+
+        if self._cola_trabajo is not None:
+            try:
+                self._cola_trabajo.completar(r.id_persona for r in lote)
+            except Exception as e:
+                # Ya no se renuevan: al vencer la reserva se marcan hechas
+                logger.error(f"No se pudieron completar {len(lote)} personas en la cola: {e}")
+
+    def _al_fallar_resultados(self, lote: list) -> None:
+        """
+        Descarta las coincidencias de los resultados que no se pudieron
+        insertar y devuelve sus personas a la cola compartida.
+        """
+        with self._bloqueo_coincidencias:
+            for r in lote:
+                self._coincidencias_pendientes.pop(r.id_persona, None)
+
+        for r in lote:
+            self._fallar_en_cola(r, "No se pudo guardar el resultado")
+
+    def _registrar_coincidencias(self, persona, resultado_busqueda) -> None:
+        """
+        Deja pendientes las coincidencias de la búsqueda para la persona,
+        hasta que su resultado se inserte.
+
+        Args:
+            persona: Persona a la que corresponden las coincidencias
+            resultado_busqueda: Resultado con las filas de la grilla OFAC
+        """
+        if not resultado_busqueda.coincidencias:
+            return
+
+        coincidencias = [
+            Coincidencia(
+                id_persona=persona.id_persona,
+                nombre=c.nombre,
+                direccion=c.direccion,
+                tipo=c.tipo,
+                programas='; '.join(c.programas),
+                lista=c.lista,
+                puntaje=c.puntaje
+            )
+            for c in resultado_busqueda.coincidencias
+        ]
+        with self._bloqueo_coincidencias:
+            self._coincidencias_pendientes[persona.id_persona] = coincidencias
+
+    def _fallar_en_cola(self, persona, motivo: str) -> None:
+        """
+        Devuelve a la cola compartida una persona cuya búsqueda o cuyo
+        resultado falló.
+
+        Args:
+            persona: Persona o Resultado con el idPersona a devolver
+            motivo: Descripción del error
+        """
+        if self._cola_trabajo is None:
+            return
+        try:
+            self._cola_trabajo.fallar(persona.id_persona, motivo)
+        except Exception:
+            # Ya no se renueva: al vencer la reserva otro reclamo la reintenta
+            pass
+
+    def _preparar_resultados(self, estadisticas: dict) -> None:
+        """
+        Asigna un identificador a la ejecución, que se guarda en cada fila
+        insertada, y deja lista la tabla de resultados: la vacía en una
+        ejecución normal o conserva lo ya procesado al reanudar.
+
+        Args:
+            estadisticas: Estadísticas generales donde registrar la ejecución
+        """
+        self._asignar_ejecucion(estadisticas)
+
+        if self._reanudar():
+            previos = self.repo_resultados.contar()
+            print(f"Reanudando: se conservan {previos} resultados previos")
+        else:
+            self.repo_resultados.limpiar_tabla()
+            self._limpiar_coincidencias()
+
+    def _limpiar_coincidencias(self) -> None:
+        """Vacía las coincidencias de la ejecución anterior, si se guardan."""
+        if self.config.procesamiento.extraer_coincidencias:
+            self.repo_coincidencias.limpiar_tabla()
+
+    @staticmethod
+    def _aplicar_stats_ofac(estadisticas: dict, stats_ofac: dict) -> None:
+        """Copia los contadores de las búsquedas OFAC a las estadísticas generales."""
+        estadisticas['procesadas_ok'] = stats_ofac['ok']
+        estadisticas['procesadas_nok'] = stats_ofac['nok']
+        estadisticas['errores'] = stats_ofac['errores']
+        estadisticas['cache_aciertos'] = stats_ofac.get('cache_aciertos', 0)
+        estadisticas['cache_fallos'] = stats_ofac.get('cache_fallos', 0)
+        estadisticas['busquedas_ahorradas'] = stats_ofac.get('busquedas_ahorradas', 0)
+        estadisticas['coincidencias_guardadas'] = stats_ofac.get('coincidencias_guardadas', 0)
+        estadisticas['coincidencias_fallidas'] = stats_ofac.get('coincidencias_fallidas', 0)
+        estadisticas['paises_no_resueltos'] = stats_ofac.get('paises_no_resueltos', {})
+
+    @staticmethod
+    def _aplicar_stats_pool(estadisticas: dict) -> None:
+        """Copia el uso del pool de conexiones a las estadísticas generales."""
+        stats_pool = estadisticas_pool()
+        if not stats_pool:
+            return
+        estadisticas['pool_tomas'] = stats_pool['tomas']
+        estadisticas['pool_esperas'] = stats_pool['esperas']
+        estadisticas['pool_tiempo_espera'] = stats_pool['tiempo_espera_segundos']
+        estadisticas['pool_max_en_uso'] = stats_pool['max_en_uso']
+
+    def _clasificar_en_flujo(self, estadisticas: dict):
+        """
+        Lee las personas por páginas, guarda en el momento los resultados
+        de las que no se consultan y entrega una a una las válidas, para
+        que la memoria no crezca con la tabla.
+
+        Args:
+            estadisticas: Estadísticas generales donde sumar no cruzan e incompletos
+
+        Yields:
+            Personas válidas para buscar en OFAC
+        """
+        if self.config.procesamiento.clasificacion_sql:
+            yield from self._clasificar_en_sql(estadisticas)
+            return
+
+        if self.config.procesamiento.clasificacion_columnar:
+            yield from self._clasificar_columnar(estadisticas)
+            return
+
+        for lote in self.repo_personas.iterar_personas_a_consultar(
+            self.config.procesamiento.tamano_lote_lectura,
+            solo_pendientes=self._reanudar()
+        ):
+            clasificacion = self.servicio_validacion.clasificar_personas(lote)
+
+            if clasificacion.resultados_no_cruzan:
+                self.repo_resultados.insertar_lote(clasificacion.resultados_no_cruzan)
+                estadisticas['no_cruzan_maestra'] += len(clasificacion.resultados_no_cruzan)
+
+            if clasificacion.resultados_incompletos:
+                self.repo_resultados.insertar_lote(clasificacion.resultados_incompletos)
+                estadisticas['informacion_incompleta'] += len(
+                    clasificacion.resultados_incompletos
+                )
+
+            yield from clasificacion.personas_validas
+
+    def _guardar_no_consultables(self, estadisticas: dict) -> None:
+        """
+        Clasifica a todas las personas y guarda los resultados de las que
+        no se consultan, sin retener las válidas: esas se leen después
+        con _leer_pendientes.
+
+        Args:
+            estadisticas: Estadísticas generales donde sumar no cruzan e incompletos
+        """
+        if self.config.procesamiento.clasificacion_sql:
+            self._insertar_no_consultables_sql(estadisticas)
+            return
+
+        for _ in self._clasificar_en_flujo(estadisticas):
+            pass
+
+    def _leer_pendientes(self):
+        """
+        Lee por lotes las personas a consultar que aún no tienen resultado;
+        tras _guardar_no_consultables, son justamente las válidas.
+
+        Yields:
+            Personas válidas para buscar en OFAC
+        """
+        for lote in self.repo_personas.iterar_personas_a_consultar(
+            self.config.procesamiento.tamano_lote_lectura,
+            solo_pendientes=True
+        ):
+            yield from lote
+
+    def _clasificar_columnar(self, estadisticas: dict):
+        """
+        Lee las personas como DataFrames, las clasifica con operaciones
+        vectorizadas e inserta en bloque los grupos no consultables sin
+        crear objetos por fila; solo las válidas se convierten en Persona.
+
+        Args:
+            estadisticas: Estadísticas generales donde sumar no cruzan e incompletos
+
+        Yields:
+            Personas válidas para buscar en OFAC
+        """
+        for df in self.repo_personas.iterar_personas_a_consultar_df(
+            self.config.procesamiento.tamano_lote_lectura,
+            solo_pendientes=self._reanudar()
+        ):
+            clasificacion = self.servicio_validacion.clasificar_dataframe(df)
+
+            estadisticas['no_cruzan_maestra'] += self.repo_resultados.insertar_dataframe(
+                clasificacion.resultados_no_cruzan
+            )
+            estadisticas['informacion_incompleta'] += self.repo_resultados.insertar_dataframe(
+                clasificacion.resultados_incompletos
+            )
+
+            yield from self.repo_personas.personas_desde_dataframe(
+                clasificacion.personas_validas
+            )
+
+    def _clasificar_en_sql(self, estadisticas: dict):
+        """
+        Inserta en la base de datos los resultados de las personas que no
+        se consultan y lee solo las válidas, sin pasar las demás por Python.
+
+        Args:
+            estadisticas: Estadísticas generales donde sumar no cruzan e incompletos
+
+        Yields:
+            Personas válidas para buscar en OFAC
+        """
+        self._insertar_no_consultables_sql(estadisticas)
+
+        for lote in self.repo_personas.iterar_personas_a_consultar(
+            self.config.procesamiento.tamano_lote_lectura,
+            solo_pendientes=self._reanudar(),
+            solo_validas=True
+        ):
+            yield from lote
+
+    def _insertar_no_consultables_sql(self, estadisticas: dict) -> None:
+        """Inserta con un INSERT ... SELECT los resultados de las personas que no se consultan."""
+        conteos = self.repo_resultados.insertar_no_consultables(
+            solo_pendientes=self._reanudar()
+        )
+        estadisticas['no_cruzan_maestra'] += conteos.get(ESTADO_NO_CRUZA_MAESTRA, 0)
+        estadisticas['informacion_incompleta'] += conteos.get(
+            ESTADO_INFORMACION_INCOMPLETA, 0
+        )
+
+    def _max_conexiones(self) -> int:
+        """Tamaño del pool de conexiones según el número de workers."""
+        return max(10, self.config.procesamiento.num_navegadores + 4)
+
+    def _procesar_busquedas_ofac(
+        self,
+        personas: Iterable,
+        por_lotes: bool = False
+    ) -> dict:
         """
         Procesa las búsquedas OFAC para las personas válidas.
+        Las personas con la misma búsqueda normalizada se agrupan y se
+        buscan una sola vez. Usa varios navegadores en paralelo si así
+        está configurado.
 
         Args:
-            personas: Lista de personas a buscar en OFAC
+            personas: Personas a buscar en OFAC; puede ser un generador
+            por_lotes: Si es True, personas entrega lotes de personas no
+                vacíos y cada lote se agrupa por separado
 
         Returns:
             Diccionario con contadores de resultados
         """
-        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+        personas = iter(personas)
+        primera = next(personas, None)
+
+        # Sin personas válidas no se abre ningún navegador
+        if primera is None:
+            return {'ok': 0, 'nok': 0, 'errores': 0}
+
+        planificador = PlanificadorBusquedas(
+            ventana=self.config.procesamiento.ventana_deduplicacion,
+            habilitado=self.config.procesamiento.deduplicar_busquedas,
+            ordenar=self.config.procesamiento.ordenar_busquedas
+        )
+        if por_lotes:
+            grupos = planificador.agrupar_lotes(chain([primera], personas))
+        else:
+            grupos = planificador.agrupar(chain([primera], personas))
+        num_navegadores = self.config.procesamiento.num_navegadores
+
+        # El cribado local no usa red ni navegador: un solo hilo es suficiente
+        if self.config.procesamiento.backend_busqueda == BACKEND_LOCAL:
+            num_navegadores = 1
+            personas_por_pais = None
+        else:
+            personas_por_pais = self._preparar_paises()
+
+        cache = self._abrir_cache()
+        self._cache_busquedas = cache
+        self._coincidencias_guardadas = 0
+        self._coincidencias_fallidas = 0
+
+        escritor = EscritorResultados(
+            self.repo_resultados,
+            tamano_lote=self.config.procesamiento.escritura_tamano_lote,
+            intervalo_segundos=self.config.procesamiento.escritura_intervalo_segundos,
+            capacidad=self.config.procesamiento.escritura_capacidad,
+            al_volcar=self._al_volcar_resultados,
+            al_fallar=self._al_fallar_resultados
+        )
+
+        try:
+            # Al salir del bloque, incluso por excepción o Ctrl+C, se insertan los pendientes
+            with escritor:
+                self._escritor = escritor
+                if num_navegadores <= 1:
+                    stats = self._procesar_busquedas_secuencial(grupos)
+                else:
+                    stats = self._procesar_busquedas_paralelo(grupos, num_navegadores)
+
+        finally:
+            self._escritor = None
+            self._cache_busquedas = None
+            # Las de resultados que no llegaron a insertarse se descartan
+            with self._bloqueo_coincidencias:
+                self._coincidencias_pendientes.clear()
+            if cache is not None:
+                cache.cerrar()
+
+        stats['errores'] += escritor.errores
+        stats['busquedas_ahorradas'] = planificador.ahorradas
+        stats['coincidencias_guardadas'] = self._coincidencias_guardadas
+        stats['coincidencias_fallidas'] = self._coincidencias_fallidas
+
+        if personas_por_pais is not None:
+            stats['paises_no_resueltos'] = {
+                pais: personas_por_pais.get(pais, 0)
+                for pais in obtener_paises_no_resueltos()
+            }
 
-        with navegador_web() as navegador:
-            buscador = BuscadorOfac(navegador)
-            captura = CapturaPantalla(navegador)
+        if cache is not None:
+            stats['cache_aciertos'] = cache.aciertos
+            stats['cache_fallos'] = cache.fallos
 
+        return stats
+
+    def _preparar_paises(self) -> Dict[str, int]:
+        """
+        Registra los países distintos de la maestra para que cada buscador
+        los traduzca a opciones del dropdown una sola vez, al cargarlo.
+
+        Returns:
+            Diccionario {país: personas válidas con ese país}
+        """
+        personas_por_pais = self.repo_personas.contar_por_pais(self._reanudar())
+        configurar_paises(personas_por_pais, self.config.procesamiento.archivo_mapeo_paises)
+        return personas_por_pais
+
+    def _abrir_cache(self) -> Optional[CacheBusquedas]:
+        """
+        Abre la caché persistente de búsquedas si está habilitada.
+
+        Returns:
+            Caché de búsquedas o None si está deshabilitada
+        """
+        config_cache = self.config.cache
+        if not config_cache.habilitada:
+            return None
+
+        return CacheBusquedas(
+            directorio=config_cache.directorio,
+            ttl_segundos=config_cache.ttl_horas * 3600,
+            ttl_sin_resultados_segundos=config_cache.ttl_sin_resultados_horas * 3600,
+            max_entradas=config_cache.max_entradas,
+            requiere_coincidencias=self.config.procesamiento.extraer_coincidencias
+        )
+
+    def _procesar_busquedas_secuencial(self, grupos: Iterable[GrupoBusqueda]) -> dict:
+        """
+        Procesa las búsquedas OFAC con un único navegador.
+
+        Args:
+            grupos: Grupos de personas a buscar en OFAC
+
+        Returns:
+            Diccionario con contadores de resultados
+        """
+        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+
+        with self._abrir_buscador() as (buscador, captura):
             if not buscador.navegar_a_ofac():
                 logger.error("No se pudo acceder al sitio OFAC")
-                stats['errores'] = len(personas)
+                # En la cola compartida el trabajo queda para otros nodos
+                if self._cola_trabajo is None:
+                    # Se recorre igual para que la clasificación termine de guardarse
+                    stats['errores'] = sum(len(grupo.personas) for grupo in grupos)
                 return stats
 
-            for i, persona in enumerate(personas, 1):
-                try:
-                    print(f"  [{i}/{len(personas)}] {persona.nombre_persona}...", end=" ")
+            for i, grupo in enumerate(grupos, 1):
+                if self._detener.is_set():
+                    break
+                self._procesar_grupo(buscador, captura, grupo, stats, i)
 
-                    # Realizar búsqueda en OFAC
-                    resultado_busqueda = buscador.buscar_persona(
-                        nombre=persona.nombre_persona,
-                        direccion=persona.direccion,
-                        pais=persona.pais
-                    )
+        return stats
 
-                    if resultado_busqueda.exito and resultado_busqueda.cantidad_resultados > 0:
-                        try:
-                            captura.capturar(id_persona=persona.id_persona)
-                        except Exception:
-                            pass
-                        estado = ESTADO_OK
-                        stats['ok'] += 1
-                        print(f"OK ({resultado_busqueda.cantidad_resultados} resultados)")
-                    else:
-                        estado = ESTADO_NOK
-                        stats['nok'] += 1
-                        print("NOK")
-
-                    resultado = Resultado(
-                        id_persona=persona.id_persona,
-                        nombre_persona=persona.nombre_persona,
-                        pais=persona.pais or "",
-                        cantidad_resultados=resultado_busqueda.cantidad_resultados,
-                        estado_transaccion=estado
-                    )
+    @contextmanager
+    def _abrir_buscador(self, independiente: bool = False):
+        """
+        Abre el buscador del backend configurado junto con su gestor de evidencias.
+
+        Args:
+            independiente: Si es True, el navegador no es la instancia compartida
+
+        Yields:
+            Tupla (buscador, captura)
+        """
+        backend = self.config.procesamiento.backend_busqueda
+
+        if backend == BACKEND_LOCAL:
+            # La lista local ya responde en memoria; no pasa por la caché
+            buscador = BuscadorSdnLocal()
+            yield buscador, CapturaHtml(buscador)
+            return
+
+        if backend == BACKEND_HTTP:
+            buscador = BuscadorOfacHttp(
+                extraer_coincidencias=self.config.procesamiento.extraer_coincidencias
+            )
+            try:
+                yield self._con_cache(buscador), CapturaHtml(buscador)
+            finally:
+                buscador.cerrar()
+            return
+
+        # El gestor actúa como buscador y como captura, y recicla el navegador
+        with GestorNavegador(independiente=independiente) as gestor:
+            yield self._con_cache(gestor), gestor
+
+    def _con_cache(self, buscador):
+        """Envuelve el buscador con la caché de búsquedas si está abierta."""
+        if self._cache_busquedas is None:
+            return buscador
+        return BuscadorConCache(buscador, self._cache_busquedas)
 
-                    if not self._validar_resultado(resultado):
-                        stats['errores'] += 1
+    def _procesar_busquedas_paralelo(
+        self,
+        grupos: Iterable[GrupoBusqueda],
+        num_navegadores: int
+    ) -> dict:
+        """
+        Procesa las búsquedas OFAC con un pool de workers independientes
+        (cada uno con su navegador o sesión HTTP) que toman grupos de
+        personas de una cola compartida.
+
+        La cola es acotada: el hilo principal va leyendo personas a medida
+        que los workers las consumen, así nunca hay más de unas pocas en memoria.
+
+        Args:
+            grupos: Grupos de personas a buscar en OFAC; puede ser un generador
+            num_navegadores: Número de navegadores (workers) a lanzar
+
+        Returns:
+            Diccionario con contadores de resultados combinados
+        """
+        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+        cola = queue.Queue(maxsize=num_navegadores * 2)
+        bloqueo = threading.Lock()
+        detener = self._detener
+
+        hilos = [
+            threading.Thread(
+                target=self._worker_busquedas,
+                args=(cola, stats, bloqueo, detener),
+                name=f"navegador-{n}",
+                daemon=True
+            )
+            for n in range(1, num_navegadores + 1)
+        ]
+
+        print(f"Navegadores en paralelo: {num_navegadores}")
+        for hilo in hilos:
+            hilo.start()
+
+        try:
+            for i, grupo in enumerate(grupos, 1):
+                if detener.is_set():
+                    break
+                if not self._encolar(cola, (i, grupo), hilos):
+                    if self._cola_trabajo is not None:
+                        # El resto queda en la cola compartida para otros nodos
+                        break
+                    # Ningún navegador sigue vivo: el resto cuenta como error
+                    stats['errores'] += len(grupo.personas)
+            for _ in hilos:
+                self._encolar(cola, None, hilos)
+
+            for hilo in hilos:
+                while hilo.is_alive():
+                    hilo.join(timeout=0.5)
+        except KeyboardInterrupt:
+            # Los workers terminan la persona en curso y cierran su navegador
+            detener.set()
+            for hilo in hilos:
+                hilo.join()
+            raise
+
+        # Personas que quedaron en cola porque ningún navegador pudo atenderlas
+        while not cola.empty():
+            elemento = cola.get_nowait()
+            if elemento is not None:
+                stats['errores'] += len(elemento[1].personas)
+
+        return stats
+
+    @staticmethod
+    def _encolar(cola: queue.Queue, elemento, hilos: list) -> bool:
+        """
+        Pone un elemento en la cola acotada esperando a que haya hueco,
+        mientras quede algún worker vivo que pueda vaciarla.
+
+        Args:
+            cola: Cola compartida con los workers
+            elemento: Tupla (posición, grupo) o None como marcador de fin
+            hilos: Workers que consumen la cola
+
+        Returns:
+            True si se encoló, False si ya no queda ningún worker vivo
+        """
+        while any(hilo.is_alive() for hilo in hilos):
+            try:
+                cola.put(elemento, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker_busquedas(
+        self,
+        cola: queue.Queue,
+        stats: dict,
+        bloqueo: threading.Lock,
+        detener: threading.Event
+    ) -> None:
+        """
+        Worker del pool: abre su propio buscador y procesa grupos
+        de la cola hasta encontrar el marcador de fin.
+
+        Args:
+            cola: Cola compartida con tuplas (posición, grupo)
+            stats: Diccionario compartido donde se combinan los contadores
+            bloqueo: Lock que protege el diccionario compartido
+            detener: Evento que indica que se debe abandonar el trabajo
+                (Ctrl-C o error en otra etapa)
+        """
+        stats_worker = {'ok': 0, 'nok': 0, 'errores': 0}
+
+        try:
+            with self._abrir_buscador(independiente=True) as (buscador, captura):
+                if not buscador.navegar_a_ofac():
+                    logger.error("No se pudo acceder al sitio OFAC")
+                    return
+
+                while not detener.is_set():
+                    # Con espera acotada para ver detener aunque nadie encole más
+                    try:
+                        elemento = cola.get(timeout=0.5)
+                    except queue.Empty:
                         continue
+                    if elemento is None:
+                        break
 
-                    self.repo_resultados.insertar(resultado)
+                    i, grupo = elemento
+                    self._procesar_grupo(buscador, captura, grupo, stats_worker, i)
 
-                except Exception as e:
-                    print(f"ERROR")
-                    logger.error(f"Error procesando persona {persona.id_persona}: {e}")
+        except Exception as e:
+            logger.error(f"Error en worker {threading.current_thread().name}: {e}")
+
+        finally:
+            with bloqueo:
+                for clave, valor in stats_worker.items():
+                    stats[clave] += valor
+
+    def _procesar_grupo(
+        self,
+        buscador,
+        captura,
+        grupo: GrupoBusqueda,
+        stats: dict,
+        posicion: int
+    ) -> None:
+        """
+        Busca en OFAC una vez por grupo y guarda un resultado, con su
+        propia evidencia, para cada persona del grupo.
+
+        Args:
+            buscador: Buscador OFAC del worker (GestorNavegador, BuscadorOfacHttp
+                o BuscadorSdnLocal)
+            captura: Gestor de evidencias asociado al mismo buscador
+            grupo: Personas que comparten la misma búsqueda
+            stats: Diccionario de contadores a actualizar
+            posicion: Posición del grupo, para mostrar el progreso
+        """
+        representante = grupo.representante
+        repetidas = len(grupo.personas) - 1
+        prefijo = f"  [{posicion}] {representante.nombre_persona}"
+        if repetidas:
+            prefijo += f" (+{repetidas} iguales)"
+        prefijo += "..."
+
+        try:
+            # Realizar búsqueda en OFAC
+            resultado_busqueda = buscador.buscar_persona(
+                nombre=representante.nombre_persona,
+                direccion=representante.direccion,
+                pais=representante.pais
+            )
+        except Exception as e:
+            print(f"{prefijo} ERROR")
+            logger.error(f"Error procesando persona {representante.id_persona}: {e}")
+            for persona in grupo.personas:
+                stats['errores'] += 1
+                self._fallar_en_cola(persona, str(e))
+            return
+
+        if resultado_busqueda.exito and resultado_busqueda.cantidad_resultados > 0:
+            estado = ESTADO_OK
+            print(f"{prefijo} OK ({resultado_busqueda.cantidad_resultados} resultados)")
+        else:
+            estado = ESTADO_NOK
+            print(f"{prefijo} NOK")
+
+        ruta_evidencia = None
+        for persona in grupo.personas:
+            try:
+                if estado == ESTADO_OK:
+                    ruta_evidencia = self._guardar_evidencia(
+                        buscador, captura, persona, resultado_busqueda, ruta_evidencia
+                    )
+
+                resultado = Resultado(
+                    id_persona=persona.id_persona,
+                    nombre_persona=persona.nombre_persona,
+                    pais=persona.pais or "",
+                    cantidad_resultados=resultado_busqueda.cantidad_resultados,
+                    estado_transaccion=estado
+                )
+
+                if not self._validar_resultado(resultado):
                     stats['errores'] += 1
+                    self._fallar_en_cola(persona, "Resultado inválido")
+                    continue
 
-        return stats
+                self._registrar_coincidencias(persona, resultado_busqueda)
+
+                if self._escritor is not None:
+                    self._escritor.agregar(resultado)
+                else:
+                    self.repo_resultados.insertar(resultado)
+                    self._al_volcar_resultados([resultado])
+
+                stats['ok' if estado == ESTADO_OK else 'nok'] += 1
+
+            except Exception as e:
+                logger.error(f"Error procesando persona {persona.id_persona}: {e}")
+                stats['errores'] += 1
+                self._fallar_en_cola(persona, str(e))
+
+    def _guardar_evidencia(
+        self,
+        buscador,
+        captura,
+        persona,
+        resultado_busqueda,
+        ruta_grupo: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Guarda la evidencia de una persona con coincidencias. Si el resultado
+        viene de la caché, o ya se capturó para otra persona del mismo grupo,
+        copia esa evidencia en lugar de volver a capturar.
+
+        Args:
+            buscador: Buscador OFAC del worker
+            captura: Gestor de evidencias asociado al buscador
+            persona: Persona buscada
+            resultado_busqueda: Resultado obtenido para la persona
+            ruta_grupo: Evidencia ya guardada para el grupo de la persona
+
+        Returns:
+            Ruta de la evidencia a reutilizar en el resto del grupo, o None
+        """
+        try:
+            origen = ruta_grupo or (
+                resultado_busqueda.ruta_evidencia if resultado_busqueda.desde_cache else None
+            )
+            if origen:
+                captura.copiar(origen, persona.id_persona)
+                return origen
+
+            ruta = captura.capturar(id_persona=persona.id_persona)
+
+            if ruta and isinstance(buscador, BuscadorConCache):
+                buscador.registrar_evidencia(
+                    persona.nombre_persona,
+                    persona.direccion,
+                    persona.pais,
+                    ruta
+                )
+            return ruta
+        except Exception:
+            return ruta_grupo
 
     def _validar_resultado(self, resultado: Resultado) -> bool:
         """
@@ -5,6 +5,8 @@ Servicio de validación de datos de personas.
 from typing import List
 from dataclasses import dataclass
 
+import pandas as pd
+
 from src.base_datos.repositorio_personas import Persona
 from src.base_datos.repositorio_resultados import Resultado
 from src.config.constantes import (
@@ -21,6 +23,14 @@ class ResultadoValidacion:
     resultados_incompletos: List[Resultado]
 
 
+@dataclass
+class ResultadoValidacionColumnar:
+    """Resultado de la validación vectorizada de un lote de personas."""
+    personas_validas: pd.DataFrame
+    resultados_no_cruzan: pd.DataFrame
+    resultados_incompletos: pd.DataFrame
+
+
 class ServicioValidacion:
     """Servicio para validar datos de personas antes de consultar OFAC."""
 
@@ -55,6 +65,62 @@ class ServicioValidacion:
             resultados_incompletos=resultados_incompletos
         )
 
+    def clasificar_dataframe(self, df: pd.DataFrame) -> ResultadoValidacionColumnar:
+        """
+        Clasifica un lote de personas con máscaras booleanas, sin recorrerlo
+        fila a fila. Aplica las mismas reglas que clasificar_personas.
+
+        Args:
+            df: DataFrame con las columnas de COLUMNAS_PERSONA
+
+        Returns:
+            ResultadoValidacionColumnar; los resultados vienen con las columnas
+            que espera RepositorioResultados.insertar_dataframe
+        """
+        direccion_nula = df['direccion'].isna()
+        pais_nulo = df['pais'].isna()
+
+        no_cruza = direccion_nula & pais_nulo
+        incompleta = ~no_cruza & (
+            self._columna_vacia(df['direccion'], direccion_nula) |
+            self._columna_vacia(df['pais'], pais_nulo)
+        )
+
+        return ResultadoValidacionColumnar(
+            personas_validas=df[~no_cruza & ~incompleta],
+            resultados_no_cruzan=self._resultados_df(
+                df[no_cruza], pais='', estado=ESTADO_NO_CRUZA_MAESTRA
+            ),
+            resultados_incompletos=self._resultados_df(
+                df[incompleta], pais=None, estado=ESTADO_INFORMACION_INCOMPLETA
+            )
+        )
+
+    @staticmethod
+    def _columna_vacia(columna: pd.Series, nula: pd.Series) -> pd.Series:
+        """Versión vectorizada de la regla vacío/'None' de _tiene_informacion_incompleta."""
+        texto = columna.where(~nula, '').astype(str).str.strip()
+        return nula | texto.isin(['', 'None'])
+
+    @staticmethod
+    def _resultados_df(personas: pd.DataFrame, pais, estado: str) -> pd.DataFrame:
+        """
+        Arma el DataFrame de resultados de un grupo de personas no consultables.
+
+        Args:
+            personas: Personas del grupo
+            pais: País fijo del resultado, o None para conservar el de la
+                persona (vacío si es nulo), como _crear_resultado_incompleto
+            estado: Estado de transacción del grupo
+        """
+        return pd.DataFrame({
+            'idPersona': personas['idPersona'],
+            'nombrePersona': personas['nombrePersona'],
+            'pais': personas['pais'].where(personas['pais'].notna(), '') if pais is None else pais,
+            'cantidadDeResultados': 0,
+            'estadoTransaccion': estado
+        })
+
     def _no_cruza_con_maestra(self, persona: Persona) -> bool:
         """
         Verifica si la persona no tiene datos en la tabla maestra.
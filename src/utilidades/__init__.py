@@ -3,4 +3,4 @@ Módulo de utilidades transversales.
 """
 
 from .logger import configurar_logger
-from .captura_pantalla import CapturaPantalla
+from .captura_pantalla import CapturaPantalla, CapturaHtml
@@ -4,6 +4,7 @@ Utilidad para gestión de capturas de pantalla.
 
 import logging
 import os
+import shutil
 from datetime import datetime
 from typing import Optional
 
@@ -15,6 +16,42 @@ from src.config.constantes import FORMATO_FECHA_CAPTURA, FORMATO_NOMBRE_CAPTURA
 logger = logging.getLogger(__name__)
 
 
+def copiar_captura(
+    ruta_origen: str,
+    directorio: str,
+    id_persona: int
+) -> Optional[str]:
+    """
+    Copia una evidencia existente con el nombre que corresponde a otra persona.
+    Se usa cuando el resultado se reutiliza sin repetir la búsqueda.
+
+    Args:
+        ruta_origen: Ruta de la captura a reutilizar
+        directorio: Directorio de capturas
+        id_persona: ID de la persona para nombrar el archivo
+
+    Returns:
+        Ruta del archivo copiado o None si falla
+    """
+    try:
+        fecha = datetime.now().strftime(FORMATO_FECHA_CAPTURA)
+        nombre_base = FORMATO_NOMBRE_CAPTURA.format(
+            fecha=fecha,
+            id_persona=id_persona
+        )
+        extension = os.path.splitext(ruta_origen)[1] or '.png'
+        nombre_base = nombre_base.replace('.png', extension)
+        ruta_completa = os.path.join(directorio, nombre_base)
+
+        if os.path.abspath(ruta_origen) != os.path.abspath(ruta_completa):
+            shutil.copyfile(ruta_origen, ruta_completa)
+        return ruta_completa
+
+    except OSError as e:
+        logger.error(f"Error al copiar captura: {e}")
+        return None
+
+
 class CapturaPantalla:
     """Clase para gestionar capturas de pantalla."""
 
@@ -53,6 +90,9 @@ class CapturaPantalla:
             Ruta del archivo guardado o None si falla
         """
         try:
+            if self.config.selenium.bloquear_recursos:
+                self._preparar_estilos()
+
             try:
                 self.navegador.execute_script("document.body.style.zoom='60%'")
             except Exception:
@@ -76,6 +116,34 @@ class CapturaPantalla:
             logger.error(f"Error en captura: {e}")
             return None
 
+        finally:
+            if self.config.selenium.bloquear_recursos:
+                self._restaurar_bloqueo()
+
+    def _preparar_estilos(self) -> None:
+        """Carga las hojas de estilo bloqueadas para que la captura se vea completa."""
+        # Import local: src.scraping importa este módulo
+        from src.scraping.navegador import cargar_estilos
+        cargar_estilos(self.navegador)
+
+    def _restaurar_bloqueo(self) -> None:
+        """Vuelve a bloquear las hojas de estilo tras la captura."""
+        from src.scraping.navegador import bloquear_recursos
+        bloquear_recursos(self.navegador)
+
+    def copiar(self, ruta_origen: str, id_persona: int) -> Optional[str]:
+        """
+        Reutiliza una captura existente para otra persona.
+
+        Args:
+            ruta_origen: Ruta de la captura a reutilizar
+            id_persona: ID de la persona para nombrar el archivo
+
+        Returns:
+            Ruta del archivo copiado o None si falla
+        """
+        return copiar_captura(ruta_origen, self.directorio, id_persona)
+
     def capturar_elemento(
         self,
         elemento,
@@ -152,3 +220,68 @@ class CapturaPantalla:
 
         except Exception:
             return eliminados
+
+
+class CapturaHtml:
+    """
+    Gestor de evidencias para búsquedas sin navegador: guarda el HTML de
+    la respuesta con el mismo nombre que tendría la captura de pantalla.
+    """
+
+    def __init__(self, buscador):
+        """
+        Inicializa el gestor de evidencias HTML.
+
+        Args:
+            buscador: Buscador con método capturar_pantalla(ruta) que guarda el HTML
+        """
+        self.buscador = buscador
+        self.config = Configuracion()
+        self.directorio = self.config.directorio_capturas
+
+        if not os.path.exists(self.directorio):
+            os.makedirs(self.directorio)
+
+    def capturar(
+        self,
+        id_persona: int,
+        sufijo: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Guarda el HTML de la última búsqueda como evidencia.
+
+        Args:
+            id_persona: ID de la persona para nombrar el archivo
+            sufijo: Sufijo adicional para el nombre (opcional)
+
+        Returns:
+            Ruta del archivo guardado o None si falla
+        """
+        fecha = datetime.now().strftime(FORMATO_FECHA_CAPTURA)
+        nombre_base = FORMATO_NOMBRE_CAPTURA.format(
+            fecha=fecha,
+            id_persona=id_persona
+        )
+
+        if sufijo:
+            nombre_base = nombre_base.replace('.png', f'_{sufijo}.png')
+
+        nombre_base = nombre_base.replace('.png', '.html')
+        ruta_completa = os.path.join(self.directorio, nombre_base)
+
+        if self.buscador.capturar_pantalla(ruta_completa):
+            return ruta_completa
+        return None
+
+    def copiar(self, ruta_origen: str, id_persona: int) -> Optional[str]:
+        """
+        Reutiliza una evidencia existente para otra persona.
+
+        Args:
+            ruta_origen: Ruta de la evidencia a reutilizar
+            id_persona: ID de la persona para nombrar el archivo
+
+        Returns:
+            Ruta del archivo copiado o None si falla
+        """
+        return copiar_captura(ruta_origen, self.directorio, id_persona)
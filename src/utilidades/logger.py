@@ -90,11 +90,19 @@ def escribir_resumen(estadisticas: dict) -> str:
 
     fecha_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+    paises_no_resueltos = estadisticas.get('paises_no_resueltos') or {}
+    lineas_paises = '\n'.join(
+        f"  - {pais}: {cantidad} personas (buscadas sin filtro de país)"
+        for pais, cantidad in sorted(paises_no_resueltos.items())
+    ) or "  - Ninguno"
+
     contenido = f"""
 {'=' * 60}
 RESUMEN DE EJECUCIÓN RPA OFAC
 {'=' * 60}
 Fecha y hora: {fecha_hora}
+Ejecución: {estadisticas.get('id_ejecucion') or '-'}{' (reanudada)' if estadisticas.get('reanudada') else ''}
+Nodo: {estadisticas.get('nodo') or '-'}{f" ({estadisticas.get('busquedas_nodo', 0)} búsquedas propias; totales de todos los nodos)" if estadisticas.get('nodo') else ''}
 {'=' * 60}
 
 ESTADÍSTICAS:
@@ -104,6 +112,22 @@ ESTADÍSTICAS:
   - No cruzan con maestra:      {estadisticas.get('no_cruzan_maestra', 0)}
   - Información incompleta:     {estadisticas.get('informacion_incompleta', 0)}
   - Errores:                    {estadisticas.get('errores', 0)}
+  - Búsquedas evitadas:         {estadisticas.get('busquedas_ahorradas', 0)}
+  - Coincidencias guardadas:    {estadisticas.get('coincidencias_guardadas', 0)}
+  - Coincidencias no guardadas: {estadisticas.get('coincidencias_fallidas', 0)}
+
+CACHÉ DE BÚSQUEDAS:
+  - Aciertos:                   {estadisticas.get('cache_aciertos', 0)}
+  - Fallos:                     {estadisticas.get('cache_fallos', 0)}
+
+PAÍSES SIN OPCIÓN EN OFAC:
+{lineas_paises}
+
+POOL DE CONEXIONES:
+  - Conexiones entregadas:      {estadisticas.get('pool_tomas', 0)}
+  - Esperas por conexión:       {estadisticas.get('pool_esperas', 0)}
+  - Tiempo total de espera (s): {estadisticas.get('pool_tiempo_espera', 0)}
+  - Máximo en uso a la vez:     {estadisticas.get('pool_max_en_uso', 0)}
 
 {'=' * 60}
 FIN DEL RESUMEN
@@ -0,0 +1,30 @@
+"""
+Normalización de textos para comparar nombres, direcciones y países.
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+_ESPACIOS = re.compile(r'\s+')
+
+
+def normalizar_texto(valor: Optional[str]) -> str:
+    """
+    Normaliza un texto para compararlo sin importar tildes, mayúsculas
+    ni espacios repetidos.
+
+    Args:
+        valor: Texto a normalizar (None se trata como cadena vacía)
+
+    Returns:
+        Texto sin diacríticos, en minúsculas y con espacios colapsados
+    """
+    if valor is None:
+        return ''
+
+    texto = unicodedata.normalize('NFKD', str(valor))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = texto.casefold()
+
+    return _ESPACIOS.sub(' ', texto).strip()
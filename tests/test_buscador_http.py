@@ -0,0 +1,196 @@
+"""
+Pruebas para el buscador OFAC por HTTP.
+Usa un servidor local que sirve una copia del formulario ASP.NET de OFAC.
+"""
+
+import unittest
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scraping.buscador_http import BuscadorOfacHttp
+
+
+FORMULARIO_OFAC = """<!DOCTYPE html>
+<html>
+<body>
+<form method="post" action="./" id="aspnetForm">
+<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />
+<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="" />
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />
+<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="CA0B0334" />
+<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="{validacion}" />
+<select name="ctl00$MainContent$ddlType" id="ctl00_MainContent_ddlType">
+  <option selected="selected" value="">All</option>
+  <option value="Individual">Individual</option>
+</select>
+<input name="ctl00$MainContent$txtAddress" type="text" id="ctl00_MainContent_txtAddress" />
+<input name="ctl00$MainContent$txtLastName" type="text" id="ctl00_MainContent_txtLastName" />
+<input name="ctl00$MainContent$txtCity" type="text" id="ctl00_MainContent_txtCity" />
+<select name="ctl00$MainContent$ddlCountry" id="ctl00_MainContent_ddlCountry">
+  <option selected="selected" value="">All</option>
+  <option value="Colombia">Colombia</option>
+  <option value="Niger">Niger</option>
+  <option value="Nigeria">Nigeria</option>
+</select>
+<input type="hidden" name="ctl00$MainContent$Slider1_Boundcontrol" value="100" />
+<input type="submit" name="ctl00$MainContent$btnSearch" value="Search" id="ctl00_MainContent_btnSearch" />
+<input type="submit" name="ctl00$MainContent$btnReset" value="Reset" id="ctl00_MainContent_btnReset" />
+{resultados}
+</form>
+</body>
+</html>
+"""
+
+# Nombres que el servidor local reconoce como sancionados, con su país
+SANCIONADOS = [
+    ("PABLO ESCOBAR", "Colombia"),
+    ("PABLO ESCOBAR", "Colombia"),
+    ("JUAN PEREZ", "Nigeria"),
+]
+
+
+class _ServidorOfacLocal(BaseHTTPRequestHandler):
+    """Servidor que imita el postback del sitio OFAC."""
+
+    contador = 0
+    peticiones = []
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        self._responder("")
+
+    def do_POST(self):
+        longitud = int(self.headers.get('Content-Length', 0))
+        datos = parse_qs(self.rfile.read(longitud).decode('utf-8'), keep_blank_values=True)
+        type(self).peticiones.append(datos)
+
+        viewstate_esperado = f"VS{type(self).contador}"
+        if datos.get('__VIEWSTATE', [''])[0] != viewstate_esperado or \
+                datos.get('__EVENTVALIDATION', [''])[0] != f"EV{type(self).contador}":
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        nombre = datos.get('ctl00$MainContent$txtLastName', [''])[0].upper()
+        pais = datos.get('ctl00$MainContent$ddlCountry', [''])[0]
+        coincidencias = [
+            (n, p) for n, p in SANCIONADOS
+            if nombre and nombre in n and (not pais or pais == p)
+        ]
+        filas = ''.join(
+            f'<tr><td><a href="Details.aspx?id={i}">{n}</a></td><td>{p}</td>'
+            f'<td>Individual</td><td>SDNTK, ILLICIT-DRUGS</td><td>SDN</td><td>100</td></tr>'
+            for i, (n, p) in enumerate(coincidencias)
+        )
+        self._responder(
+            f'<span id="ctl00_MainContent_lbResults">{len(coincidencias)} Found</span>'
+            f'<table id="gvSearchResults">{filas}</table>'
+        )
+
+    def _responder(self, resultados):
+        type(self).contador += 1
+        cuerpo = FORMULARIO_OFAC.format(
+            viewstate=f"VS{type(self).contador}",
+            validacion=f"EV{type(self).contador}",
+            resultados=resultados
+        ).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+class TestBuscadorOfacHttp(unittest.TestCase):
+    """Pruebas del backend HTTP contra el servidor local."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Levanta el servidor local en un puerto libre."""
+        cls.servidor = ThreadingHTTPServer(('127.0.0.1', 0), _ServidorOfacLocal)
+        cls.hilo = threading.Thread(target=cls.servidor.serve_forever, daemon=True)
+        cls.hilo.start()
+        cls.url = f"http://127.0.0.1:{cls.servidor.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Detiene el servidor local."""
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+    def setUp(self):
+        _ServidorOfacLocal.peticiones = []
+        self.buscador = BuscadorOfacHttp(url_ofac=self.url, tiempo_espera=5)
+
+    def tearDown(self):
+        self.buscador.cerrar()
+
+    def test_navegar_a_ofac(self):
+        """Verifica que se descarga el formulario."""
+        self.assertTrue(self.buscador.navegar_a_ofac())
+
+    def test_buscar_persona_con_resultados(self):
+        """Verifica el conteo 'X Found' y el filtro por país."""
+        self.buscador.navegar_a_ofac()
+        resultado = self.buscador.buscar_persona(
+            nombre="Pablo Escobar",
+            direccion="Calle 1",
+            pais="Colombia"
+        )
+        self.assertTrue(resultado.exito)
+        self.assertEqual(resultado.cantidad_resultados, 2)
+
+        datos = _ServidorOfacLocal.peticiones[-1]
+        self.assertEqual(datos['ctl00$MainContent$txtAddress'], ['Calle 1'])
+        self.assertIn('ctl00$MainContent$btnSearch', datos)
+        self.assertNotIn('ctl00$MainContent$btnReset', datos)
+        self.assertEqual(datos['ctl00$MainContent$Slider1_Boundcontrol'], ['100'])
+
+    def test_buscar_persona_extrae_coincidencias(self):
+        """Verifica que se leen las filas de la grilla de resultados."""
+        self.buscador.extraer_coincidencias = True
+        self.buscador.navegar_a_ofac()
+        resultado = self.buscador.buscar_persona(nombre="Juan Perez")
+
+        self.assertEqual(resultado.cantidad_resultados, 1)
+        self.assertEqual(len(resultado.coincidencias), 1)
+        coincidencia = resultado.coincidencias[0]
+        self.assertEqual(coincidencia.nombre, "JUAN PEREZ")
+        self.assertEqual(coincidencia.direccion, "Nigeria")
+        self.assertEqual(coincidencia.programas, ["SDNTK", "ILLICIT-DRUGS"])
+        self.assertEqual(coincidencia.puntaje, 100)
+
+    def test_busquedas_consecutivas_reutilizan_estado(self):
+        """Verifica que cada POST usa el __VIEWSTATE de la respuesta anterior."""
+        self.buscador.navegar_a_ofac()
+        primera = self.buscador.buscar_persona(nombre="Juan Perez", pais="Nigeria")
+        segunda = self.buscador.buscar_persona(nombre="NombreInexistenteXYZ123")
+
+        self.assertTrue(primera.exito)
+        self.assertEqual(primera.cantidad_resultados, 1)
+        self.assertTrue(segunda.exito)
+        self.assertEqual(segunda.cantidad_resultados, 0)
+
+    def test_capturar_pantalla_guarda_html(self):
+        """Verifica que la evidencia es el HTML de la última respuesta."""
+        import tempfile
+
+        self.buscador.navegar_a_ofac()
+        self.buscador.buscar_persona(nombre="Pablo Escobar")
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "evidencia.html")
+            self.assertTrue(self.buscador.capturar_pantalla(ruta))
+            with open(ruta, encoding='utf-8') as archivo:
+                self.assertIn("2 Found", archivo.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
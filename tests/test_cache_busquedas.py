@@ -0,0 +1,252 @@
+"""
+Pruebas para la caché persistente de búsquedas OFAC.
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scraping.buscador_ofac import ResultadoBusqueda
+from src.scraping.cache_busquedas import (
+    CacheBusquedas,
+    BuscadorConCache,
+    NOMBRE_ARCHIVO_CACHE,
+    clave_busqueda
+)
+from src.scraping.resultados_ofac import CoincidenciaOfac
+
+
+class _BuscadorFalso:
+    """Buscador que cuenta las búsquedas reales que recibe."""
+
+    def __init__(self, cantidad, coincidencias=()):
+        self.cantidad = cantidad
+        self.coincidencias = list(coincidencias)
+        self.busquedas = 0
+
+    def navegar_a_ofac(self):
+        return True
+
+    def buscar_persona(self, nombre, direccion=None, pais=None):
+        self.busquedas += 1
+        return ResultadoBusqueda(
+            exito=True,
+            cantidad_resultados=self.cantidad,
+            coincidencias=list(self.coincidencias)
+        )
+
+    def capturar_pantalla(self, ruta_archivo):
+        return True
+
+
+class TestCacheBusquedas(unittest.TestCase):
+    """Pruebas de la caché de búsquedas."""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.cache = CacheBusquedas(
+            directorio=self.directorio.name,
+            ttl_segundos=3600,
+            ttl_sin_resultados_segundos=3600,
+            max_entradas=2
+        )
+
+    def tearDown(self):
+        self.cache.cerrar()
+        self.directorio.cleanup()
+
+    def test_clave_normalizada(self):
+        """Verifica que la clave ignora mayúsculas, tildes y espacios."""
+        self.assertEqual(
+            clave_busqueda("José  Pérez", "Calle 1", "Perú"),
+            clave_busqueda("JOSE PEREZ", " calle 1 ", "peru")
+        )
+
+    def test_acierto_sin_resultados(self):
+        """Verifica que la segunda búsqueda igual no llega al sitio."""
+        falso = _BuscadorFalso(cantidad=0)
+        buscador = BuscadorConCache(falso, self.cache)
+
+        buscador.buscar_persona("Juan Perez", "Calle 1", "Peru")
+        resultado = buscador.buscar_persona("JUAN PEREZ", "calle 1", "Perú")
+
+        self.assertEqual(falso.busquedas, 1)
+        self.assertTrue(resultado.desde_cache)
+        self.assertEqual(self.cache.aciertos, 1)
+        self.assertEqual(self.cache.fallos, 1)
+
+    def test_coincidencias_requieren_evidencia(self):
+        """Verifica que un resultado con coincidencias solo se reutiliza con evidencia."""
+        falso = _BuscadorFalso(cantidad=2)
+        buscador = BuscadorConCache(falso, self.cache)
+
+        buscador.buscar_persona("Pablo Escobar", "Calle 1", "Colombia")
+        buscador.buscar_persona("Pablo Escobar", "Calle 1", "Colombia")
+        self.assertEqual(falso.busquedas, 2)
+
+        ruta = os.path.join(self.directorio.name, "evidencia.png")
+        open(ruta, 'wb').close()
+        buscador.registrar_evidencia("Pablo Escobar", "Calle 1", "Colombia", ruta)
+
+        resultado = buscador.buscar_persona("Pablo Escobar", "Calle 1", "Colombia")
+        self.assertEqual(falso.busquedas, 2)
+        self.assertEqual(resultado.cantidad_resultados, 2)
+        self.assertEqual(resultado.ruta_evidencia, ruta)
+
+    def test_ttl_vencido(self):
+        """Verifica que las entradas vencidas no se reutilizan."""
+        self.cache.ttl_sin_resultados_segundos = -1
+        self.cache.guardar("Juan", None, None, ResultadoBusqueda(exito=True))
+        self.assertIsNone(self.cache.obtener("Juan"))
+
+    def test_desalojo_lru(self):
+        """Verifica que se desaloja la entrada menos usada al superar el límite."""
+        for nombre in ("Ana", "Beto"):
+            self.cache.guardar(nombre, None, None, ResultadoBusqueda(exito=True))
+            time.sleep(0.01)
+
+        self.assertIsNotNone(self.cache.obtener("Ana"))
+        self.cache.guardar("Carla", None, None, ResultadoBusqueda(exito=True))
+
+        self.assertIsNotNone(self.cache.obtener("Ana"))
+        self.assertIsNone(self.cache.obtener("Beto"))
+        self.assertIsNotNone(self.cache.obtener("Carla"))
+
+    def test_escrituras_no_cuentan_la_tabla(self):
+        """Verifica que guardar lleva la cuenta de entradas sin recorrer la tabla."""
+        consultas = []
+        self.cache._conexion.set_trace_callback(consultas.append)
+
+        for nombre in ("Ana", "Ana", "Beto", "Carla"):
+            self.cache.guardar(nombre, None, None, ResultadoBusqueda(exito=True))
+            time.sleep(0.01)
+
+        self.assertFalse([c for c in consultas if "COUNT(" in c])
+        total = self.cache._conexion.execute("SELECT COUNT(*) FROM busquedas").fetchone()[0]
+        self.assertEqual(self.cache._entradas, total)
+        self.assertEqual(total, 2)
+        self.assertIsNone(self.cache.obtener("Ana"))
+
+    def test_cuenta_inicial_de_un_archivo_existente(self):
+        """Verifica que al reabrir la caché se parte de las entradas ya guardadas."""
+        self.cache.guardar("Ana", None, None, ResultadoBusqueda(exito=True))
+        self.cache.cerrar()
+
+        self.cache = CacheBusquedas(self.directorio.name, 3600, 3600, max_entradas=2)
+
+        self.assertEqual(self.cache._entradas, 1)
+
+
+class TestCacheCoincidencias(unittest.TestCase):
+    """Pruebas de las filas de la grilla guardadas en la caché."""
+
+    COINCIDENCIAS = [
+        CoincidenciaOfac("ESCOBAR, Pablo", "Medellín", "Individual", ["SDNTK", "SDNT"], "SDN", 100),
+        CoincidenciaOfac("ESCOBAR GAVIRIA, Pablo", puntaje=92),
+    ]
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.evidencia = os.path.join(self.directorio.name, "evidencia.png")
+        open(self.evidencia, 'wb').close()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def _cache(self, requiere_coincidencias=True):
+        cache = CacheBusquedas(
+            directorio=self.directorio.name,
+            ttl_segundos=3600,
+            ttl_sin_resultados_segundos=3600,
+            max_entradas=10,
+            requiere_coincidencias=requiere_coincidencias
+        )
+        self.addCleanup(cache.cerrar)
+        return cache
+
+    def _buscar_dos_veces(self, cache, falso):
+        buscador = BuscadorConCache(falso, cache)
+        buscador.buscar_persona("Pablo Escobar", "Calle 1", "Colombia")
+        buscador.registrar_evidencia("Pablo Escobar", "Calle 1", "Colombia", self.evidencia)
+        return buscador.buscar_persona("Pablo Escobar", "Calle 1", "Colombia")
+
+    def test_acierto_trae_las_coincidencias(self):
+        """Verifica que un acierto devuelve las mismas filas que la búsqueda real."""
+        falso = _BuscadorFalso(cantidad=2, coincidencias=self.COINCIDENCIAS)
+
+        resultado = self._buscar_dos_veces(self._cache(), falso)
+
+        self.assertEqual(falso.busquedas, 1)
+        self.assertTrue(resultado.desde_cache)
+        self.assertEqual(resultado.coincidencias, self.COINCIDENCIAS)
+
+    def test_sin_filas_guardadas_vuelve_a_buscar(self):
+        """Verifica que una entrada guardada sin extraer filas no es acierto si se requieren."""
+        falso = _BuscadorFalso(cantidad=2)
+        cache = self._cache(requiere_coincidencias=False)
+        BuscadorConCache(falso, cache).buscar_persona("Pablo Escobar", "Calle 1", "Colombia")
+        cache.registrar_evidencia("Pablo Escobar", "Calle 1", "Colombia", self.evidencia)
+        cache.cerrar()
+
+        resultado = BuscadorConCache(falso, self._cache()).buscar_persona(
+            "Pablo Escobar", "Calle 1", "Colombia"
+        )
+
+        self.assertEqual(falso.busquedas, 2)
+        self.assertFalse(resultado.desde_cache)
+
+    def test_grilla_vacia_extraida_es_acierto(self):
+        """Verifica que una grilla leída sin filas se guarda y se reutiliza."""
+        falso = _BuscadorFalso(cantidad=2)
+
+        resultado = self._buscar_dos_veces(self._cache(), falso)
+
+        self.assertEqual(falso.busquedas, 1)
+        self.assertTrue(resultado.desde_cache)
+        self.assertEqual(resultado.coincidencias, [])
+
+    def test_sin_requerir_coincidencias_reutiliza_el_conteo(self):
+        """Verifica que sin extracción de filas basta con el conteo y la evidencia."""
+        falso = _BuscadorFalso(cantidad=2)
+
+        resultado = self._buscar_dos_veces(self._cache(requiere_coincidencias=False), falso)
+
+        self.assertEqual(falso.busquedas, 1)
+        self.assertEqual(resultado.coincidencias, [])
+
+    def test_archivo_anterior_sin_columna_de_coincidencias(self):
+        """Verifica que un archivo de caché anterior se amplía al abrirlo."""
+        conexion = sqlite3.connect(os.path.join(self.directorio.name, NOMBRE_ARCHIVO_CACHE))
+        conexion.execute("""
+            CREATE TABLE busquedas (
+                clave TEXT PRIMARY KEY,
+                cantidad_resultados INTEGER NOT NULL,
+                expira REAL NOT NULL,
+                ultimo_acceso REAL NOT NULL,
+                ruta_evidencia TEXT
+            )
+        """)
+        conexion.execute(
+            "INSERT INTO busquedas VALUES (?, 2, ?, 0, ?)",
+            (clave_busqueda("Pablo Escobar"), time.time() + 3600, self.evidencia)
+        )
+        conexion.commit()
+        conexion.close()
+
+        cache = self._cache()
+
+        self.assertIsNone(cache.obtener("Pablo Escobar"))
+        cache.guardar("Pablo Escobar", None, None, ResultadoBusqueda(
+            exito=True, cantidad_resultados=2, coincidencias=self.COINCIDENCIAS
+        ))
+        cache.registrar_evidencia("Pablo Escobar", None, None, self.evidencia)
+        self.assertEqual(cache.obtener("Pablo Escobar").coincidencias, self.COINCIDENCIAS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Pruebas del gestor del ciclo de vida del navegador con navegadores
+simulados: reciclado, reconstrucción de la sesión y recuperación cuando
+no se puede abrir un navegador nuevo.
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scraping import ciclo_vida
+from src.scraping.buscador_ofac import ResultadoBusqueda
+from src.scraping.ciclo_vida import GestorNavegador
+
+
+class _NavegadorFalso:
+    def __init__(self):
+        self.vivo = True
+        self.cerrado = False
+
+    def execute_script(self, script):
+        if not self.vivo:
+            raise RuntimeError("invalid session id")
+        return 1
+
+
+class _BuscadorFalso:
+    def __init__(self, navegador):
+        self.navegador = navegador
+
+    def navegar_a_ofac(self):
+        return True
+
+    def buscar_persona(self, nombre, direccion=None, pais=None):
+        return ResultadoBusqueda(exito=self.navegador.vivo, cantidad_resultados=1)
+
+
+class _FabricaNavegadores:
+    """Crea navegadores falsos; cada True de `fallos` hace fallar una creación."""
+
+    def __init__(self, fallos=()):
+        self.fallos = list(fallos)
+        self.creados = []
+        self.cerrados = []
+
+    def crear(self, headless=None):
+        if self.fallos and self.fallos.pop(0):
+            raise RuntimeError("chrome not reachable")
+        navegador = _NavegadorFalso()
+        self.creados.append(navegador)
+        return navegador
+
+    def cerrar(self, navegador):
+        if navegador is not None:
+            navegador.cerrado = True
+            self.cerrados.append(navegador)
+
+
+class TestGestorNavegador(unittest.TestCase):
+    """Pruebas del reciclado y la reconstrucción del navegador."""
+
+    def setUp(self):
+        nombres = (
+            'crear_navegador_independiente', 'cerrar_navegador_independiente',
+            'BuscadorOfac', 'CapturaPantalla', 'TIEMPO_ENTRE_REINTENTOS'
+        )
+        self._originales = {nombre: getattr(ciclo_vida, nombre) for nombre in nombres}
+        self.fabrica = _FabricaNavegadores()
+        ciclo_vida.crear_navegador_independiente = lambda headless: self.fabrica.crear(headless)
+        ciclo_vida.cerrar_navegador_independiente = lambda nav: self.fabrica.cerrar(nav)
+        ciclo_vida.BuscadorOfac = _BuscadorFalso
+        ciclo_vida.CapturaPantalla = lambda navegador: object()
+        ciclo_vida.TIEMPO_ENTRE_REINTENTOS = 0
+
+    def tearDown(self):
+        for nombre, valor in self._originales.items():
+            setattr(ciclo_vida, nombre, valor)
+
+    def _gestor(self, max_busquedas=0):
+        gestor = GestorNavegador.__new__(GestorNavegador)
+        gestor.independiente = True
+        gestor.headless = None
+        gestor.max_busquedas = max_busquedas
+        gestor.max_memoria_mb = 0
+        gestor.intervalo_medicion = 25
+        gestor.navegador = None
+        gestor.buscador = None
+        gestor.captura = None
+        gestor.busquedas_sesion = 0
+        gestor.reinicios = 0
+        gestor._abrir()
+        return gestor
+
+    def test_recicla_al_llegar_al_maximo_de_busquedas(self):
+        gestor = self._gestor(max_busquedas=2)
+
+        for _ in range(3):
+            self.assertTrue(gestor.buscar_persona("Ana").exito)
+
+        self.assertEqual(len(self.fabrica.creados), 2)
+        self.assertTrue(self.fabrica.creados[0].cerrado)
+        self.assertEqual(gestor.reinicios, 1)
+        self.assertEqual(gestor.busquedas_sesion, 1)
+
+    def test_sesion_perdida_reconstruye_y_repite(self):
+        gestor = self._gestor()
+        gestor.navegador.vivo = False
+
+        resultado = gestor.buscar_persona("Ana")
+
+        self.assertTrue(resultado.exito)
+        self.assertEqual(gestor.reinicios, 1)
+        self.assertEqual(len(self.fabrica.creados), 2)
+
+    def test_reintenta_abrir_con_espera(self):
+        gestor = self._gestor(max_busquedas=1)
+        gestor.buscar_persona("Ana")
+        self.fabrica.fallos = [True, False]
+
+        self.assertTrue(gestor.buscar_persona("Luis").exito)
+        self.assertEqual(len(self.fabrica.creados), 2)
+
+    def test_se_recupera_tras_no_poder_reabrir(self):
+        gestor = self._gestor()
+        gestor.navegador.vivo = False
+        self.fabrica.fallos = [True] * ciclo_vida.MAX_REINTENTOS
+
+        with self.assertRaises(RuntimeError):
+            gestor.buscar_persona("Ana")
+        self.assertIsNone(gestor.buscador)
+
+        # La búsqueda siguiente vuelve a abrir el navegador en lugar de fallar siempre
+        resultado = gestor.buscar_persona("Luis")
+
+        self.assertTrue(resultado.exito)
+        self.assertIsNotNone(gestor.buscador)
+        self.assertEqual(len(self.fabrica.creados), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Pruebas de la cola de trabajo compartida con una conexión simulada:
+qué reservas renueva el latido y cuándo deja de renovarlas.
+"""
+
+import unittest
+import sys
+import os
+import threading
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.base_datos import cola_trabajo
+from src.base_datos.cola_trabajo import ColaTrabajo
+from src.base_datos.repositorio_resultados import Resultado
+from src.config.constantes import COLA_EN_CURSO, COLA_FALLIDA, COLA_PENDIENTE
+from src.servicios.servicio_procesamiento import ServicioProcesamiento
+
+
+class _CursorFalso:
+    def __init__(self, base):
+        self.base = base
+        self.rowcount = 0
+
+    def execute(self, consulta, params=None):
+        if self.base.caida:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.base.consultas.append((' '.join(consulta.split()), params))
+
+    def fetchall(self):
+        filas, self.base.filas = self.base.filas, []
+        return filas
+
+    def close(self):
+        pass
+
+
+class _BaseFalsa:
+    """Registra las consultas y devuelve las filas preparadas para el próximo reclamo."""
+
+    def __init__(self):
+        self.consultas = []
+        self.filas = []
+        self.caida = False
+
+    def cursor(self):
+        return _CursorFalso(self)
+
+    def commit(self):
+        pass
+
+    @contextmanager
+    def conexion_bd(self):
+        yield self
+
+    def consultas_con(self, texto):
+        return [params for consulta, params in self.consultas if texto in consulta]
+
+
+def _fila(id_persona):
+    return (id_persona, id_persona, f"Persona {id_persona}", "Calle 1", "Colombia")
+
+
+class TestColaTrabajo(unittest.TestCase):
+    """Pruebas del seguimiento de reservas en curso del nodo."""
+
+    def setUp(self):
+        self.base = _BaseFalsa()
+        self._conexion_original = cola_trabajo.conexion_bd
+        cola_trabajo.conexion_bd = self.base.conexion_bd
+        self.cola = ColaTrabajo(nodo="nodo-1", reserva_segundos=60, max_intentos=3)
+
+    def tearDown(self):
+        cola_trabajo.conexion_bd = self._conexion_original
+
+    def _reclamar(self, *ids):
+        self.base.filas = [_fila(i) for i in ids]
+        return self.cola.reclamar(len(ids))
+
+    def test_reclamar_registra_personas_en_curso(self):
+        personas = self._reclamar(3, 1, 2)
+
+        self.assertEqual([p.id_persona for p in personas], [1, 2, 3])
+        self.assertEqual(self.cola.en_curso(), [1, 2, 3])
+
+    def test_renovar_solo_personas_en_curso(self):
+        self._reclamar(1, 2, 3)
+        self.cola.completar([1])
+        self.cola.fallar(2, "timeout")
+
+        self.cola.renovar()
+
+        renovaciones = self.base.consultas_con('SET "venceEn" = now()')
+        self.assertEqual(renovaciones, [(60, "nodo-1", COLA_EN_CURSO, [3])])
+
+    def test_sin_personas_en_curso_no_renueva(self):
+        self.assertEqual(self.cola.renovar(), 0)
+        self.assertEqual(self.base.consultas, [])
+
+    def test_completar_fallido_deja_de_renovar(self):
+        self._reclamar(1, 2)
+        self.base.caida = True
+
+        with self.assertRaises(RuntimeError):
+            self.cola.completar([1, 2])
+
+        # Sin latido la reserva vence y el reclamo siguiente la cierra como hecha
+        self.assertEqual(self.cola.en_curso(), [])
+
+    def test_fallar_fallido_deja_de_renovar(self):
+        self._reclamar(1, 2)
+        self.base.caida = True
+
+        with self.assertRaises(RuntimeError):
+            self.cola.fallar(1, "error")
+
+        self.assertEqual(self.cola.en_curso(), [2])
+
+    def test_fallar_devuelve_pendiente_o_fallida_segun_intentos(self):
+        self._reclamar(7)
+
+        self.cola.fallar(7, "x" * 600)
+
+        (params,) = self.base.consultas_con('"ultimoError" = %s')
+        self.assertEqual(params[:3], (3, COLA_FALLIDA, COLA_PENDIENTE))
+        self.assertEqual(len(params[3]), 500)
+        self.assertEqual(params[4:], (7, "nodo-1", COLA_EN_CURSO))
+
+    def test_liberar_vacia_personas_en_curso(self):
+        self._reclamar(1, 2)
+
+        self.cola.liberar()
+
+        self.assertEqual(self.cola.en_curso(), [])
+
+    def test_reclamar_cierra_vencidas_antes_de_reclamar(self):
+        self._reclamar(1)
+
+        consultas = [consulta for consulta, _ in self.base.consultas]
+        self.assertIn('"venceEn" < now() AND', consultas[0])
+        self.assertIn("FOR UPDATE SKIP LOCKED", consultas[1])
+
+
+class _ColaFalsa:
+    def __init__(self):
+        self.fallidas = []
+        self.completadas = []
+
+    def fallar(self, id_persona, error=""):
+        self.fallidas.append(id_persona)
+
+    def completar(self, ids_persona):
+        self.completadas.extend(ids_persona)
+        raise RuntimeError("server closed the connection unexpectedly")
+
+
+class TestServicioConCola(unittest.TestCase):
+    """Pruebas de cómo el servicio cierra en la cola los resultados escritos o descartados."""
+
+    def setUp(self):
+        self.servicio = ServicioProcesamiento.__new__(ServicioProcesamiento)
+        self.servicio._cola_trabajo = _ColaFalsa()
+        self.servicio._coincidencias_pendientes = {1: ["detalle"], 2: ["detalle"]}
+        self.servicio._bloqueo_coincidencias = threading.Lock()
+        self.servicio._coincidencias_guardadas = 0
+        self.servicio._coincidencias_fallidas = 0
+
+    def test_resultados_no_guardados_vuelven_a_la_cola(self):
+        lote = [Resultado(id_persona=1, nombre_persona="Ana"),
+                Resultado(id_persona=2, nombre_persona="Luis")]
+
+        self.servicio._al_fallar_resultados(lote)
+
+        self.assertEqual(self.servicio._cola_trabajo.fallidas, [1, 2])
+        self.assertEqual(self.servicio._coincidencias_pendientes, {})
+
+    def test_error_al_completar_no_interrumpe_el_volcado(self):
+        self.servicio._coincidencias_pendientes = {}
+
+        with self.assertLogs('src.servicios.servicio_procesamiento', level='ERROR') as registro:
+            self.servicio._al_volcar_resultados([Resultado(id_persona=3, nombre_persona="Bea")])
+
+        self.assertEqual(self.servicio._cola_trabajo.completadas, [3])
+        self.assertIn("No se pudieron completar 1 personas en la cola", registro.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Pruebas para el escritor de resultados por lotes.
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.base_datos.escritor_resultados import EscritorResultados
+from src.base_datos.repositorio_resultados import Resultado
+
+
+class _RepositorioFalso:
+    """Repositorio que guarda en memoria los lotes recibidos."""
+
+    def __init__(self, fallar=False, rechazar=()):
+        self.lotes = []
+        self.fallar = fallar
+        self.rechazar = set(rechazar)
+
+    def insertar_lote(self, resultados):
+        if self.fallar:
+            raise RuntimeError("base de datos no disponible")
+        if any(r.id_persona in self.rechazar for r in resultados):
+            raise RuntimeError("duplicate key value violates unique constraint")
+        self.lotes.append(list(resultados))
+        return len(resultados)
+
+
+def _resultado(i):
+    return Resultado(id_persona=i, nombre_persona=f"Persona {i}", estado_transaccion="NOK")
+
+
+class TestEscritorResultados(unittest.TestCase):
+    """Pruebas del volcado por tamaño, por tiempo y al cerrar."""
+
+    def test_vuelca_por_tamano_de_lote(self):
+        repo = _RepositorioFalso()
+        with EscritorResultados(repo, tamano_lote=3, intervalo_segundos=60) as escritor:
+            for i in range(7):
+                escritor.agregar(_resultado(i))
+
+        self.assertEqual([len(lote) for lote in repo.lotes], [3, 3, 1])
+        self.assertEqual(escritor.escritos, 7)
+
+    def test_vuelca_por_intervalo(self):
+        repo = _RepositorioFalso()
+        with EscritorResultados(repo, tamano_lote=100, intervalo_segundos=0.05) as escritor:
+            escritor.agregar(_resultado(1))
+            time.sleep(0.3)
+            self.assertEqual(len(repo.lotes), 1)
+
+    def test_vuelca_pendientes_ante_excepcion(self):
+        repo = _RepositorioFalso()
+        with self.assertRaises(KeyboardInterrupt):
+            with EscritorResultados(repo, tamano_lote=100, intervalo_segundos=60) as escritor:
+                escritor.agregar(_resultado(1))
+                escritor.agregar(_resultado(2))
+                raise KeyboardInterrupt
+
+        self.assertEqual(sum(len(lote) for lote in repo.lotes), 2)
+
+    def test_cola_acotada_bloquea_al_productor(self):
+        repo = _RepositorioFalso()
+        liberar = threading.Event()
+        insertar_original = repo.insertar_lote
+
+        def insertar_lento(resultados):
+            liberar.wait()
+            return insertar_original(resultados)
+
+        repo.insertar_lote = insertar_lento
+        escritor = EscritorResultados(repo, tamano_lote=1, intervalo_segundos=60, capacidad=2)
+        escritor.iniciar()
+
+        productor = threading.Thread(
+            target=lambda: [escritor.agregar(_resultado(i)) for i in range(5)]
+        )
+        productor.start()
+        productor.join(timeout=0.3)
+        self.assertTrue(productor.is_alive())
+
+        liberar.set()
+        productor.join(timeout=5)
+        escritor.cerrar()
+        self.assertEqual(escritor.escritos, 5)
+
+    def test_errores_de_insercion_se_cuentan(self):
+        repo = _RepositorioFalso(fallar=True)
+        with EscritorResultados(repo, tamano_lote=2, intervalo_segundos=60) as escritor:
+            for i in range(3):
+                escritor.agregar(_resultado(i))
+
+        self.assertEqual(escritor.errores, 3)
+        self.assertEqual(escritor.escritos, 0)
+
+    def test_al_volcar_recibe_solo_lotes_insertados(self):
+        volcados = []
+        with EscritorResultados(
+            _RepositorioFalso(), tamano_lote=2, intervalo_segundos=60, al_volcar=volcados.append
+        ) as escritor:
+            for i in range(3):
+                escritor.agregar(_resultado(i))
+
+        self.assertEqual([[r.id_persona for r in lote] for lote in volcados], [[0, 1], [2]])
+
+        volcados.clear()
+        with EscritorResultados(
+            _RepositorioFalso(fallar=True), tamano_lote=2, al_volcar=volcados.append
+        ) as escritor:
+            escritor.agregar(_resultado(1))
+
+        self.assertEqual(volcados, [])
+
+    def test_lote_fallido_se_reintenta_por_fila(self):
+        repo = _RepositorioFalso(rechazar={2})
+        volcados, fallidos = [], []
+        with EscritorResultados(
+            repo, tamano_lote=4, intervalo_segundos=60,
+            al_volcar=volcados.append, al_fallar=fallidos.append
+        ) as escritor:
+            for i in range(4):
+                escritor.agregar(_resultado(i))
+
+        self.assertEqual([[r.id_persona for r in lote] for lote in repo.lotes], [[0], [1], [3]])
+        self.assertEqual([[r.id_persona for r in lote] for lote in volcados], [[0, 1, 3]])
+        self.assertEqual([[r.id_persona for r in lote] for lote in fallidos], [[2]])
+        self.assertEqual(escritor.escritos, 3)
+        self.assertEqual(escritor.errores, 1)
+
+    def test_al_fallar_recibe_todo_si_la_base_no_responde(self):
+        fallidos = []
+        with EscritorResultados(
+            _RepositorioFalso(fallar=True), tamano_lote=3, al_fallar=fallidos.append
+        ) as escritor:
+            for i in range(3):
+                escritor.agregar(_resultado(i))
+
+        self.assertEqual([[r.id_persona for r in lote] for lote in fallidos], [[0, 1, 2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Pruebas de la espera de postbacks con un navegador simulado: el fin del
+postback se detecta aunque la página no se reemplace y el contador
+muestre el mismo texto que en la búsqueda anterior.
+"""
+
+import unittest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from src.config.constantes import SELECTORES_OFAC
+from src.scraping.esperas import MARCA_POSTBACK, PoliticaEspera
+
+
+class _ElementoFalso:
+    def __init__(self, text=""):
+        self.text = text
+        self.obsoleto = False
+
+    def is_enabled(self):
+        if self.obsoleto:
+            raise StaleElementReferenceException("stale element reference")
+        return True
+
+
+class _NavegadorFalso:
+    """Página con un <html> y, opcionalmente, el contador lbResults."""
+
+    def __init__(self, texto_resultados=None):
+        self.html = _ElementoFalso()
+        self.contador = _ElementoFalso(texto_resultados) if texto_resultados is not None else None
+
+    def find_element(self, by, valor):
+        assert (by, valor) == (By.TAG_NAME, "html")
+        return self.html
+
+    def find_elements(self, by, valor):
+        assert (by, valor) == (By.CSS_SELECTOR, SELECTORES_OFAC['resultado_conteo'])
+        return [self.contador] if self.contador else []
+
+    def execute_script(self, script, *args):
+        if script == "return document.readyState":
+            return "complete"
+        selector, marca = args
+        assert selector == SELECTORES_OFAC['resultado_conteo']
+        if self.contador is None:
+            return None
+        self.contador.text = marca
+        return marca
+
+    def postback_parcial(self, texto):
+        """Actualiza solo el panel de resultados, como un UpdatePanel."""
+        self.contador = _ElementoFalso(texto)
+
+    def postback_completo(self, texto):
+        """Reemplaza toda la página."""
+        self.html.obsoleto = True
+        self.html = _ElementoFalso()
+        self.contador = _ElementoFalso(texto)
+
+
+class TestPoliticaEspera(unittest.TestCase):
+    """Pruebas de la detección del fin de un postback."""
+
+    def _esperar(self, navegador, accion, tiempo_espera=5):
+        politica = PoliticaEspera(navegador, tiempo_espera)
+        inicio = time.monotonic()
+        politica.ejecutar_postback(accion, espera_fija=0)
+        return time.monotonic() - inicio
+
+    def test_mismo_conteo_sin_reemplazar_la_pagina_no_espera_el_maximo(self):
+        navegador = _NavegadorFalso("0 Found")
+
+        duracion = self._esperar(navegador, lambda: navegador.postback_parcial("0 Found"))
+
+        self.assertLess(duracion, 1)
+        self.assertEqual(navegador.contador.text, "0 Found")
+
+    def test_pagina_reemplazada(self):
+        navegador = _NavegadorFalso("3 Found")
+
+        duracion = self._esperar(navegador, lambda: navegador.postback_completo("3 Found"))
+
+        self.assertLess(duracion, 1)
+
+    def test_primera_busqueda_sin_contador(self):
+        navegador = _NavegadorFalso()
+
+        duracion = self._esperar(navegador, lambda: navegador.postback_parcial("1 Found"))
+
+        self.assertLess(duracion, 1)
+
+    def test_postback_sin_respuesta_agota_la_espera(self):
+        navegador = _NavegadorFalso("0 Found")
+
+        with self.assertRaises(TimeoutException):
+            self._esperar(navegador, lambda: None, tiempo_espera=0.1)
+        self.assertEqual(navegador.contador.text, MARCA_POSTBACK)
+
+
+if __name__ == '__main__':
+    unittest.main()
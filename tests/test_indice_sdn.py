@@ -0,0 +1,154 @@
+"""
+Pruebas para el cribado local contra la lista SDN.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.listas import BuscadorSdnLocal, IndiceSdn, cargar_lista_sdn
+from src.listas.indice_sdn import trigramas
+
+
+SDN_XML = """<?xml version="1.0" standalone="yes"?>
+<sdnList xmlns="http://tempuri.org/sdnList.xsd">
+  <sdnEntry>
+    <uid>100</uid>
+    <lastName>ESCOBAR GAVIRIA</lastName>
+    <firstName>Pablo Emilio</firstName>
+    <sdnType>Individual</sdnType>
+    <programList><program>SDNT</program></programList>
+    <akaList>
+      <aka><uid>1</uid><type>a.k.a.</type><lastName>EL PATRON</lastName></aka>
+    </akaList>
+    <addressList>
+      <address><uid>5</uid><address1>Calle 10 No. 20</address1><city>Medellin</city><country>Colombia</country></address>
+    </addressList>
+  </sdnEntry>
+  <sdnEntry>
+    <uid>200</uid>
+    <lastName>NIGER TRADING CO</lastName>
+    <sdnType>Entity</sdnType>
+    <programList><program>SDGT</program></programList>
+    <addressList>
+      <address><uid>6</uid><city>Niamey</city><country>Niger</country></address>
+    </addressList>
+  </sdnEntry>
+  <sdnEntry>
+    <uid>300</uid>
+    <lastName>PUTIN</lastName>
+    <firstName>Vladimir Vladimirovich</firstName>
+    <sdnType>Individual</sdnType>
+    <programList><program>RUSSIA-EO14024</program></programList>
+    <addressList>
+      <address><uid>7</uid><city>Moscow</city><country>Russia</country></address>
+    </addressList>
+  </sdnEntry>
+</sdnList>
+"""
+
+SDN_CSV = '100,"ESCOBAR GAVIRIA, Pablo Emilio","individual","SDNT",-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0- ,-0- \n'
+ADD_CSV = '100,5,"Calle 10 No. 20","Medellin","Colombia",-0- \n'
+ALT_CSV = '100,1,"aka","EL PATRON",-0- \n'
+
+
+class TestIndiceSdn(unittest.TestCase):
+    """Pruebas de carga, índice y buscador local."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directorio = tempfile.TemporaryDirectory()
+        cls.ruta_xml = os.path.join(cls.directorio.name, "sdn.xml")
+        with open(cls.ruta_xml, 'w', encoding='utf-8') as archivo:
+            archivo.write(SDN_XML)
+
+        for nombre, contenido in (("sdn.csv", SDN_CSV), ("add.csv", ADD_CSV), ("alt.csv", ALT_CSV)):
+            with open(os.path.join(cls.directorio.name, nombre), 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido)
+
+        cls.indice = IndiceSdn(cargar_lista_sdn(cls.ruta_xml))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directorio.cleanup()
+
+    def test_trigramas_rellenan_el_texto_completo(self):
+        """Verifica que el relleno va en los bordes del texto y no de cada palabra."""
+        self.assertEqual(trigramas("al ba"), {"  a", " al", "al ", "l b", " ba", "ba "})
+
+    def test_cargar_xml(self):
+        """Verifica nombres, alias, programas y países del XML."""
+        entradas = cargar_lista_sdn(self.ruta_xml)
+        self.assertEqual(len(entradas), 3)
+        self.assertEqual(entradas[0].nombre, "ESCOBAR GAVIRIA, Pablo Emilio")
+        self.assertEqual(entradas[0].alias, ["EL PATRON"])
+        self.assertEqual(entradas[0].programas, ["SDNT"])
+        self.assertEqual(entradas[0].paises, ["Colombia"])
+
+    def test_cargar_csv_con_complementos(self):
+        """Verifica que el CSV incorpora direcciones y alias de add/alt."""
+        entradas = cargar_lista_sdn(os.path.join(self.directorio.name, "sdn.csv"))
+        self.assertEqual(len(entradas), 1)
+        self.assertEqual(entradas[0].alias, ["EL PATRON"])
+        self.assertEqual(entradas[0].paises, ["Colombia"])
+
+    def test_buscar_orden_distinto_y_tildes(self):
+        """Verifica que el orden de nombre/apellido y las tildes no importan."""
+        coincidencias = self.indice.buscar("Pablo Emilio Escobar Gavíria")
+        self.assertEqual(len(coincidencias), 1)
+        self.assertEqual(coincidencias[0].entrada.uid, "100")
+
+    def test_buscar_por_alias(self):
+        """Verifica la coincidencia por alias."""
+        self.assertEqual(len(self.indice.buscar("El Patron")), 1)
+
+    def test_filtro_pais_exacto(self):
+        """Verifica que el país se compara completo: Niger no es Nigeria."""
+        self.assertEqual(len(self.indice.buscar("Niger Trading Co", pais="Niger")), 1)
+        self.assertEqual(len(self.indice.buscar("Niger Trading Co", pais="Nigeria")), 0)
+
+    def test_nombre_distinto_sin_coincidencias(self):
+        """Verifica que un nombre ajeno no coincide."""
+        self.assertEqual(self.indice.buscar("NombreInexistenteXYZ123"), [])
+
+    def test_buscador_local(self):
+        """Verifica que el buscador devuelve un ResultadoBusqueda compatible."""
+        buscador = BuscadorSdnLocal(ruta_lista=self.ruta_xml, puntaje_minimo=90)
+        self.assertTrue(buscador.navegar_a_ofac())
+
+        resultado = buscador.buscar_persona(
+            nombre="Pablo Emilio Escobar Gaviria",
+            direccion="Calle 10",
+            pais="Colombia"
+        )
+        self.assertTrue(resultado.exito)
+        self.assertEqual(resultado.cantidad_resultados, 1)
+
+        ruta = os.path.join(self.directorio.name, "evidencia.html")
+        self.assertTrue(buscador.capturar_pantalla(ruta))
+
+    def test_buscador_local_resuelve_pais_en_espanol(self):
+        """Verifica que el país de la maestra se traduce al de la lista antes de filtrar."""
+        buscador = BuscadorSdnLocal(ruta_lista=self.ruta_xml, puntaje_minimo=90)
+
+        for pais in ("Russia", "Rusia", "RUSIA"):
+            resultado = buscador.buscar_persona("Vladimir Vladimirovich Putin", pais=pais)
+            self.assertEqual(resultado.cantidad_resultados, 1, pais)
+
+        resultado = buscador.buscar_persona("Vladimir Vladimirovich Putin", pais="Colombia")
+        self.assertEqual(resultado.cantidad_resultados, 0)
+
+    def test_buscador_local_sin_filtro_si_el_pais_no_se_resuelve(self):
+        """Verifica que un país sin equivalente en la lista no descarta entradas."""
+        buscador = BuscadorSdnLocal(ruta_lista=self.ruta_xml, puntaje_minimo=90)
+
+        resultado = buscador.buscar_persona("Vladimir Vladimirovich Putin", pais="Atlantida")
+
+        self.assertEqual(resultado.cantidad_resultados, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
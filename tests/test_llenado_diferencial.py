@@ -0,0 +1,120 @@
+"""
+Pruebas del llenado diferencial del formulario OFAC: entre búsquedas
+seguidas no se pulsa Reset y solo se escriben los campos que cambian.
+"""
+
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scraping.buscador_ofac import BuscadorOfac, _SCRIPT_ESCRIBIR_CAMPOS
+
+ID_NOMBRE = "ctl00_MainContent_txtLastName"
+ID_DIRECCION = "ctl00_MainContent_txtAddress"
+ID_PAIS = "ctl00_MainContent_ddlCountry"
+
+OPCIONES_DROPDOWN = [["", "All"], ["Colombia", "Colombia"], ["Peru", "Peru"]]
+
+
+class _NavegadorFalso:
+    """Emula el formulario y cuenta las llamadas a execute_script."""
+
+    session_id = "sesion"
+
+    def __init__(self):
+        self.campos = {ID_NOMBRE: "", ID_DIRECCION: "", ID_PAIS: ""}
+        self.scripts = 0
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        if script == _SCRIPT_ESCRIBIR_CAMPOS:
+            campos, solo_cambios = args
+            escritos = 0
+            for id_campo, valor, _ in campos:
+                if solo_cambios and self.campos[id_campo] == valor:
+                    continue
+                self.campos[id_campo] = valor
+                escritos += 1
+            return escritos
+        return OPCIONES_DROPDOWN
+
+
+class _EsperasFalsas:
+    """Cuenta los postbacks y deja el formulario vacío al pulsar Reset."""
+
+    def __init__(self, navegador):
+        self.navegador = navegador
+        self.postbacks = 0
+
+    def buscar_opcional(self, *_):
+        return SimpleNamespace(click=self._reset)
+
+    def _reset(self):
+        for id_campo in self.navegador.campos:
+            self.navegador.campos[id_campo] = ""
+
+    def ejecutar_postback(self, accion, espera_fija=0):
+        self.postbacks += 1
+        accion()
+
+
+def _buscador(diferencial: bool) -> BuscadorOfac:
+    buscador = BuscadorOfac.__new__(BuscadorOfac)
+    buscador.navegador = _NavegadorFalso()
+    buscador.config = SimpleNamespace(
+        selenium=SimpleNamespace(llenado_diferencial=diferencial, llenado_rapido=True),
+        procesamiento=SimpleNamespace(extraer_coincidencias=False)
+    )
+    buscador.esperas = _EsperasFalsas(buscador.navegador)
+    buscador._indice_paises = None
+    buscador._sesion_indice = None
+    buscador.reinicios_formulario = 0
+    buscador.campos_escritos = 0
+    buscador._hacer_clic_buscar = lambda: None
+    buscador._extraer_cantidad_resultados = lambda: 0
+    return buscador
+
+
+BUSQUEDAS = [
+    ("Ana Gómez", "Calle 1", "Colombia"),
+    ("Luis Pérez", "Calle 1", "Colombia"),
+    ("María Ruiz", None, "Colombia"),
+    ("Ana Gómez", "Calle 1", "Perú"),
+]
+
+
+class TestLlenadoDiferencial(unittest.TestCase):
+    """Pruebas del llenado sin Reset."""
+
+    def _buscar_todas(self, buscador):
+        for nombre, direccion, pais in BUSQUEDAS:
+            self.assertTrue(buscador.buscar_persona(nombre, direccion, pais).exito)
+            self.assertEqual(buscador.navegador.campos, {
+                ID_NOMBRE: nombre,
+                ID_DIRECCION: direccion or "",
+                ID_PAIS: "Peru" if pais == "Perú" else pais
+            })
+
+    def test_solo_escribe_campos_distintos(self):
+        buscador = _buscador(diferencial=True)
+        self._buscar_todas(buscador)
+
+        self.assertEqual(buscador.reinicios_formulario, 0)
+        self.assertEqual(buscador.esperas.postbacks, 0)
+        # 3 campos la primera vez, luego nombre, nombre + dirección, nombre + dirección + país
+        self.assertEqual(buscador.campos_escritos, 3 + 1 + 2 + 3)
+
+    def test_sin_diferencial_reinicia_cada_busqueda(self):
+        buscador = _buscador(diferencial=False)
+        self._buscar_todas(buscador)
+
+        self.assertEqual(buscador.reinicios_formulario, len(BUSQUEDAS))
+        self.assertEqual(buscador.esperas.postbacks, len(BUSQUEDAS))
+        self.assertEqual(buscador.campos_escritos, 3 + 3 + 2 + 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Pruebas de la herramienta de migraciones que no requieren base de datos.
+"""
+
+import unittest
+import sys
+import os
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.base_datos import migraciones
+from src.base_datos.cola_trabajo import CONSULTA_RECLAMAR
+from src.base_datos.migraciones import CONSULTAS_REPOSITORIOS, MIGRACIONES, escaneos_secuenciales
+from src.base_datos.repositorio_personas import consulta_pagina
+from src.config.constantes import TABLA_COLA
+
+
+class _CursorFalso:
+    def __init__(self, base):
+        self.base = base
+        self.filas = []
+
+    def execute(self, consulta, params=None):
+        self.base.consultas.append(consulta)
+        if 'HAVING COUNT(*) > 1' in consulta:
+            self.filas = self.base.duplicados
+        elif 'SELECT nombre' in consulta:
+            self.filas = [(m.nombre, 'ayer') for m in MIGRACIONES if m.nombre < "005"]
+        else:
+            self.filas = []
+
+    def fetchall(self):
+        return self.filas
+
+    def fetchone(self):
+        return self.filas[0] if self.filas else None
+
+    def close(self):
+        pass
+
+
+class _BaseFalsa:
+    """Base con las migraciones aplicadas hasta la 004."""
+
+    def __init__(self, duplicados):
+        self.duplicados = duplicados
+        self.consultas = []
+        self.autocommit = False
+
+    def cursor(self):
+        return _CursorFalso(self)
+
+    def commit(self):
+        pass
+
+    @contextmanager
+    def conexion_bd(self):
+        yield self
+
+
+class TestMigraciones(unittest.TestCase):
+    """Pruebas de la definición de migraciones y del análisis de planes."""
+
+    def test_nombres_unicos_y_ordenados(self):
+        nombres = [m.nombre for m in MIGRACIONES]
+        self.assertEqual(len(nombres), len(set(nombres)))
+        self.assertEqual(nombres, sorted(nombres))
+
+    def test_indices_concurrentes_declaran_su_indice(self):
+        for migracion in MIGRACIONES:
+            if any("CONCURRENTLY" in sentencia for sentencia in migracion.sentencias):
+                self.assertTrue(migracion.concurrente, migracion.nombre)
+                self.assertIsNotNone(migracion.indice, migracion.nombre)
+
+    def test_detecta_seq_scan_anidado(self):
+        plan = {
+            "Node Type": "Hash Join",
+            "Plans": [
+                {"Node Type": "Index Scan", "Relation Name": "Personas"},
+                {
+                    "Node Type": "Hash",
+                    "Plans": [{"Node Type": "Seq Scan", "Relation Name": "MaestraDetallePersonas"}]
+                }
+            ]
+        }
+        self.assertEqual(escaneos_secuenciales(plan), ["MaestraDetallePersonas"])
+
+    def test_plan_sin_seq_scan(self):
+        plan = {"Node Type": "Index Only Scan", "Relation Name": "Resultadosuser9145"}
+        self.assertEqual(escaneos_secuenciales(plan), [])
+
+    def test_consultas_con_tantos_parametros_como_marcadores(self):
+        for nombre, (consulta, params) in CONSULTAS_REPOSITORIOS.items():
+            self.assertEqual(consulta.count('%s'), len(params), nombre)
+
+    def test_consultas_tal_como_se_ejecutan(self):
+        consultas = {nombre: consulta for nombre, (consulta, _) in CONSULTAS_REPOSITORIOS.items()}
+
+        self.assertEqual(
+            consultas["personas_validas_pendientes_pagina_siguiente"],
+            consulta_pagina(solo_pendientes=True, solo_validas=True, siguiente=True)
+        )
+        self.assertEqual(consultas["cola_reclamar"], CONSULTA_RECLAMAR)
+        for nombre in ("contar_por_pais", "insertar_no_consultables"):
+            self.assertIn(nombre, consultas)
+
+
+class _CursorPlanes:
+    """Devuelve un plan sin Seq Scan, salvo para la cola, que no existe."""
+
+    def __init__(self, base):
+        self.base = base
+
+    def execute(self, consulta, params=None):
+        self.base.consultas.append(consulta)
+        if consulta.startswith("EXPLAIN") and TABLA_COLA in consulta:
+            raise RuntimeError(f"relation {TABLA_COLA} does not exist")
+
+    def fetchone(self):
+        return ([{"Plan": {"Node Type": "Index Scan", "Relation Name": "Personas"}}],)
+
+    def close(self):
+        pass
+
+
+class TestRevisarPlanes(unittest.TestCase):
+    """Una consulta que no se puede explicar no detiene la revisión."""
+
+    def setUp(self):
+        self._conexion_original = migraciones.conexion_bd
+        self.consultas = []
+        self.rollback = lambda: None
+        migraciones.conexion_bd = self.conexion_bd
+
+    def tearDown(self):
+        migraciones.conexion_bd = self._conexion_original
+
+    def cursor(self):
+        return _CursorPlanes(self)
+
+    @contextmanager
+    def conexion_bd(self):
+        yield self
+
+    def test_consulta_sin_tabla_se_informa_y_sigue(self):
+        hallazgos = migraciones.revisar_planes()
+
+        self.assertEqual(set(hallazgos), set(CONSULTAS_REPOSITORIOS))
+        self.assertIsNone(hallazgos["cola_reclamar"])
+        self.assertEqual(hallazgos["contar_por_pais"], [])
+        self.assertIn("ROLLBACK TO SAVEPOINT explicar", self.consultas)
+
+
+class TestComprobacionDuplicados(unittest.TestCase):
+    """La restricción única no se intenta crear si hay idPersona repetidos."""
+
+    def setUp(self):
+        self._conexion_original = migraciones.conexion_bd
+
+    def tearDown(self):
+        migraciones.conexion_bd = self._conexion_original
+
+    def test_restriccion_unica_declara_comprobacion(self):
+        (unica,) = [m for m in MIGRACIONES if m.nombre.startswith("005")]
+        self.assertEqual(unica.nombre, "005_resultados_id_persona_unico")
+        self.assertIn('"idPersona"', unica.comprobacion)
+
+    def test_informa_duplicados_antes_de_aplicar(self):
+        base = _BaseFalsa(duplicados=[(7, 3), (9, 2)])
+        migraciones.conexion_bd = base.conexion_bd
+
+        with self.assertRaises(ValueError) as contexto:
+            migraciones.aplicar_migraciones()
+
+        self.assertIn("7 (x3), 9 (x2)", str(contexto.exception))
+        self.assertFalse(any("CREATE UNIQUE INDEX" in c for c in base.consultas))
+
+    def test_sin_duplicados_aplica(self):
+        base = _BaseFalsa(duplicados=[])
+        migraciones.conexion_bd = base.conexion_bd
+
+        self.assertEqual(
+            migraciones.aplicar_migraciones(),
+            ["005_resultados_id_persona_unico", "006_resultados_id_ejecucion"]
+        )
+        self.assertTrue(any("CREATE UNIQUE INDEX" in c for c in base.consultas))
+        self.assertTrue(any('ADD COLUMN IF NOT EXISTS "idEjecucion"' in c for c in base.consultas))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Pruebas para el índice de opciones de país del dropdown OFAC.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scraping.paises import (
+    IndiceOpcionesPais,
+    configurar_paises,
+    obtener_paises_no_resueltos
+)
+from src.utilidades.normalizacion import normalizar_texto
+
+
+OPCIONES_DROPDOWN = [
+    ("", "All"),
+    ("Colombia", "Colombia"),
+    ("Korea, North", "Korea, North"),
+    ("Niger", "Niger"),
+    ("Nigeria", "Nigeria"),
+    ("Peru", "Peru"),
+    ("United States", "United States"),
+]
+
+
+class TestIndiceOpcionesPais(unittest.TestCase):
+    """Pruebas de resolución de países en memoria."""
+
+    def setUp(self):
+        self.indice = IndiceOpcionesPais(OPCIONES_DROPDOWN)
+
+    def test_normalizar_texto(self):
+        """Verifica que se ignoran tildes, mayúsculas y espacios repetidos."""
+        self.assertEqual(normalizar_texto("  Perú   DEL  Sur "), "peru del sur")
+        self.assertEqual(normalizar_texto(None), "")
+
+    def test_resolver_exacto_normalizado(self):
+        """Verifica la coincidencia exacta sin importar tildes ni mayúsculas."""
+        self.assertEqual(self.indice.resolver("PERÚ"), "Peru")
+        self.assertEqual(self.indice.resolver("colombia"), "Colombia")
+
+    def test_sin_coincidencia_parcial(self):
+        """Verifica que un país no se confunde con otro que lo contiene."""
+        self.assertEqual(self.indice.resolver("Niger"), "Niger")
+        self.assertEqual(self.indice.resolver("NIGERIA"), "Nigeria")
+        self.assertIsNone(self.indice.resolver("Korea"))
+        self.assertIsNone(self.indice.resolver("Nige"))
+
+    def test_resolver_alias(self):
+        """Verifica los nombres en español de la tabla de alias."""
+        self.assertEqual(self.indice.resolver("Corea del Norte"), "Korea, North")
+        self.assertEqual(self.indice.resolver("EE UU"), "United States")
+
+    def test_opcion_all_no_es_pais(self):
+        """Verifica que la opción 'All' no se usa como país."""
+        self.assertIsNone(self.indice.resolver("All"))
+
+    def test_pais_no_resuelto_se_reporta(self):
+        """Verifica que los países sin opción quedan registrados."""
+        self.assertIsNone(self.indice.resolver("Atlantida"))
+        self.assertIn("Atlantida", obtener_paises_no_resueltos())
+
+
+class TestMapeoPaises(unittest.TestCase):
+    """Pruebas de la resolución anticipada y el archivo de mapeo."""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "mapeo_paises.json")
+
+    def tearDown(self):
+        configurar_paises([])
+        self.directorio.cleanup()
+
+    def test_archivo_mapeo_tiene_prioridad(self):
+        """Verifica que el archivo de mapeo agrega y corrige alias."""
+        with open(self.ruta, 'w', encoding='utf-8') as archivo:
+            json.dump({"Rep. Peruana": "Peru", "Corea": "Korea, North", "Pendiente": None}, archivo)
+
+        configurar_paises([], self.ruta)
+        indice = IndiceOpcionesPais(OPCIONES_DROPDOWN)
+
+        self.assertEqual(indice.resolver("Rep. Peruana"), "Peru")
+        self.assertEqual(indice.resolver("corea"), "Korea, North")
+        self.assertIsNone(indice.resolver("Pendiente"))
+
+    def test_resuelve_paises_de_la_maestra_y_guarda_mapeo(self):
+        """Verifica que los países de la maestra se resuelven al construir el índice."""
+        configurar_paises(["Perú", "Niger", "Wakanda"], self.ruta)
+        IndiceOpcionesPais(OPCIONES_DROPDOWN)
+
+        self.assertIn("Wakanda", obtener_paises_no_resueltos())
+        with open(self.ruta, encoding='utf-8') as archivo:
+            mapeo = json.load(archivo)
+        self.assertEqual(mapeo, {"Niger": "Niger", "Perú": "Peru", "Wakanda": None})
+
+    def test_nueva_ejecucion_olvida_paises_no_resueltos(self):
+        """Verifica que configurar_paises reinicia los no resueltos de la ejecución anterior."""
+        configurar_paises(["Wakanda"])
+        IndiceOpcionesPais(OPCIONES_DROPDOWN)
+
+        configurar_paises(["Perú"])
+        IndiceOpcionesPais(OPCIONES_DROPDOWN)
+
+        self.assertEqual(obtener_paises_no_resueltos(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,263 @@
+"""
+Pruebas del planificador de búsquedas: las personas con la misma búsqueda
+normalizada se buscan una vez y el resultado llega a cada una.
+"""
+
+import unittest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.base_datos.repositorio_personas import Persona
+from src.config.constantes import ESTADO_OK, ESTADO_NOK
+from src.scraping.buscador_ofac import ResultadoBusqueda
+from src.scraping.resultados_ofac import CoincidenciaOfac
+from src.servicios.planificador_busquedas import GrupoBusqueda, PlanificadorBusquedas
+from src.servicios.servicio_procesamiento import ServicioProcesamiento
+
+
+def _persona(id_persona, nombre, direccion="Calle 1", pais="Colombia"):
+    return Persona(
+        id=id_persona,
+        id_persona=id_persona,
+        nombre_persona=nombre,
+        a_consultar="Si",
+        direccion=direccion,
+        pais=pais
+    )
+
+
+class _BuscadorFalso:
+    def __init__(self, cantidad, coincidencias=()):
+        self.cantidad = cantidad
+        self.coincidencias = list(coincidencias)
+        self.busquedas = []
+
+    def buscar_persona(self, nombre, direccion=None, pais=None):
+        self.busquedas.append((nombre, direccion, pais))
+        return ResultadoBusqueda(
+            exito=True,
+            cantidad_resultados=self.cantidad,
+            coincidencias=self.coincidencias
+        )
+
+
+class _CapturaFalsa:
+    def __init__(self):
+        self.capturas = []
+        self.copias = []
+
+    def capturar(self, id_persona):
+        self.capturas.append(id_persona)
+        return f"capturas/{id_persona}.png"
+
+    def copiar(self, ruta_origen, id_persona):
+        self.copias.append((ruta_origen, id_persona))
+        return f"capturas/{id_persona}.png"
+
+
+class _EscritorFalso:
+    def __init__(self):
+        self.resultados = []
+
+    def agregar(self, resultado):
+        self.resultados.append(resultado)
+
+
+class _RepoCoincidenciasFalso:
+    def __init__(self):
+        self.insertadas = []
+
+    def insertar_lote(self, coincidencias):
+        self.insertadas.extend(coincidencias)
+        return len(coincidencias)
+
+
+class _RepoCoincidenciasCaido:
+    def insertar_lote(self, coincidencias):
+        raise RuntimeError("relation \"CoincidenciasOfac\" does not exist")
+
+
+class TestPlanificadorBusquedas(unittest.TestCase):
+    """Pruebas de agrupación por clave normalizada."""
+
+    def test_agrupa_variantes_normalizadas(self):
+        personas = [
+            _persona(1, "José Pérez", "Calle  1", "Colombia"),
+            _persona(2, "Ana Gómez"),
+            _persona(3, " JOSE  perez ", "calle 1", "COLOMBIA"),
+            _persona(4, "José Pérez", "Calle 1", "Perú"),
+            _persona(5, "Jose\tPerez", "Calle 1\n", "colombia"),
+        ]
+        planificador = PlanificadorBusquedas(ventana=100)
+
+        grupos = list(planificador.agrupar(iter(personas)))
+
+        self.assertEqual(
+            [[p.id_persona for p in g.personas] for g in grupos],
+            [[1, 3, 5], [2], [4]]
+        )
+        self.assertEqual(grupos[0].representante.id_persona, 1)
+        self.assertEqual(planificador.ahorradas, 2)
+
+    def test_agrupa_por_ventana(self):
+        personas = [_persona(i, "Ana Gómez") for i in range(1, 6)]
+        planificador = PlanificadorBusquedas(ventana=2)
+
+        grupos = list(planificador.agrupar(personas))
+
+        self.assertEqual([len(g.personas) for g in grupos], [2, 2, 1])
+        self.assertEqual(planificador.ahorradas, 2)
+
+    def test_deshabilitado_no_agrupa(self):
+        personas = [_persona(i, "Ana Gómez") for i in range(1, 4)]
+        planificador = PlanificadorBusquedas(ventana=100, habilitado=False)
+
+        grupos = list(planificador.agrupar(personas))
+
+        self.assertEqual([len(g.personas) for g in grupos], [1, 1, 1])
+        self.assertEqual(planificador.ahorradas, 0)
+
+    def test_ordena_por_pais_y_direccion(self):
+        personas = [
+            _persona(1, "Ana", "Calle 2", "Peru"),
+            _persona(2, "Luis", "Calle 1", "Colombia"),
+            _persona(3, "Ana", "Calle 1", "Perú"),
+            _persona(4, "Bea", "Calle 1", "colombia"),
+            _persona(5, "Carla", "Calle 9", "Chile"),
+        ]
+
+        for habilitado in (True, False):
+            planificador = PlanificadorBusquedas(ventana=100, habilitado=habilitado, ordenar=True)
+            grupos = list(planificador.agrupar(personas))
+            self.assertEqual(
+                [g.representante.id_persona for g in grupos],
+                [5, 4, 2, 3, 1]
+            )
+
+    def test_agrupar_lotes_no_retiene_el_ultimo_lote(self):
+        pedidos = []
+
+        def lotes():
+            # Como la cola compartida: tras el último reclamo espera a que
+            # terminen las personas ya reservadas
+            pedidos.append(1)
+            yield [_persona(i, f"Persona {i}") for i in range(5)]
+            pedidos.append(2)
+            yield [_persona(i, f"Persona {i}") for i in range(5, 8)]
+            pedidos.append(3)
+            raise AssertionError("se pidió otro lote antes de entregar los grupos")
+
+        planificador = PlanificadorBusquedas(ventana=1000, ordenar=True)
+        grupos = planificador.agrupar_lotes(lotes())
+
+        ids = [next(grupos).representante.id_persona for _ in range(8)]
+
+        self.assertEqual(sorted(ids), list(range(8)))
+        self.assertEqual(pedidos, [1, 2])
+
+    def test_agrupar_lotes_agrupa_dentro_de_cada_lote(self):
+        lotes = [
+            [_persona(1, "Ana Gómez"), _persona(2, "ana gomez")],
+            [_persona(3, "Ana Gómez")],
+        ]
+        planificador = PlanificadorBusquedas(ventana=1000)
+
+        grupos = list(planificador.agrupar_lotes(lotes))
+
+        self.assertEqual([[p.id_persona for p in g.personas] for g in grupos], [[1, 2], [3]])
+        self.assertEqual(planificador.ahorradas, 1)
+
+
+class TestRepartoResultados(unittest.TestCase):
+    """Pruebas del reparto de una búsqueda entre las personas del grupo."""
+
+    def setUp(self):
+        self.servicio = ServicioProcesamiento.__new__(ServicioProcesamiento)
+        self.servicio._escritor = _EscritorFalso()
+        self.servicio._cola_trabajo = None
+        self.servicio._detener = threading.Event()
+        self.servicio.repo_coincidencias = _RepoCoincidenciasFalso()
+        self.servicio._coincidencias_pendientes = {}
+        self.servicio._bloqueo_coincidencias = threading.Lock()
+        self.servicio._coincidencias_guardadas = 0
+        self.servicio._coincidencias_fallidas = 0
+        self.grupo = GrupoBusqueda("clave", [
+            _persona(1, "José Pérez"),
+            _persona(2, "jose perez"),
+            _persona(3, "JOSÉ PÉREZ")
+        ])
+
+    def test_una_busqueda_y_un_resultado_por_persona(self):
+        buscador = _BuscadorFalso(cantidad=2)
+        captura = _CapturaFalsa()
+        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+
+        self.servicio._procesar_grupo(buscador, captura, self.grupo, stats, 1)
+
+        self.assertEqual(len(buscador.busquedas), 1)
+        resultados = self.servicio._escritor.resultados
+        self.assertEqual([r.id_persona for r in resultados], [1, 2, 3])
+        self.assertEqual([r.nombre_persona for r in resultados],
+                         ["José Pérez", "jose perez", "JOSÉ PÉREZ"])
+        self.assertTrue(all(r.estado_transaccion == ESTADO_OK for r in resultados))
+        self.assertEqual(stats, {'ok': 3, 'nok': 0, 'errores': 0})
+
+        # Se captura una vez y el resto del grupo recibe una copia con su id
+        self.assertEqual(captura.capturas, [1])
+        self.assertEqual(captura.copias, [("capturas/1.png", 2), ("capturas/1.png", 3)])
+
+    def test_sin_coincidencias_no_captura(self):
+        captura = _CapturaFalsa()
+        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+
+        self.servicio._procesar_grupo(_BuscadorFalso(cantidad=0), captura, self.grupo, stats, 1)
+
+        self.assertEqual(stats, {'ok': 0, 'nok': 3, 'errores': 0})
+        self.assertTrue(all(
+            r.estado_transaccion == ESTADO_NOK for r in self.servicio._escritor.resultados
+        ))
+        self.assertEqual(captura.capturas, [])
+        self.assertEqual(captura.copias, [])
+
+    def test_coincidencias_se_guardan_por_persona_tras_insertar(self):
+        coincidencia = CoincidenciaOfac(
+            nombre="PEREZ, Jose", direccion="Bogota", tipo="Individual",
+            programas=["SDNTK", "ILLICIT-DRUGS"], lista="SDN", puntaje=95
+        )
+        buscador = _BuscadorFalso(cantidad=1, coincidencias=[coincidencia])
+        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+
+        self.servicio._procesar_grupo(buscador, _CapturaFalsa(), self.grupo, stats, 1)
+        repo = self.servicio.repo_coincidencias
+        self.assertEqual(repo.insertadas, [])
+
+        # Se guardan cuando el escritor confirma la inserción de los resultados
+        self.servicio._al_volcar_resultados(self.servicio._escritor.resultados)
+
+        self.assertEqual([c.id_persona for c in repo.insertadas], [1, 2, 3])
+        self.assertEqual(repo.insertadas[0].programas, "SDNTK; ILLICIT-DRUGS")
+        self.assertEqual(repo.insertadas[0].puntaje, 95)
+        self.assertEqual(self.servicio._coincidencias_guardadas, 3)
+        self.assertEqual(self.servicio._coincidencias_pendientes, {})
+
+    def test_error_al_guardar_coincidencias_se_registra_y_cuenta(self):
+        coincidencia = CoincidenciaOfac(nombre="PEREZ, Jose", lista="SDN")
+        buscador = _BuscadorFalso(cantidad=1, coincidencias=[coincidencia])
+        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+        self.servicio.repo_coincidencias = _RepoCoincidenciasCaido()
+
+        self.servicio._procesar_grupo(buscador, _CapturaFalsa(), self.grupo, stats, 1)
+        with self.assertLogs('src.servicios.servicio_procesamiento', level='ERROR') as registro:
+            self.servicio._al_volcar_resultados(self.servicio._escritor.resultados)
+
+        self.assertIn("No se pudieron guardar 3 coincidencias", registro.output[0])
+        self.assertEqual(self.servicio._coincidencias_guardadas, 0)
+        self.assertEqual(self.servicio._coincidencias_fallidas, 3)
+        self.assertEqual(self.servicio._coincidencias_pendientes, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Pruebas del pool de conexiones con conexiones simuladas.
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2 import extensions, OperationalError
+from psycopg2.pool import PoolError
+
+from src.base_datos.conexion import PoolConexiones
+
+
+class _InfoFalsa:
+    transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class _CursorFalso:
+    def __init__(self, conexion):
+        self.conexion = conexion
+
+    def execute(self, consulta):
+        if self.conexion.caida:
+            raise OperationalError("server closed the connection unexpectedly")
+
+    def close(self):
+        pass
+
+
+class _ConexionFalsa:
+    """Conexión que solo registra si se cerró o si la sesión cayó."""
+
+    def __init__(self):
+        self.closed = 0
+        self.caida = False
+        self.info = _InfoFalsa()
+        self.rollbacks = 0
+
+    def cursor(self):
+        return _CursorFalso(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class _PoolFalso(PoolConexiones):
+    """Pool que crea conexiones falsas en lugar de conectarse a PostgreSQL."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, parametros={}, **kwargs)
+        self.creadas = []
+
+    def _crear(self):
+        conexion = _ConexionFalsa()
+        self.creadas.append(conexion)
+        return conexion
+
+
+class TestPoolConexiones(unittest.TestCase):
+    """Pruebas de reutilización, validación, límites y estadísticas."""
+
+    def test_calentar_abre_el_minimo(self):
+        pool = _PoolFalso(3, 5)
+        pool.calentar()
+        self.assertEqual(len(pool.creadas), 3)
+        self.assertEqual(pool.estadisticas()['libres'], 3)
+
+    def test_reutiliza_conexiones_devueltas(self):
+        pool = _PoolFalso(0, 5)
+        conexion = pool.tomar()
+        pool.devolver(conexion)
+        self.assertIs(pool.tomar(), conexion)
+        self.assertEqual(len(pool.creadas), 1)
+
+    def test_descarta_conexion_caida_al_validar(self):
+        pool = _PoolFalso(0, 5, validar_tras_segundos=0)
+        conexion = pool.tomar()
+        pool.devolver(conexion)
+        conexion.caida = True
+
+        nueva = pool.tomar()
+        self.assertIsNot(nueva, conexion)
+        self.assertTrue(conexion.closed)
+        self.assertEqual(pool.estadisticas()['descartadas'], 1)
+
+    def test_renueva_conexiones_por_edad(self):
+        pool = _PoolFalso(0, 5, max_vida_segundos=0.05)
+        conexion = pool.tomar()
+        time.sleep(0.1)
+        pool.devolver(conexion)
+
+        self.assertTrue(conexion.closed)
+        self.assertIsNot(pool.tomar(), conexion)
+
+    def test_deshace_transaccion_abierta_al_devolver(self):
+        pool = _PoolFalso(0, 5)
+        conexion = pool.tomar()
+        conexion.info = type('Info', (), {
+            'transaction_status': extensions.TRANSACTION_STATUS_INTRANS
+        })()
+        pool.devolver(conexion)
+        self.assertEqual(conexion.rollbacks, 1)
+
+    def test_espera_conexion_libre_y_la_cuenta(self):
+        pool = _PoolFalso(0, 1, tiempo_espera=5)
+        conexion = pool.tomar()
+
+        threading.Timer(0.1, pool.devolver, args=(conexion,)).start()
+        self.assertIs(pool.tomar(), conexion)
+
+        stats = pool.estadisticas()
+        self.assertEqual(stats['tomas'], 2)
+        self.assertEqual(stats['esperas'], 1)
+        self.assertGreater(stats['tiempo_espera_segundos'], 0)
+        self.assertEqual(stats['max_en_uso'], 1)
+
+    def test_falla_si_se_agota_el_tiempo_de_espera(self):
+        pool = _PoolFalso(0, 1, tiempo_espera=0.05)
+        pool.tomar()
+        with self.assertRaises(PoolError):
+            pool.tomar()
+
+    def test_cerrar_cierra_las_libres(self):
+        pool = _PoolFalso(2, 5)
+        pool.calentar()
+        pool.cerrar()
+        self.assertTrue(all(conexion.closed for conexion in pool.creadas))
+        with self.assertRaises(PoolError):
+            pool.tomar()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+"""
+Pruebas del pool de workers de búsqueda y del modo asíncrono: los
+workers terminan al pedir la detención aunque la cola quede vacía, y la
+exportación de incompletos no espera a las búsquedas. También cubre la
+preparación de la ejecución, que no modifica el esquema.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.base_datos.repositorio_personas import Persona
+from src.scraping.buscador_ofac import ResultadoBusqueda
+from src.servicios.planificador_busquedas import GrupoBusqueda
+from src.servicios import servicio_procesamiento
+from src.servicios.servicio_procesamiento import ServicioProcesamiento
+from src.servicios.servicio_validacion import ServicioValidacion
+
+
+class _BuscadorFalso:
+    def navegar_a_ofac(self):
+        return True
+
+    def buscar_persona(self, nombre, direccion=None, pais=None):
+        return ResultadoBusqueda(exito=True, cantidad_resultados=0)
+
+
+class _EscritorFalso:
+    def __init__(self):
+        self.resultados = []
+
+    def agregar(self, resultado):
+        self.resultados.append(resultado)
+
+
+def _grupo(id_persona):
+    persona = Persona(
+        id=id_persona,
+        id_persona=id_persona,
+        nombre_persona=f"Persona {id_persona}",
+        a_consultar="Si",
+        direccion="Calle 1",
+        pais="Colombia"
+    )
+    return GrupoBusqueda(str(id_persona), [persona])
+
+
+class TestWorkersBusqueda(unittest.TestCase):
+    """Pruebas de la detención de los workers."""
+
+    def setUp(self):
+        self.servicio = ServicioProcesamiento.__new__(ServicioProcesamiento)
+        self.servicio._escritor = _EscritorFalso()
+        self.servicio._cola_trabajo = None
+        self.servicio._detener = threading.Event()
+        self.servicio._coincidencias_pendientes = {}
+        self.servicio._bloqueo_coincidencias = threading.Lock()
+
+        @contextmanager
+        def abrir_buscador(independiente=False):
+            yield _BuscadorFalso(), None
+
+        self.servicio._abrir_buscador = abrir_buscador
+
+    def test_worker_ocioso_termina_al_detener(self):
+        stats = {'ok': 0, 'nok': 0, 'errores': 0}
+        hilo = threading.Thread(
+            target=self.servicio._worker_busquedas,
+            args=(queue.Queue(), stats, threading.Lock(), self.servicio._detener),
+            daemon=True
+        )
+        hilo.start()
+
+        self.servicio._detener.set()
+        hilo.join(timeout=5)
+
+        self.assertFalse(hilo.is_alive())
+
+    def test_interrupcion_no_deja_workers_bloqueados(self):
+        def grupos():
+            yield _grupo(1)
+            raise KeyboardInterrupt
+
+        interrumpido = threading.Event()
+
+        def procesar():
+            try:
+                self.servicio._procesar_busquedas_paralelo(grupos(), 3)
+            except KeyboardInterrupt:
+                interrumpido.set()
+
+        hilo = threading.Thread(target=procesar, daemon=True)
+        hilo.start()
+        hilo.join(timeout=5)
+
+        self.assertFalse(hilo.is_alive())
+        self.assertTrue(interrumpido.is_set())
+
+
+class _RepoPersonasFalso:
+    """Personas 1 y 3 válidas, 2 incompleta; las pendientes son las sin resultado."""
+
+    def __init__(self, resultados):
+        self.resultados = resultados
+        self.personas = [
+            Persona(1, 1, "Ana", "Si", "Calle 1", "Colombia"),
+            Persona(2, 2, "Luis", "Si", "  ", "Colombia"),
+            Persona(3, 3, "Bea", "Si", "Calle 3", "Peru"),
+        ]
+
+    def contar_personas_a_consultar(self, solo_pendientes=False):
+        return len(self.personas)
+
+    def iterar_personas_a_consultar(self, tamano_lote, solo_pendientes=False):
+        ids = {r.id_persona for r in self.resultados.insertados}
+        yield [p for p in self.personas if not (solo_pendientes and p.id_persona in ids)]
+
+
+class _RepoResultadosFalso:
+    def __init__(self):
+        self.insertados = []
+
+    def insertar_lote(self, resultados):
+        self.insertados.extend(resultados)
+        return len(resultados)
+
+
+class TestEjecucionAsincrona(unittest.TestCase):
+    """La exportación de incompletos corre mientras las búsquedas siguen."""
+
+    def setUp(self):
+        self._originales = {
+            nombre: getattr(servicio_procesamiento, nombre)
+            for nombre in ('inicializar_pool', 'cerrar_pool', 'estadisticas_pool')
+        }
+        servicio_procesamiento.inicializar_pool = lambda **kwargs: None
+        servicio_procesamiento.cerrar_pool = lambda: None
+        servicio_procesamiento.estadisticas_pool = lambda: {}
+
+    def tearDown(self):
+        for nombre, funcion in self._originales.items():
+            setattr(servicio_procesamiento, nombre, funcion)
+
+    def test_exporta_sin_esperar_a_las_busquedas(self):
+        servicio = ServicioProcesamiento.__new__(ServicioProcesamiento)
+        servicio._detener = threading.Event()
+        servicio.config = SimpleNamespace(procesamiento=SimpleNamespace(
+            reanudar=False,
+            clasificacion_sql=False,
+            clasificacion_columnar=False,
+            tamano_lote_lectura=100,
+            num_navegadores=1
+        ))
+        servicio.repo_resultados = _RepoResultadosFalso()
+        servicio.repo_personas = _RepoPersonasFalso(servicio.repo_resultados)
+        servicio.servicio_validacion = ServicioValidacion()
+        servicio._preparar_resultados = lambda estadisticas: None
+
+        exportado = threading.Event()
+        incompletos_al_exportar = []
+        buscadas = []
+
+        def exportar_incompletos():
+            incompletos_al_exportar.extend(r.id_persona for r in servicio.repo_resultados.insertados)
+            exportado.set()
+
+        def procesar_busquedas(personas):
+            personas = iter(personas)
+            buscadas.append(next(personas).id_persona)
+            # Con la primera búsqueda en curso, la exportación ya debe poder correr
+            self.assertTrue(exportado.wait(timeout=5))
+            buscadas.extend(p.id_persona for p in personas)
+            return {'ok': len(buscadas), 'nok': 0, 'errores': 0}
+
+        servicio.servicio_exportacion = SimpleNamespace(exportar_incompletos=exportar_incompletos)
+        servicio._procesar_busquedas_ofac = procesar_busquedas
+
+        estadisticas = asyncio.run(servicio.ejecutar_async())
+
+        self.assertEqual(incompletos_al_exportar, [2])
+        self.assertEqual(buscadas, [1, 3])
+        self.assertEqual(estadisticas['informacion_incompleta'], 1)
+        self.assertEqual(estadisticas['procesadas_ok'], 2)
+
+
+class _RepoConColumna:
+    def __init__(self, tiene_columna):
+        self.tiene_columna = tiene_columna
+        self.id_ejecucion = None
+
+    def tiene_columna_ejecucion(self):
+        return self.tiene_columna
+
+
+class TestAsignarEjecucion(unittest.TestCase):
+    """El id de ejecución solo se escribe si la migración agregó la columna."""
+
+    def _servicio(self, tiene_columna):
+        servicio = ServicioProcesamiento.__new__(ServicioProcesamiento)
+        servicio.config = SimpleNamespace(procesamiento=SimpleNamespace(
+            reanudar=False,
+            extraer_coincidencias=False
+        ))
+        servicio.repo_resultados = _RepoConColumna(tiene_columna)
+        servicio.repo_coincidencias = SimpleNamespace(id_ejecucion=None)
+        return servicio
+
+    def test_con_columna_asigna_la_ejecucion(self):
+        servicio = self._servicio(tiene_columna=True)
+        estadisticas = {}
+
+        servicio._asignar_ejecucion(estadisticas)
+
+        self.assertEqual(servicio.repo_resultados.id_ejecucion, estadisticas['id_ejecucion'])
+
+    def test_sin_columna_sigue_sin_id_de_ejecucion(self):
+        servicio = self._servicio(tiene_columna=False)
+        estadisticas = {}
+
+        servicio._asignar_ejecucion(estadisticas)
+
+        self.assertIsNone(servicio.repo_resultados.id_ejecucion)
+        self.assertIsNotNone(estadisticas['id_ejecucion'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Pruebas de la lectura paginada de personas con una conexión simulada.
+"""
+
+import unittest
+import sys
+import os
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.base_datos import repositorio_personas
+from src.base_datos.repositorio_personas import ORDEN_PERSONAS_UNICAS, RepositorioPersonas
+
+
+class _CursorFalso:
+    def __init__(self, base):
+        self.base = base
+        self.filas = []
+
+    def execute(self, consulta, params):
+        self.base.consultas.append(consulta)
+        if 'p.id > %s' in consulta:
+            _, ultimo_id, limite = params
+        else:
+            (_, limite), ultimo_id = params, None
+        filas = [f for f in self.base.filas if ultimo_id is None or f[0] > ultimo_id]
+        self.filas = filas[:limite]
+
+    def fetchall(self):
+        return self.filas
+
+    def close(self):
+        pass
+
+
+class _BaseFalsa:
+    """Tabla de personas en memoria que registra si hay una conexión tomada."""
+
+    def __init__(self, ids):
+        self.filas = [(i, i * 10, f"Persona {i}", "Si", "Calle", "Colombia") for i in ids]
+        self.consultas = []
+        self.tomada = False
+
+    def cursor(self):
+        return _CursorFalso(self)
+
+    def commit(self):
+        pass
+
+    @contextmanager
+    def conexion_bd(self):
+        self.tomada = True
+        try:
+            yield self
+        finally:
+            self.tomada = False
+
+
+class TestLecturaPaginada(unittest.TestCase):
+    """Pruebas de la paginación por clave de iterar_personas_a_consultar."""
+
+    def setUp(self):
+        self._conexion_original = repositorio_personas.conexion_bd
+
+    def tearDown(self):
+        repositorio_personas.conexion_bd = self._conexion_original
+
+    def _usar(self, base):
+        repositorio_personas.conexion_bd = base.conexion_bd
+
+    def test_recorre_todas_las_paginas_en_orden(self):
+        base = _BaseFalsa([1, 2, 4, 7, 9])
+        self._usar(base)
+
+        lotes = list(RepositorioPersonas().iterar_personas_a_consultar(tamano_lote=2))
+
+        self.assertEqual([[p.id for p in lote] for lote in lotes], [[1, 2], [4, 7], [9]])
+        self.assertEqual(lotes[0][0].id_persona, 10)
+        self.assertEqual(len(base.consultas), 3)
+
+    def test_no_retiene_la_conexion_entre_paginas(self):
+        base = _BaseFalsa(range(1, 6))
+        self._usar(base)
+
+        for _ in RepositorioPersonas().iterar_personas_a_consultar(tamano_lote=2):
+            self.assertFalse(base.tomada)
+
+    def test_pagina_completa_final_hace_una_consulta_vacia(self):
+        base = _BaseFalsa([1, 2])
+        self._usar(base)
+
+        lotes = list(RepositorioPersonas().iterar_personas_a_consultar(tamano_lote=2))
+
+        self.assertEqual(len(lotes), 1)
+        self.assertEqual(len(base.consultas), 2)
+
+    def test_filtros_se_aplican_en_cada_pagina(self):
+        base = _BaseFalsa([1, 2, 3])
+        self._usar(base)
+
+        list(RepositorioPersonas().iterar_personas_a_consultar(
+            tamano_lote=2, solo_pendientes=True, solo_validas=True
+        ))
+
+        for consulta in base.consultas:
+            self.assertIn("NOT EXISTS", consulta)
+            self.assertIn("DISTINCT ON (p.id)", consulta)
+
+    def test_paginas_eligen_la_fila_de_la_maestra_con_desempate(self):
+        base = _BaseFalsa([1, 2, 3])
+        self._usar(base)
+
+        list(RepositorioPersonas().iterar_personas_a_consultar(tamano_lote=2))
+
+        # DISTINCT ON exige ordenar primero por p.id; el resto fija la fila elegida
+        self.assertTrue(ORDEN_PERSONAS_UNICAS.startswith("p.id, "))
+        for consulta in base.consultas:
+            self.assertTrue(consulta.endswith(f"ORDER BY {ORDEN_PERSONAS_UNICAS} LIMIT %s"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Pruebas de la inserción por lotes de resultados con una conexión
+simulada: COPY directo, COPY a una tabla temporal cuando existe la
+restricción única sobre idPersona, e INSERT multi-fila si no hay COPY.
+"""
+
+import unittest
+import sys
+import os
+from contextlib import contextmanager
+
+from psycopg2 import errors
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.base_datos import repositorio_resultados
+from src.base_datos.repositorio_resultados import RepositorioResultados, Resultado
+
+
+class _CursorFalso:
+    def __init__(self, base):
+        self.base = base
+        self.rowcount = 0
+
+    def execute(self, consulta, params=None):
+        consulta = ' '.join(consulta.split())
+        self.base.consultas.append(consulta)
+        if consulta.startswith("SELECT 1 FROM pg_index"):
+            self._fila = (1,) if self.base.restriccion_unica else None
+        elif consulta.startswith("INSERT INTO") and "SELECT" in consulta:
+            self.rowcount = self.base.insertadas
+
+    def fetchone(self):
+        return self._fila
+
+    def copy_expert(self, consulta, buffer):
+        if not self.base.permite_copy:
+            raise errors.InsufficientPrivilege("permission denied for COPY")
+        self.base.copias.append((consulta, buffer.read().splitlines()))
+
+    def close(self):
+        pass
+
+
+class _BaseFalsa:
+    """Registra las consultas y los COPY enviados sobre una sola conexión."""
+
+    def __init__(self, restriccion_unica=False, permite_copy=True, insertadas=0):
+        self.restriccion_unica = restriccion_unica
+        self.permite_copy = permite_copy
+        self.insertadas = insertadas
+        self.consultas = []
+        self.copias = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return _CursorFalso(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    @contextmanager
+    def conexion_bd(self):
+        yield self
+
+
+def _resultados(*ids):
+    return [Resultado(id_persona=i, nombre_persona=f"Persona {i}", pais="Peru") for i in ids]
+
+
+class TestInsercionPorLotes(unittest.TestCase):
+    """Pruebas de la vía de inserción que elige insertar_lote."""
+
+    def setUp(self):
+        self._originales = (repositorio_resultados.conexion_bd, repositorio_resultados.extras)
+        self.valores = []
+
+        repositorio = self
+
+        class _ExtrasFalso:
+            @staticmethod
+            def execute_values(cursor, consulta, datos, page_size=100, fetch=False):
+                repositorio.valores.append((consulta, datos))
+                return [(1,)] * len(datos)
+
+        repositorio_resultados.extras = _ExtrasFalso
+
+    def tearDown(self):
+        repositorio_resultados.conexion_bd, repositorio_resultados.extras = self._originales
+
+    def _insertar(self, base, resultados):
+        repositorio_resultados.conexion_bd = base.conexion_bd
+        return RepositorioResultados().insertar_lote(resultados)
+
+    def test_sin_restriccion_copia_directo(self):
+        base = _BaseFalsa()
+
+        self.assertEqual(self._insertar(base, _resultados(1, 2)), 2)
+
+        ((consulta, filas),) = base.copias
+        self.assertTrue(consulta.startswith('COPY "Resultadosuser9145"'))
+        self.assertEqual(len(filas), 2)
+        self.assertEqual(self.valores, [])
+
+    def test_con_restriccion_copia_a_tabla_temporal(self):
+        base = _BaseFalsa(restriccion_unica=True, insertadas=1)
+
+        self.assertEqual(self._insertar(base, _resultados(1, 2)), 1)
+
+        ((consulta, filas),) = base.copias
+        self.assertTrue(consulta.startswith("COPY resultados_carga "))
+        self.assertEqual(len(filas), 2)
+        (creacion,) = [c for c in base.consultas if c.startswith("CREATE TEMP TABLE")]
+        self.assertIn("ON COMMIT DELETE ROWS", creacion)
+        (insercion,) = [c for c in base.consultas if c.startswith("INSERT INTO")]
+        self.assertIn("FROM resultados_carga", insercion)
+        self.assertTrue(insercion.endswith('ON CONFLICT ("idPersona") DO NOTHING'))
+        self.assertEqual(self.valores, [])
+
+    def test_sin_copy_usa_insert_multifila(self):
+        base = _BaseFalsa(restriccion_unica=True, permite_copy=False)
+
+        self.assertEqual(self._insertar(base, _resultados(1, 2, 3)), 3)
+
+        self.assertEqual(base.rollbacks, 1)
+        ((consulta, datos),) = self.valores
+        self.assertIn("ON CONFLICT DO NOTHING", consulta)
+        self.assertEqual(len(datos), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
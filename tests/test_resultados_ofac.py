@@ -0,0 +1,72 @@
+"""
+Pruebas de la extracción de la grilla de resultados OFAC.
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scraping.resultados_ofac import CoincidenciaOfac, extraer_resultados
+
+PAGINA_RESULTADOS = """<html><body>
+<form id="aspnetForm">
+<div id="scrollResults">
+<span id="ctl00_MainContent_lbResults">Lookup Results: 3 Found</span>
+<table id="gvSearchResults">
+  <tr>
+    <td><a href="Details.aspx?id=1">ESCOBAR GAVIRIA, Pablo</a></td>
+    <td>Medellín,  Colombia</td>
+    <td>Individual</td>
+    <td>SDNTK; ILLICIT-DRUGS</td>
+    <td>SDN</td>
+    <td>100</td>
+  </tr>
+  <tr>
+    <td><a href="Details.aspx?id=2">CARTEL DE MEDELLIN</a></td>
+    <td></td>
+    <td>Entity</td>
+    <td>SDNTK</td>
+    <td>SDN</td>
+    <td>92</td>
+  </tr>
+  <tr><td colspan="6">Fila sin datos</td></tr>
+</table>
+</div>
+</form>
+</body></html>"""
+
+
+class TestExtraerResultados(unittest.TestCase):
+    """Pruebas del análisis del HTML de resultados."""
+
+    def test_extrae_cantidad_y_filas(self):
+        cantidad, coincidencias = extraer_resultados(PAGINA_RESULTADOS)
+
+        self.assertEqual(cantidad, 3)
+        self.assertEqual(coincidencias[0], CoincidenciaOfac(
+            nombre="ESCOBAR GAVIRIA, Pablo",
+            direccion="Medellín, Colombia",
+            tipo="Individual",
+            programas=["SDNTK", "ILLICIT-DRUGS"],
+            lista="SDN",
+            puntaje=100
+        ))
+        self.assertEqual(coincidencias[1].direccion, "")
+        self.assertEqual(coincidencias[1].puntaje, 92)
+        self.assertEqual(len(coincidencias), 2)
+
+    def test_sin_texto_found_cuenta_filas(self):
+        pagina = PAGINA_RESULTADOS.replace("Lookup Results: 3 Found", "")
+        cantidad, coincidencias = extraer_resultados(pagina)
+        self.assertEqual(cantidad, len(coincidencias))
+
+    def test_pagina_sin_resultados(self):
+        pagina = '<html><body><span id="ctl00_MainContent_lbResults">0 Found</span></body></html>'
+        self.assertEqual(extraer_resultados(pagina), (0, []))
+        self.assertEqual(extraer_resultados(""), (0, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
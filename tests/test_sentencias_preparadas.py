@@ -0,0 +1,134 @@
+"""
+Pruebas de las sentencias preparadas por conexión.
+
+Ejecutado directamente (python tests/test_sentencias_preparadas.py) mide
+contra la base de datos configurada en .env el tiempo por llamada de
+obtener_persona_por_id y existe_resultado_persona con y sin preparación,
+y el tiempo de planificación que reporta PostgreSQL en cada caso.
+"""
+
+import unittest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2 import errors
+
+from src.base_datos.sentencias import a_parametros_posicionales, ejecutar_preparada
+
+
+class _ConexionFalsa:
+    def __init__(self, preparadas=True):
+        if preparadas:
+            self.preparadas = set()
+
+
+class _CursorFalso:
+    """Cursor que registra las consultas enviadas."""
+
+    def __init__(self, conexion, fallar_execute=False):
+        self.connection = conexion
+        self.consultas = []
+        self.fallar_execute = fallar_execute
+
+    def execute(self, query, params=None):
+        if self.fallar_execute and query.startswith("EXECUTE"):
+            raise errors.InvalidSqlStatementName("prepared statement does not exist")
+        self.consultas.append((query, params))
+
+
+class TestSentenciasPreparadas(unittest.TestCase):
+    """Pruebas de preparación única por conexión e invalidación."""
+
+    def test_convierte_marcadores(self):
+        self.assertEqual(
+            a_parametros_posicionales('SELECT * FROM t WHERE a = %s AND b = %s'),
+            'SELECT * FROM t WHERE a = $1 AND b = $2'
+        )
+
+    def test_prepara_una_vez_por_conexion(self):
+        conexion = _ConexionFalsa()
+        cursor = _CursorFalso(conexion)
+        for i in range(3):
+            ejecutar_preparada(cursor, "consulta", "SELECT %s", (i,))
+
+        preparaciones = [q for q, _ in cursor.consultas if q.startswith("PREPARE")]
+        self.assertEqual(preparaciones, ["PREPARE consulta AS SELECT $1"])
+        self.assertEqual(cursor.consultas[-1], ("EXECUTE consulta (%s)", (2,)))
+
+        # Una conexión nueva (reciclada por el pool) vuelve a preparar
+        otro_cursor = _CursorFalso(_ConexionFalsa())
+        ejecutar_preparada(otro_cursor, "consulta", "SELECT %s", (1,))
+        self.assertTrue(otro_cursor.consultas[0][0].startswith("PREPARE"))
+
+    def test_sin_soporte_ejecuta_directo(self):
+        cursor = _CursorFalso(_ConexionFalsa(preparadas=False))
+        ejecutar_preparada(cursor, "consulta", "SELECT %s", (1,))
+        self.assertEqual(cursor.consultas, [("SELECT %s", (1,))])
+
+    def test_sentencia_perdida_se_olvida(self):
+        conexion = _ConexionFalsa()
+        cursor = _CursorFalso(conexion, fallar_execute=True)
+        with self.assertRaises(errors.InvalidSqlStatementName):
+            ejecutar_preparada(cursor, "consulta", "SELECT %s", (1,))
+        self.assertNotIn("consulta", conexion.preparadas)
+
+
+def _tiempo_planificacion(cursor, consulta: str) -> float:
+    """Devuelve el 'Planning Time' (ms) que reporta EXPLAIN ANALYZE."""
+    cursor.execute(f"EXPLAIN (ANALYZE, SUMMARY) {consulta}")
+    for (linea,) in cursor.fetchall():
+        if linea.startswith("Planning Time"):
+            return float(linea.split(":")[1].strip().split()[0])
+    return 0.0
+
+
+def medir(repeticiones: int = 500) -> None:
+    """Compara por llamada la ejecución directa y la preparada."""
+    from src.base_datos.conexion import obtener_conexion, cerrar_conexion
+    from src.base_datos.repositorio_personas import CONSULTA_PERSONAS
+    from src.config.constantes import TABLA_PERSONAS, TABLA_RESULTADOS
+
+    conexion = obtener_conexion()
+    try:
+        cursor = conexion.cursor()
+        cursor.execute(f'SELECT "idPersona" FROM {TABLA_PERSONAS} LIMIT 1')
+        id_persona = cursor.fetchone()[0]
+
+        consultas = {
+            "obtener_persona_por_id": CONSULTA_PERSONAS + ' WHERE p."idPersona" = %s',
+            "existe_resultado_persona": (
+                f'SELECT COUNT(*) FROM {TABLA_RESULTADOS} WHERE "idPersona" = %s'
+            )
+        }
+
+        for nombre, consulta in consultas.items():
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                cursor.execute(consulta, (id_persona,))
+                cursor.fetchall()
+            directa = (time.perf_counter() - inicio) / repeticiones * 1000
+
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                ejecutar_preparada(cursor, f"bench_{nombre}", consulta, (id_persona,))
+                cursor.fetchall()
+            preparada = (time.perf_counter() - inicio) / repeticiones * 1000
+
+            plan_directa = _tiempo_planificacion(cursor, cursor.mogrify(consulta, (id_persona,)).decode())
+            plan_preparada = _tiempo_planificacion(cursor, cursor.mogrify(
+                f"EXECUTE bench_{nombre} (%s)", (id_persona,)).decode())
+
+            print(f"{nombre}:")
+            print(f"  directa:   {directa:.3f} ms/llamada (planificación {plan_directa:.3f} ms)")
+            print(f"  preparada: {preparada:.3f} ms/llamada (planificación {plan_preparada:.3f} ms)")
+
+        conexion.rollback()
+    finally:
+        cerrar_conexion(conexion)
+
+
+if __name__ == '__main__':
+    medir()
@@ -0,0 +1,163 @@
+"""
+Pruebas de la clasificación de personas: la vía vectorizada debe dar
+exactamente lo mismo que la vía persona por persona.
+"""
+
+import unittest
+import re
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from src.base_datos.repositorio_personas import (
+    Persona,
+    COLUMNAS_PERSONA,
+    CONDICION_INCOMPLETA,
+    CONSULTA_PERSONAS_UNICAS,
+    ESPACIOS_STRIP,
+    ORDEN_PERSONAS_UNICAS,
+    consulta_pagina
+)
+from src.base_datos.repositorio_resultados import consulta_no_consultables
+from src.servicios.servicio_validacion import ServicioValidacion
+
+# (direccion, pais) con los casos límite de las reglas
+CASOS = [
+    (None, None),
+    ("Calle 1", "Colombia"),
+    (None, "Colombia"),
+    ("Calle 1", None),
+    ("", "Colombia"),
+    ("   ", "Colombia"),
+    ("Calle 1", "None"),
+    (" None ", "Colombia"),
+    ("\tCalle 1\n", " Colombia "),
+    ("Calle 1", ""),
+    ("none", "Colombia"),
+    ("", ""),
+    ("\xa0", "Colombia"),
+    ("Calle 1", "\u2003\u3000"),
+    ("\xa0None\u202f", "Colombia"),
+    ("\u200bCalle 1", "Colombia"),
+]
+
+
+def _personas():
+    return [
+        Persona(
+            id=i,
+            id_persona=100 + i,
+            nombre_persona=f"Persona {i}",
+            a_consultar="Si",
+            direccion=direccion,
+            pais=pais
+        )
+        for i, (direccion, pais) in enumerate(CASOS)
+    ]
+
+
+def _dataframe(personas):
+    return pd.DataFrame.from_records(
+        [
+            (p.id, p.id_persona, p.nombre_persona, p.a_consultar, p.direccion, p.pais)
+            for p in personas
+        ],
+        columns=COLUMNAS_PERSONA
+    )
+
+
+def _como_tuplas(resultados):
+    return [
+        (r.id_persona, r.nombre_persona, r.pais, r.cantidad_resultados, r.estado_transaccion)
+        for r in resultados
+    ]
+
+
+class TestClasificacionColumnar(unittest.TestCase):
+    """Compara clasificar_dataframe con clasificar_personas."""
+
+    def setUp(self):
+        self.servicio = ServicioValidacion()
+        self.personas = _personas()
+        self.esperado = self.servicio.clasificar_personas(self.personas)
+        self.obtenido = self.servicio.clasificar_dataframe(_dataframe(self.personas))
+
+    def test_mismas_personas_validas(self):
+        self.assertEqual(
+            list(self.obtenido.personas_validas['idPersona']),
+            [p.id_persona for p in self.esperado.personas_validas]
+        )
+
+    def test_mismos_resultados_no_cruzan(self):
+        self.assertEqual(
+            list(self.obtenido.resultados_no_cruzan.itertuples(index=False, name=None)),
+            _como_tuplas(self.esperado.resultados_no_cruzan)
+        )
+
+    def test_mismos_resultados_incompletos(self):
+        self.assertEqual(
+            list(self.obtenido.resultados_incompletos.itertuples(index=False, name=None)),
+            _como_tuplas(self.esperado.resultados_incompletos)
+        )
+
+    def test_lote_vacio(self):
+        vacio = self.servicio.clasificar_dataframe(_dataframe([]))
+        self.assertTrue(vacio.personas_validas.empty)
+        self.assertTrue(vacio.resultados_no_cruzan.empty)
+        self.assertTrue(vacio.resultados_incompletos.empty)
+
+
+def _btrim_sql(texto, caracteres):
+    return texto.strip(caracteres)
+
+
+class TestCondicionSql(unittest.TestCase):
+    """CONDICION_INCOMPLETA recorta los mismos espacios que str.strip()."""
+
+    def test_espacios_son_los_de_isspace(self):
+        esperados = ''.join(c for c in map(chr, range(sys.maxunicode + 1)) if c.isspace())
+        self.assertEqual(ESPACIOS_STRIP, esperados)
+
+    def test_condicion_sql_usa_todos_los_espacios(self):
+        literales = re.findall(r"BTRIM\([^,]+, E'([^']*)'\)", CONDICION_INCOMPLETA)
+        self.assertEqual(len(literales), 2)
+        for literal in literales:
+            caracteres = ''.join(
+                chr(int(codigo, 16)) for codigo in re.findall(r'\\u([0-9A-F]{4})', literal)
+            )
+            self.assertEqual(caracteres, ESPACIOS_STRIP)
+
+    def test_misma_clasificacion_que_python(self):
+        servicio = ServicioValidacion()
+        for persona in _personas():
+            if servicio._no_cruza_con_maestra(persona):
+                continue
+            incompleta_sql = any(
+                valor is None or _btrim_sql(valor, ESPACIOS_STRIP) in ('', 'None')
+                for valor in (persona.direccion, persona.pais)
+            )
+            self.assertEqual(
+                incompleta_sql,
+                servicio._tiene_informacion_incompleta(persona),
+                (persona.direccion, persona.pais)
+            )
+
+    def test_clasificacion_sql_usa_la_fila_de_la_lectura_por_paginas(self):
+        for con_ejecucion in (False, True):
+            consulta = consulta_no_consultables(con_ejecucion, solo_pendientes=True)
+            self.assertEqual(consulta.count('%s'), 4 if con_ejecucion else 3)
+
+            # Primero elige la fila de cada persona y después la clasifica
+            inicio = consulta.index(CONSULTA_PERSONAS_UNICAS)
+            orden = consulta.index(f"ORDER BY {ORDEN_PERSONAS_UNICAS}", inicio)
+            self.assertGreater(consulta.index(f"WHERE {CONDICION_INCOMPLETA}"), orden)
+
+        self.assertIn(CONSULTA_PERSONAS_UNICAS, consulta_pagina())
+        self.assertIn(f"ORDER BY {ORDEN_PERSONAS_UNICAS}", consulta_pagina())
+
+
+if __name__ == '__main__':
+    unittest.main()